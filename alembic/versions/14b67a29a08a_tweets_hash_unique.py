@@ -0,0 +1,35 @@
+"""tweets hash unique
+
+Revision ID: 14b67a29a08a
+Revises: 3caa6e451516
+Create Date: 2026-10-17 10:12:41.503118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '14b67a29a08a'
+down_revision: Union[str, Sequence[str], None] = '3caa6e451516'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Keep the oldest row of every duplicated hash before enforcing uniqueness.
+    op.execute(
+        sa.text(
+            "DELETE FROM tweets t USING tweets d "
+            "WHERE t.hash = d.hash AND t.id > d.id"
+        )
+    )
+    op.create_unique_constraint(op.f('tweets_hash_key'), 'tweets', ['hash'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint(op.f('tweets_hash_key'), 'tweets', type_='unique')
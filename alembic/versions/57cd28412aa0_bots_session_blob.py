@@ -0,0 +1,98 @@
+"""bots session blob
+
+Revision ID: 57cd28412aa0
+Revises: 92129d6a46d7
+Create Date: 2026-10-17 16:48:12.204633
+
+"""
+import gzip
+import hashlib
+import json
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '57cd28412aa0'
+down_revision: Union[str, Sequence[str], None] = '92129d6a46d7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+bots = sa.table(
+    'bots',
+    sa.column('id', sa.Integer()),
+    sa.column('session', postgresql.JSONB()),
+    sa.column('session_blob', sa.LargeBinary()),
+    sa.column('session_hash', sa.Text()),
+)
+
+
+# Frozen copies of src/bots/session_store.py at this revision: the migration
+# must keep producing these values however the application code changes.
+def encode_session(session_data: dict) -> bytes:
+    raw = json.dumps(session_data, separators=(",", ":")).encode()
+    return gzip.compress(raw, 6)
+
+
+def decode_session(blob: bytes) -> dict:
+    return json.loads(gzip.decompress(blob))
+
+
+def session_digest(session_data: dict) -> str:
+    cookies = [
+        {**c, "expires": int(c["expires"] // 86_400)}
+        if c.get("expires", -1) > 0
+        else c
+        for c in session_data.get("cookies", [])
+    ]
+    canonical = json.dumps(
+        {**session_data, "cookies": cookies}, sort_keys=True, separators=(",", ":")
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('bots', sa.Column('session_blob', sa.LargeBinary(), nullable=True))
+    op.add_column('bots', sa.Column('session_hash', sa.Text(), nullable=True))
+
+    conn = op.get_bind()
+    rows = conn.execute(
+        sa.select(bots.c.id, bots.c.session).where(bots.c.session.is_not(None))
+    )
+    for bot_id, session_data in rows.all():
+        conn.execute(
+            bots.update()
+            .where(bots.c.id == bot_id)
+            .values(
+                session_blob=encode_session(session_data),
+                session_hash=session_digest(session_data),
+            )
+        )
+
+    op.drop_column('bots', 'session')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.add_column('bots', sa.Column('session', postgresql.JSONB(), nullable=True))
+
+    conn = op.get_bind()
+    rows = conn.execute(
+        sa.select(bots.c.id, bots.c.session_blob).where(
+            bots.c.session_blob.is_not(None)
+        )
+    )
+    for bot_id, blob in rows.all():
+        conn.execute(
+            bots.update()
+            .where(bots.c.id == bot_id)
+            .values(session=decode_session(blob))
+        )
+
+    op.drop_column('bots', 'session_hash')
+    op.drop_column('bots', 'session_blob')
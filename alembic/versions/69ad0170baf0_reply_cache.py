@@ -0,0 +1,38 @@
+"""reply cache
+
+Revision ID: 69ad0170baf0
+Revises: e0e917b507ac
+Create Date: 2026-10-17 13:40:07.118342
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '69ad0170baf0'
+down_revision: Union[str, Sequence[str], None] = 'e0e917b507ac'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('reply_cache',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('tweet_hash', sa.Text(), nullable=False),
+    sa.Column('prompt_version', sa.Text(), nullable=False),
+    sa.Column('reply', sa.Text(), nullable=False),
+    sa.Column('hits', sa.BigInteger(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id', name=op.f('reply_cache_pkey')),
+    sa.UniqueConstraint('tweet_hash', 'prompt_version', name=op.f('reply_cache_tweet_hash_key'))
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('reply_cache')
@@ -0,0 +1,39 @@
+"""action budgets
+
+Revision ID: 92129d6a46d7
+Revises: 69ad0170baf0
+Create Date: 2026-10-17 15:02:41.530917
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '92129d6a46d7'
+down_revision: Union[str, Sequence[str], None] = '69ad0170baf0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('action_budgets',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('bot_id', sa.Integer(), nullable=False),
+    sa.Column('action', sa.Text(), nullable=False),
+    sa.Column('tokens', sa.Float(), nullable=False),
+    sa.Column('refilled_at', sa.DateTime(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['bot_id'], ['bots.id'], name=op.f('action_budgets_bot_id_fkey')),
+    sa.PrimaryKeyConstraint('id', name=op.f('action_budgets_pkey')),
+    sa.UniqueConstraint('bot_id', 'action', name=op.f('action_budgets_bot_id_key'))
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('action_budgets')
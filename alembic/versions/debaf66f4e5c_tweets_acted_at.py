@@ -0,0 +1,32 @@
+"""tweets acted at
+
+Revision ID: debaf66f4e5c
+Revises: 57cd28412aa0
+Create Date: 2026-10-17 07:12:45.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'debaf66f4e5c'
+down_revision: Union[str, Sequence[str], None] = '57cd28412aa0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('tweets', sa.Column('acted_at', sa.DateTime(), nullable=True))
+    # Until now only tweets a bot acted on were stored.
+    op.execute('UPDATE tweets SET acted_at = created_at')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Scraped-only rows would read as acted on without the marker.
+    op.execute('DELETE FROM tweets WHERE acted_at IS NULL')
+    op.drop_column('tweets', 'acted_at')
@@ -0,0 +1,32 @@
+"""tweets indexes
+
+Revision ID: f3ad577956a7
+Revises: 14b67a29a08a
+Create Date: 2026-10-17 11:02:18.220457
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3ad577956a7'
+down_revision: Union[str, Sequence[str], None] = '14b67a29a08a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'tweets_bot_id_created_at_idx', 'tweets', ['bot_id', 'created_at'], unique=False
+    )
+    op.create_index('tweets_created_at_idx', 'tweets', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('tweets_created_at_idx', table_name='tweets')
+    op.drop_index('tweets_bot_id_created_at_idx', table_name='tweets')
@@ -1,12 +1,74 @@
 from src.twitter.tweets import Tweet
+from src.utils.metrics import timed
+from langchain_core.language_models import BaseChatModel
 from langchain_openai import ChatOpenAI
 from langsmith import traceable
 
+REPLY_MODEL = "gpt-4.1-mini"
+
+PROMPT_TEMPLATE = (
+    "Напиши коротку, дружню відповідь українською на цей твіт:\n\n"
+    "«{text}»\n\n"
+    "Будь позитивним та підтримуючим."
+    "Твіт повинен бути коротким і лаконічним. Десь пару речень."
+)
+
+
+class ReplyGenerator:
+    """
+    LLM reply writer that keeps one chat client (and its HTTP pool) alive.
+
+    Parameters
+    ----------
+    llm : BaseChatModel | None
+        Chat model to use; defaults to `ChatOpenAI` with `REPLY_MODEL`. Pass a
+        fake model (e.g. ``FakeListChatModel``) to run offline.
+    """
+
+    def __init__(self, llm: BaseChatModel | None = None):
+        self.llm = llm if llm is not None else ChatOpenAI(model=REPLY_MODEL)
+
+    @staticmethod
+    def build_prompt(tweet: Tweet) -> str:
+        return PROMPT_TEMPLATE.format(text=tweet.text)
+
+    @timed("llm.generate_reply")
+    @traceable(name="generate_reply")
+    async def generate_reply(self, tweet: Tweet) -> str:
+        """
+        Very simple LLM-powered reply; tweak the prompt to your taste.
+
+        Parameters
+        ----------
+        tweet : Tweet
+        Returns
+        -------
+        str
+        """
+        llm_response = await self.llm.ainvoke(self.build_prompt(tweet))
+        return llm_response.content
+
+
+_reply_generator: ReplyGenerator | None = None
+
+
+def get_reply_generator() -> ReplyGenerator:
+    """
+    Process-wide `ReplyGenerator`, created on first use.
+
+    Returns
+    -------
+    ReplyGenerator
+    """
+    global _reply_generator
+    if _reply_generator is None:
+        _reply_generator = ReplyGenerator()
+    return _reply_generator
+
 
-@traceable(run_name="generate_reply")
 async def generate_reply(tweet: Tweet) -> str:
     """
-    Very simple LLM-powered reply; tweak the prompt to your taste.
+    Generate a reply with the shared `ReplyGenerator`.
 
     Parameters
     ----------
@@ -15,13 +77,4 @@ async def generate_reply(tweet: Tweet) -> str:
     -------
     str
     """
-    llm = ChatOpenAI(model="gpt-4.1-mini")
-
-    prompt = (
-        "Напиши коротку, дружню відповідь українською на цей твіт:\n\n"
-        f"«{tweet.text}»\n\n"
-        "Будь позитивним та підтримуючим."
-        "Твіт повинен бути коротким і лаконічним. Десь пару речень."
-    )
-    llm_response = await llm.ainvoke(prompt)
-    return llm_response.content
+    return await get_reply_generator().generate_reply(tweet)
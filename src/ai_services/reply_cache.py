@@ -0,0 +1,202 @@
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.ai_services.ai_generate_reply import (
+    PROMPT_TEMPLATE,
+    REPLY_MODEL,
+    ReplyGenerator,
+)
+from src.database.db import dialect_insert
+from src.database.models import ReplyCache
+from src.twitter.tweets import Tweet, compute_tweet_hash
+from src.utils.metrics import timed
+
+
+def _utcnow() -> datetime:
+    # Timestamps are naive UTC, matching the database's now() in our containers.
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def prompt_version(template: str = PROMPT_TEMPLATE, model: str = REPLY_MODEL) -> str:
+    """
+    Short hash of the prompt template and model; part of every cache key, so
+    editing the prompt or switching models invalidates old replies.
+
+    Parameters
+    ----------
+    template : str
+    model : str
+    Returns
+    -------
+    str
+    """
+    return hashlib.sha256(f"{model}\n{template}".encode("utf-8")).hexdigest()[:16]
+
+
+@dataclass
+class ReplyCacheStats:
+    hits: int = 0
+    misses: int = 0
+    expired: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class ReplyCacheStore:
+    """
+    Postgres-backed cache of generated replies.
+
+    Keyed by the tweet hash from `compute_tweet_hash` plus `prompt_version`.
+    Entries older than *ttl* are treated as misses and deleted; once more
+    than *max_entries* rows exist the least recently used ones are evicted.
+    """
+
+    def __init__(
+        self,
+        ttl: timedelta = timedelta(days=7),
+        max_entries: int = 10_000,
+        version: str | None = None,
+        evict_every: int = 100,
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.version = version or prompt_version()
+        self.evict_every = evict_every
+        self.stats = ReplyCacheStats()
+        self._puts = 0
+
+    @timed("db.reply_cache_get")
+    async def get(self, session: AsyncSession, tweet_hash: str) -> str | None:
+        """
+        Return the cached reply for *tweet_hash*, or ``None`` on a miss.
+
+        Parameters
+        ----------
+        session : AsyncSession
+        tweet_hash : str
+        Returns
+        -------
+        str | None
+        """
+        key = (ReplyCache.tweet_hash == tweet_hash) & (
+            ReplyCache.prompt_version == self.version
+        )
+        result = await session.execute(
+            select(ReplyCache.reply, ReplyCache.created_at).where(key)
+        )
+        row = result.one_or_none()
+
+        if row is None:
+            self.stats.misses += 1
+            return None
+        if row.created_at < _utcnow() - self.ttl:
+            self.stats.misses += 1
+            self.stats.expired += 1
+            await session.execute(delete(ReplyCache).where(key))
+            await session.commit()
+            return None
+
+        self.stats.hits += 1
+        await session.execute(
+            update(ReplyCache).where(key).values(hits=ReplyCache.hits + 1)
+        )
+        await session.commit()
+        return row.reply
+
+    @timed("db.reply_cache_put")
+    async def put(self, session: AsyncSession, tweet_hash: str, reply: str) -> None:
+        """
+        Store *reply* for *tweet_hash*, replacing any previous entry.
+
+        Parameters
+        ----------
+        session : AsyncSession
+        tweet_hash : str
+        reply : str
+        """
+        stmt = dialect_insert(session)(ReplyCache).values(
+            tweet_hash=tweet_hash, prompt_version=self.version, reply=reply, hits=0
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ReplyCache.tweet_hash, ReplyCache.prompt_version],
+            set_={
+                "reply": reply,
+                "hits": 0,
+                "created_at": func.now(),
+                "updated_at": func.now(),
+            },
+        )
+        await session.execute(stmt)
+        await session.commit()
+
+        if self._puts % self.evict_every == 0:
+            await self.evict(session)
+        self._puts += 1
+
+    async def evict(self, session: AsyncSession) -> int:
+        """
+        Delete expired entries and trim the table to *max_entries*.
+
+        Parameters
+        ----------
+        session : AsyncSession
+        Returns
+        -------
+        int
+            Number of rows deleted.
+        """
+        expired = await session.execute(
+            delete(ReplyCache).where(ReplyCache.created_at < _utcnow() - self.ttl)
+        )
+        keep = (
+            select(ReplyCache.id)
+            .order_by(ReplyCache.updated_at.desc())
+            .limit(self.max_entries)
+        )
+        overflow = await session.execute(
+            delete(ReplyCache).where(ReplyCache.id.not_in(keep.scalar_subquery()))
+        )
+        await session.commit()
+
+        deleted = expired.rowcount + overflow.rowcount
+        self.stats.evictions += deleted
+        return deleted
+
+
+@timed("reply.get_or_generate_reply")
+async def get_or_generate_reply(
+    session: AsyncSession,
+    cache: ReplyCacheStore,
+    generator: ReplyGenerator,
+    tweet: Tweet,
+) -> str:
+    """
+    Serve a reply from *cache*, calling the LLM only on a miss.
+
+    `claim_tweet` lets a single bot act on each tweet, so a cached reply is
+    never posted twice to the same tweet.
+
+    Parameters
+    ----------
+    session : AsyncSession
+    cache : ReplyCacheStore
+    generator : ReplyGenerator
+    tweet : Tweet
+    Returns
+    -------
+    str
+    """
+    tweet_hash = compute_tweet_hash(tweet.author, tweet.text)
+    reply = await cache.get(session, tweet_hash)
+    if reply is None:
+        reply = await generator.generate_reply(tweet)
+        await cache.put(session, tweet_hash, reply)
+    return reply
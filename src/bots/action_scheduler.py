@@ -0,0 +1,137 @@
+import asyncio
+import random
+from collections import Counter
+from dataclasses import replace
+from logging import Logger
+from typing import Awaitable
+
+from src.bots.rate_limits import TokenBucket, save_token_buckets
+from src.database.db_writer import DbWriter
+from src.twitter.tweets import Tweet
+from src.twitter.twitter_portal import AppliedActions, TwitterPortal
+
+
+class ActionScheduler:
+    """
+    Acts on a bot's ranked tweets within per-action token buckets.
+
+    Like, reply and retweet each draw from their own `TokenBucket`. A tweet
+    is only opened while a like token is available; replying and retweeting
+    are skipped individually when their bucket is empty. The actions
+    themselves are `TwitterPortal.apply_bot_actions`. The buckets are
+    saved through *writer* after every tweet, so limits survive restarts.
+
+    Parameters
+    ----------
+    logger : Logger
+    portal : TwitterPortal
+    bot_id : int
+    buckets : dict[str, TokenBucket]
+        ``like``, ``reply`` and ``retweet`` buckets from `load_token_buckets`.
+    writer : DbWriter
+    jitter : tuple[float, float]
+        Range, in seconds, of the random pause between two tweets.
+    """
+
+    def __init__(
+        self,
+        logger: Logger,
+        portal: TwitterPortal,
+        bot_id: int,
+        buckets: dict[str, TokenBucket],
+        writer: DbWriter,
+        jitter: tuple[float, float] = (20.0, 90.0),
+    ):
+        self.logger = logger
+        self.portal = portal
+        self.bot_id = bot_id
+        self.buckets = buckets
+        self.writer = writer
+        self.jitter = jitter
+        self.actions: Counter[str] = Counter()
+
+    def can_act(self) -> bool:
+        return self.buckets["like"].available()
+
+    def can_reply(self) -> bool:
+        return self.buckets["reply"].available()
+
+    def seconds_until_ready(self) -> float:
+        return self.buckets["like"].seconds_until_available()
+
+    async def act_on(
+        self, tweet: Tweet, reply_text: str | Awaitable[str | None] | None = None
+    ) -> str | None:
+        """
+        Like, reply to and retweet *tweet* as far as the budgets allow.
+
+        Parameters
+        ----------
+        tweet : Tweet
+        reply_text : str | Awaitable[str | None] | None
+            The reply, or a pending task producing it (awaited right before
+            typing). ``None``, given or produced, skips the reply.
+        Returns
+        -------
+        str | None
+            The reply that was posted, if any.
+        """
+        like, reply, retweet = (
+            self.buckets[action] for action in ("like", "reply", "retweet")
+        )
+        if not like.take():
+            return None
+        # Tokens are taken up front; those of actions that don't happen (a
+        # no-op, a missing reply or an error) are given back below.
+        may_reply = reply_text is not None and reply.take()
+        may_retweet = retweet.take()
+
+        applied = AppliedActions()
+        try:
+            await self.portal.apply_bot_actions(
+                tweet,
+                reply_text if may_reply else None,
+                retweet=may_retweet,
+                applied=applied,
+            )
+        finally:
+            if not applied.liked:
+                like.give_back()
+            if may_reply and applied.reply is None:
+                reply.give_back()
+            if may_retweet and not applied.retweeted:
+                retweet.give_back()
+            self.actions["like"] += applied.liked
+            self.actions["reply"] += applied.reply is not None
+            self.actions["retweet"] += applied.retweeted
+            await self._save()
+        return applied.reply
+
+    async def pause(self) -> None:
+        """Sleep a random *jitter* interval between two tweets."""
+        await asyncio.sleep(random.uniform(*self.jitter))
+
+    async def wait_until_ready(self, deadline: float) -> bool:
+        """
+        Sleep until a like token is available (plus jitter).
+
+        Parameters
+        ----------
+        deadline : float
+            Event-loop time the bot's session ends at.
+        Returns
+        -------
+        bool
+            ``False`` without sleeping when the wait would pass *deadline*.
+        """
+        delay = self.seconds_until_ready() + random.uniform(*self.jitter)
+        if asyncio.get_running_loop().time() + delay >= deadline:
+            return False
+        self.logger.info("Next action window in %.0f s", delay)
+        await asyncio.sleep(delay)
+        return True
+
+    async def _save(self) -> None:
+        # Snapshot: the writer runs later, while the buckets keep changing.
+        snapshot = {action: replace(b) for action, b in self.buckets.items()}
+        await self.writer.submit(save_token_buckets, self.bot_id, snapshot)
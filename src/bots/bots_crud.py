@@ -1,11 +1,13 @@
 # src/bots.py
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update
 from cryptography.fernet import Fernet, InvalidToken
 from pydantic import BaseModel, SecretStr
 
+from src.bots.session_store import decode_session, encode_session, session_digest
 from src.database.models import Bots
 from src.settings import settings
+from src.utils.metrics import timed
 
 _fernet = Fernet(settings.fernet_key.encode())
 
@@ -15,10 +17,12 @@ class Bot(BaseModel):
     username: str
     password_decrypted: SecretStr
     login: str
-    session_data: dict
+    # Not loaded by `get_bot_by_name`; see `load_session_data`.
+    session_data: dict | None = None
     id: int
 
 
+@timed("db.create_bot")
 async def create_bot(
     session: AsyncSession,
     bot_name: str,
@@ -38,13 +42,15 @@ async def create_bot(
     password : str
     """
     encrypted = _fernet.encrypt(password.encode()).decode()
+    session_data = session_data or {}
 
     bot = Bots(
         bot_name=bot_name,
         username=username,
         password=encrypted,
         login=login,
-        session=session_data or {},
+        session_blob=encode_session(session_data),
+        session_hash=session_digest(session_data),
     )
     session.add(bot)
     await session.commit()
@@ -52,6 +58,7 @@ async def create_bot(
     return bot
 
 
+@timed("db.get_bot_by_name")
 async def get_bot_by_name(
     session: AsyncSession,
     bot_name: str,
@@ -59,6 +66,9 @@ async def get_bot_by_name(
     """
     Retrieve a bot by name and decrypt its password before returning.
 
+    The stored session is left out (``session_data`` is ``None``); load it
+    with `load_session_data` right before starting a browser.
+
     Parameters
     ----------
     session : AsyncSession
@@ -78,33 +88,58 @@ async def get_bot_by_name(
             username=bot.username,
             password_decrypted=SecretStr(decrypted),
             login=bot.login,
-            session_data=bot.session,
             id=bot.id,
         )
     except InvalidToken:
         raise ValueError("Invalid token for bot. Please check the fernet key.")
 
 
+@timed("db.load_session_data")
+async def load_session_data(session: AsyncSession, bot_id: int) -> dict:
+    """
+    Fetch and decompress a bot's stored ``storage_state``.
+
+    Parameters
+    ----------
+    session : AsyncSession
+    bot_id : int
+    Returns
+    -------
+    dict
+        Empty when the bot has no stored session.
+    """
+    blob = await session.scalar(select(Bots.session_blob).where(Bots.id == bot_id))
+    return decode_session(blob)
+
+
+@timed("db.update_session_data")
 async def update_session_data(
     session: AsyncSession,
     bot_id: int,
     session_data: dict,
-) -> Bots | None:
+) -> bool:
     """
-    Update only the session data for a bot.
+    Store a bot's session, unless it matches the stored one.
 
     Parameters
     ----------
     session : AsyncSession
     bot_id : int
     session_data : dict
+    Returns
     -------
+    bool
+        Whether anything was written.
     """
-    bot = await session.get(Bots, bot_id)
-    if not bot:
-        return None
-
-    bot.session = session_data
+    digest = session_digest(session_data)
+    stored = await session.scalar(select(Bots.session_hash).where(Bots.id == bot_id))
+    if stored == digest:
+        return False
+
+    result = await session.execute(
+        update(Bots)
+        .where(Bots.id == bot_id)
+        .values(session_blob=encode_session(session_data), session_hash=digest)
+    )
     await session.commit()
-    await session.refresh(bot)
-    return bot
+    return result.rowcount > 0
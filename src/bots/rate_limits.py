@@ -0,0 +1,156 @@
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database.db import dialect_insert
+from src.database.models import ActionBudgets
+from src.settings import settings
+from src.utils.metrics import timed
+
+
+def utcnow() -> datetime:
+    # Naive UTC, like the timestamps stored by the database.
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """
+    Sustained rate and burst size of one action type.
+
+    Attributes
+    ----------
+    per_hour : float
+        Tokens added per hour.
+    burst : int
+        Bucket capacity: how many actions may happen back to back.
+    """
+
+    per_hour: float
+    burst: int
+
+
+DEFAULT_RATE_LIMITS: dict[str, RateLimit] = {
+    "like": RateLimit(settings.likes_per_hour, settings.action_burst),
+    "reply": RateLimit(settings.replies_per_hour, settings.action_burst),
+    "retweet": RateLimit(settings.retweets_per_hour, settings.action_burst),
+}
+
+
+@dataclass
+class TokenBucket:
+    limit: RateLimit
+    tokens: float
+    refilled_at: datetime
+
+    @classmethod
+    def full(cls, limit: RateLimit, now: datetime | None = None) -> "TokenBucket":
+        return cls(limit, float(limit.burst), now or utcnow())
+
+    def refill(self, now: datetime | None = None) -> None:
+        now = now or utcnow()
+        elapsed = max((now - self.refilled_at).total_seconds(), 0.0)
+        self.tokens = min(
+            float(self.limit.burst), self.tokens + elapsed * self.limit.per_hour / 3600
+        )
+        self.refilled_at = now
+
+    def available(self, now: datetime | None = None) -> bool:
+        self.refill(now)
+        return self.tokens >= 1
+
+    def take(self, now: datetime | None = None) -> bool:
+        """Consume one token; ``False`` (and nothing consumed) when empty."""
+        if not self.available(now):
+            return False
+        self.tokens -= 1
+        return True
+
+    def give_back(self) -> None:
+        """Return a token taken for an action that turned out to be a no-op."""
+        self.tokens = min(float(self.limit.burst), self.tokens + 1)
+
+    def seconds_until_available(self, now: datetime | None = None) -> float:
+        self.refill(now)
+        if self.tokens >= 1:
+            return 0.0
+        if self.limit.per_hour <= 0:
+            return float("inf")
+        return (1 - self.tokens) * 3600 / self.limit.per_hour
+
+
+@timed("db.load_token_buckets")
+async def load_token_buckets(
+    session: AsyncSession,
+    bot_id: int,
+    limits: dict[str, RateLimit] = DEFAULT_RATE_LIMITS,
+) -> dict[str, TokenBucket]:
+    """
+    Restore a bot's token buckets; actions never stored start full.
+
+    Parameters
+    ----------
+    session : AsyncSession
+    bot_id : int
+    limits : dict[str, RateLimit]
+    Returns
+    -------
+    dict[str, TokenBucket]
+    """
+    result = await session.execute(
+        select(ActionBudgets).where(ActionBudgets.bot_id == bot_id)
+    )
+    stored = {row.action: row for row in result.scalars()}
+
+    buckets = {}
+    for action, limit in limits.items():
+        row = stored.get(action)
+        if row is None:
+            buckets[action] = TokenBucket.full(limit)
+        else:
+            buckets[action] = TokenBucket(
+                limit, min(row.tokens, float(limit.burst)), row.refilled_at
+            )
+    return buckets
+
+
+@timed("db.save_token_buckets")
+async def save_token_buckets(
+    session: AsyncSession,
+    bot_id: int,
+    buckets: dict[str, TokenBucket],
+) -> None:
+    """
+    Upsert a bot's token buckets.
+
+    Parameters
+    ----------
+    session : AsyncSession
+    bot_id : int
+    buckets : dict[str, TokenBucket]
+    """
+    if not buckets:
+        return
+    stmt = dialect_insert(session)(ActionBudgets).values(
+        [
+            {
+                "bot_id": bot_id,
+                "action": action,
+                "tokens": bucket.tokens,
+                "refilled_at": bucket.refilled_at,
+            }
+            for action, bucket in buckets.items()
+        ]
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[ActionBudgets.bot_id, ActionBudgets.action],
+        set_={
+            "tokens": stmt.excluded.tokens,
+            "refilled_at": stmt.excluded.refilled_at,
+            "updated_at": func.now(),
+        },
+    )
+    await session.execute(stmt)
+    await session.commit()
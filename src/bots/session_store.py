@@ -0,0 +1,68 @@
+import gzip
+import hashlib
+import json
+
+# Level 6 compresses a storage state about as well as 9, several times faster.
+COMPRESS_LEVEL = 6
+
+
+def _canonical(session_data: dict) -> dict:
+    # Cookie expiries roll forward on every page load; compare them by day so
+    # that alone doesn't count as a change. Stored expiries may lag a day at
+    # most, which only makes `cookie_state` err on the early side.
+    cookies = [
+        {**c, "expires": int(c["expires"] // 86_400)}
+        if c.get("expires", -1) > 0
+        else c
+        for c in session_data.get("cookies", [])
+    ]
+    return {**session_data, "cookies": cookies}
+
+
+def session_digest(session_data: dict) -> str:
+    """
+    Hash of a Playwright ``storage_state``, stable across key order and
+    same-day cookie renewals.
+
+    Parameters
+    ----------
+    session_data : dict
+    Returns
+    -------
+    str
+    """
+    canonical = json.dumps(
+        _canonical(session_data), sort_keys=True, separators=(",", ":")
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def encode_session(session_data: dict) -> bytes:
+    """
+    Compress a ``storage_state`` for the ``bots.session_blob`` column.
+
+    Parameters
+    ----------
+    session_data : dict
+    Returns
+    -------
+    bytes
+    """
+    raw = json.dumps(session_data, separators=(",", ":")).encode()
+    return gzip.compress(raw, COMPRESS_LEVEL)
+
+
+def decode_session(blob: bytes | None) -> dict:
+    """
+    Inverse of `encode_session`; an empty ``storage_state`` for ``None``.
+
+    Parameters
+    ----------
+    blob : bytes | None
+    Returns
+    -------
+    dict
+    """
+    if not blob:
+        return {}
+    return json.loads(gzip.decompress(blob))
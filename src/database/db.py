@@ -1,24 +1,33 @@
 import re
+import time as _time
+from dataclasses import dataclass
 from datetime import date, datetime, time
 from typing import Annotated
 
 from sqlalchemy import (
+    JSON,
     BigInteger,
     Boolean,
     Date,
     DateTime,
     Integer,
+    LargeBinary,
     MetaData,
     Text,
     Time,
+    exc,
     func,
+    make_url,
 )
-from sqlalchemy.dialects.sqlite import JSON
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declared_attr
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from src.settings import settings
+from src.utils.metrics import metrics
 
 DB_NAMING_CONVENTION = {
     "ix": "%(column_0_label)s_idx",
@@ -29,7 +38,97 @@ DB_NAMING_CONVENTION = {
 }
 
 
-engine = create_async_engine(settings.database_url)
+@dataclass
+class PoolMetrics:
+    """Connection checkout wait times, collected by `MeteredPool`."""
+
+    checkouts: int = 0
+    timeouts: int = 0
+    wait_total: float = 0.0
+    wait_max: float = 0.0
+
+    @property
+    def wait_avg(self) -> float:
+        return self.wait_total / self.checkouts if self.checkouts else 0.0
+
+    def record(self, waited: float, timed_out: bool = False) -> None:
+        if timed_out:
+            self.timeouts += 1
+        else:
+            self.checkouts += 1
+            self.wait_total += waited
+        self.wait_max = max(self.wait_max, waited)
+
+    def prometheus_lines(self, prefix: str) -> list[str]:
+        """
+        The counters in the Prometheus text format, for `Metrics.register`.
+
+        Parameters
+        ----------
+        prefix : str
+        Returns
+        -------
+        list[str]
+        """
+        p = f"{prefix}_db_pool"
+        return [
+            f"# HELP {p}_checkouts_total Connections checked out of the pool.",
+            f"# TYPE {p}_checkouts_total counter",
+            f"{p}_checkouts_total {self.checkouts}",
+            f"# HELP {p}_timeouts_total Checkouts that timed out waiting.",
+            f"# TYPE {p}_timeouts_total counter",
+            f"{p}_timeouts_total {self.timeouts}",
+            f"# HELP {p}_wait_seconds_total Time spent waiting for a connection.",
+            f"# TYPE {p}_wait_seconds_total counter",
+            f"{p}_wait_seconds_total {self.wait_total:.6f}",
+            f"# HELP {p}_wait_seconds_max Longest wait for a connection.",
+            f"# TYPE {p}_wait_seconds_max gauge",
+            f"{p}_wait_seconds_max {self.wait_max:.6f}",
+        ]
+
+
+pool_metrics = PoolMetrics()
+metrics.register(pool_metrics.prometheus_lines)
+
+
+class MeteredPool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited for a connection."""
+
+    def _do_get(self):
+        start = _time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except exc.TimeoutError:
+            pool_metrics.record(_time.perf_counter() - start, timed_out=True)
+            raise
+        pool_metrics.record(_time.perf_counter() - start)
+        return conn
+
+
+def _engine_options(database_url: str) -> dict:
+    """Pool and driver options; only PostgreSQL gets the tuned queue pool."""
+    url = make_url(database_url)
+    if url.get_backend_name() != "postgresql":
+        return {}
+
+    options = {
+        "poolclass": MeteredPool,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+    if url.get_driver_name() == "asyncpg":
+        options["connect_args"] = {
+            "prepared_statement_cache_size": settings.db_statement_cache_size
+        }
+    return options
+
+
+engine = create_async_engine(
+    settings.database_url, **_engine_options(settings.database_url)
+)
 async_session = async_sessionmaker(engine, expire_on_commit=False)
 
 metadata = MetaData(naming_convention=DB_NAMING_CONVENTION)
@@ -42,7 +141,8 @@ class Base(DeclarativeBase):
     metadata = metadata
 
     type_annotation_map = {
-        dict: JSON,
+        dict: JSON().with_variant(JSONB(), "postgresql"),
+        bytes: LargeBinary,
         int: BigInteger,
         str: Text,
         bool: Boolean,
@@ -69,6 +169,13 @@ class TimestampMixin:
     )
 
 
+def dialect_insert(session: AsyncSession):
+    """Dialect-specific INSERT that supports ON CONFLICT ... RETURNING."""
+    if session.get_bind().dialect.name == "sqlite":
+        return sqlite.insert
+    return postgresql.insert
+
+
 def camel_to_snake(name):
     s1 = re.sub("(.)([A-Z][a-z]+)", r"\1_\2", name)
     return re.sub("([a-z0-9])([A-Z])", r"\1_\2", s1).lower()
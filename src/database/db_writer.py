@@ -0,0 +1,68 @@
+import asyncio
+from logging import Logger
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.database.db import async_session
+
+
+class DbWriter:
+    """
+    Background writer that runs CRUD calls off the caller's critical path.
+
+    Jobs are executed one at a time, in submission order, on the writer's own
+    session, so they never race with the caller's session. The queue is
+    bounded: when the database falls behind, `submit` waits.
+    """
+
+    def __init__(
+        self,
+        logger: Logger,
+        session_factory: async_sessionmaker[AsyncSession] = async_session,
+        maxsize: int = 100,
+    ):
+        self.logger = logger
+        self.session_factory = session_factory
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self._task: asyncio.Task | None = None
+
+    async def __aenter__(self):
+        self._task = asyncio.create_task(self._run())
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.queue.put(None)
+        await self._task
+
+    async def submit(
+        self, fn: Callable[..., Awaitable[Any]], *args: Any, **kwargs: Any
+    ) -> asyncio.Future:
+        """
+        Queue ``fn(session, *args, **kwargs)``.
+
+        Parameters
+        ----------
+        fn : Callable[..., Awaitable[Any]]
+            A CRUD coroutine function taking the session as first argument.
+        Returns
+        -------
+        asyncio.Future
+            Resolves to the call's result; failures are logged either way.
+        """
+        future = asyncio.get_running_loop().create_future()
+        # Failures are logged by _run; don't warn if nobody awaits the future.
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        await self.queue.put((fn, args, kwargs, future))
+        return future
+
+    async def _run(self) -> None:
+        async with self.session_factory() as session:
+            while (job := await self.queue.get()) is not None:
+                fn, args, kwargs, future = job
+                try:
+                    future.set_result(await fn(session, *args, **kwargs))
+                except Exception as e:
+                    self.logger.exception("Background write %s failed", fn.__name__)
+                    await session.rollback()
+                    future.set_exception(e)
@@ -1,4 +1,6 @@
-from sqlalchemy import ForeignKey
+from datetime import datetime
+
+from sqlalchemy import ForeignKey, Index, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.database.db import Base, TableNameMixin, TimestampMixin, int_pk
@@ -10,7 +12,10 @@ class Bots(TableNameMixin, TimestampMixin, Base):
     username: Mapped[str | None]
     password: Mapped[str | None]
     login: Mapped[str | None]
-    session: Mapped[dict | None]
+    # gzip-compressed storage_state, see src.bots.session_store; deferred so
+    # bot lookups don't fetch it.
+    session_blob: Mapped[bytes | None] = mapped_column(deferred=True)
+    session_hash: Mapped[str | None]
 
     tweets: Mapped[list["Tweets"]] = relationship(
         "Tweets", back_populates="bot", cascade="all, delete-orphan"
@@ -18,6 +23,11 @@ class Bots(TableNameMixin, TimestampMixin, Base):
 
 
 class Tweets(TableNameMixin, TimestampMixin, Base):
+    __table_args__ = (
+        Index("tweets_bot_id_created_at_idx", "bot_id", "created_at"),
+        Index("tweets_created_at_idx", "created_at"),
+    )
+
     id: Mapped[int_pk]
     bot_id: Mapped[int] = mapped_column(ForeignKey("bots.id"))
     reply_message: Mapped[str | None]
@@ -28,6 +38,28 @@ class Tweets(TableNameMixin, TimestampMixin, Base):
     views: Mapped[int] = mapped_column(default=0)
     url: Mapped[str]
     viral_score: Mapped[float] = mapped_column(default=0.0)
-    hash: Mapped[str]
+    hash: Mapped[str] = mapped_column(unique=True)
+    # Set once a bot claims the tweet to act on it; scraped-only rows are NULL.
+    acted_at: Mapped[datetime | None]
 
     bot: Mapped["Bots"] = relationship("Bots", back_populates="tweets")
+
+
+class ReplyCache(TableNameMixin, TimestampMixin, Base):
+    __table_args__ = (UniqueConstraint("tweet_hash", "prompt_version"),)
+
+    id: Mapped[int_pk]
+    tweet_hash: Mapped[str]
+    prompt_version: Mapped[str]
+    reply: Mapped[str]
+    hits: Mapped[int] = mapped_column(default=0)
+
+
+class ActionBudgets(TableNameMixin, TimestampMixin, Base):
+    __table_args__ = (UniqueConstraint("bot_id", "action"),)
+
+    id: Mapped[int_pk]
+    bot_id: Mapped[int] = mapped_column(ForeignKey("bots.id"))
+    action: Mapped[str]
+    tokens: Mapped[float]
+    refilled_at: Mapped[datetime]
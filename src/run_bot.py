@@ -1,72 +1,587 @@
-from src.bots.bots_crud import get_bot_by_name, update_session_data
-from src.database.db import async_session
-from src.ai_services.ai_generate_reply import generate_reply
-from src.twitter.tweets import find_most_viral_tweet
+from src.bots.action_scheduler import ActionScheduler
+from src.bots.bots_crud import (
+    Bot,
+    get_bot_by_name,
+    load_session_data,
+    update_session_data,
+)
+from src.bots.rate_limits import load_token_buckets
+from src.database.db import async_session, pool_metrics
+from src.database.db_writer import DbWriter
+from src.ai_services.ai_generate_reply import get_reply_generator
+from src.ai_services.reply_cache import ReplyCacheStore, get_or_generate_reply
+from src.twitter.ranking import RankedTweet, RankingWeights
+from src.twitter.scrape_pipeline import ScrapePipeline
+from src.twitter.tweets import Tweet
 from src.twitter.twitter_portal import TwitterPortal
-from src.twitter.tweets_crud import tweet_exists, create_tweet, update_tweet_reply
+from src.twitter.context_pool import BrowserContextPool
+from src.twitter.pacing import HUMAN_PACING, PACING_PROFILES, PacingProfile
+from src.twitter.request_profiles import REQUEST_PROFILES
+from src.twitter.session_health import SessionHealth
+from src.settings import settings
+from src.utils.logs import bot_context, configure_logging
+from src.utils.metrics import RunTrace, metrics, trace_run
+from src.utils.portal_utils import retry_deadline, retry_stats
+from src.twitter.tweets_crud import (
+    claim_tweet,
+    get_seen_tweet_keys,
+    update_tweet_reply,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+from contextlib import AsyncExitStack, nullcontext
+from pathlib import Path
+import argparse
 import logging
 import asyncio
+import sys
 
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO)
 
+reply_cache = ReplyCacheStore()
+session_health = SessionHealth(logger)
 
-async def run_bot(bot_name: str, max_tweets: int = 8) -> None:
+# `Tweet.viral_score` ordering; the author penalty only matters for top_k > 1.
+RANKING_WEIGHTS = RankingWeights(author_penalty=0.5)
+
+# How long past its planned session a bot may keep retrying failed steps.
+RETRY_GRACE = 300.0
+
+
+async def _generate_reply(tweet: Tweet) -> str:
     """
-    Main function to run the bot.
+    Generate (or fetch from cache) a reply on a session of its own, so it can
+    run as a task alongside the bot's other database work.
 
     Parameters
     ----------
-    bot_name : str
+    tweet : Tweet
+    Returns
+    -------
+    str
     """
-    logger.info(f"Running bot {bot_name} with {max_tweets} tweets")
-
     async with async_session() as session:
-        bot_data = await get_bot_by_name(session, bot_name)
-        if not bot_data:
-            raise ValueError(f"Bot {bot_name} not found")
+        return await get_or_generate_reply(
+            session,
+            reply_cache,
+            get_reply_generator(),
+            tweet,
+        )
+
+
+async def _act_on_top_tweets(
+    session: AsyncSession,
+    scheduler: ActionScheduler,
+    writer: DbWriter,
+    bot_data: Bot,
+    ranked: list[RankedTweet],
+) -> None:
+    """
+    Act on the best-ranked tweets of one scrape, within the bot's budgets.
+
+    Parameters
+    ----------
+    session : AsyncSession
+    scheduler : ActionScheduler
+    writer : DbWriter
+    bot_data : Bot
+    ranked : list[RankedTweet]
+        From `ScrapePipeline.run`, best first.
+    """
+    if not ranked:
+        logger.info("No most viral tweet found")
+        return
+
+    acted = False
+    for n, (score, tweet) in enumerate(ranked, start=1):
+        if not scheduler.can_act():
+            logger.info("Like budget exhausted, leaving the rest for later")
+            return
+        logger.info(
+            "Top tweet #%d: %s - %s... Score: %.1f",
+            n,
+            tweet.author,
+            tweet.text[:100],
+            score,
+        )
+        tweet_id = await claim_tweet(session, bot_data.id, tweet)
+        if tweet_id is None:
+            logger.info("Tweet already acted on by a bot")
+            continue
+
+        if acted:
+            await scheduler.pause()
+        reply_task = None
+        if scheduler.can_reply():
+            logger.info("Generating reply in the background")
+            reply_task = asyncio.create_task(_generate_reply(tweet))
+        try:
+            logger.info("Applying bot actions")
+            reply_text = await scheduler.act_on(tweet, reply_task)
+        finally:
+            if reply_task is not None:
+                reply_task.cancel()
+        acted = True
+        if reply_text is not None:
+            await writer.submit(update_tweet_reply, tweet_id, reply_text)
+
+
+def _spans_path() -> Path | None:
+    """``spans.jsonl`` in ``METRICS_DIR``, or ``None`` when that is unset."""
+    if not settings.metrics_dir:
+        return None
+    directory = Path(settings.metrics_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+    return directory / "spans.jsonl"
+
+
+def _report_trace(trace: RunTrace) -> None:
+    """
+    Log where a run's time went and, with ``METRICS_DIR`` set, export its
+    remaining spans and the process metrics.
 
-        logger.info(f"Bot {bot_name} found")
-        twitter_portal = TwitterPortal(
-            headless=False, session=bot_data.session_data, logger=logger
+    Parameters
+    ----------
+    trace : RunTrace
+    """
+    logger.info("Bot %s stages: %s", trace.bot, trace.summary())
+    if trace.dropped:
+        logger.warning("Bot %s: %s spans not kept", trace.bot, trace.dropped)
+    if trace.path is None:
+        return
+    trace.flush()
+    metrics.write_prometheus(Path(trace.path).with_name("metrics.prom"))
+
+
+async def _open_portal(
+    stack: AsyncExitStack,
+    bot_data: Bot,
+    pool: BrowserContextPool | None,
+    headless: bool,
+    pacing: PacingProfile = HUMAN_PACING,
+) -> TwitterPortal:
+    """
+    Build *bot_data*'s portal, on a context leased from *pool* if given.
+
+    The lease is released when *stack* closes; the portal itself still has
+    to be entered.
+
+    Parameters
+    ----------
+    stack : AsyncExitStack
+    bot_data : Bot
+    pool : BrowserContextPool | None
+    headless : bool
+    pacing : PacingProfile
+    Returns
+    -------
+    TwitterPortal
+    """
+    twitter_portal = TwitterPortal(
+        headless=headless,
+        session=bot_data.session_data,
+        logger=logger,
+        pacing=pacing,
+    )
+    if pool is not None:
+        leased = await stack.enter_async_context(
+            pool.lease(bot_data.id, bot_data.session_data)
         )
+        twitter_portal.set_context(leased.context, leased.page)
+        twitter_portal.request_stats = leased.request_stats
+    return twitter_portal
+
+
+async def _refresh_session(
+    bot_name: str, pool: BrowserContextPool | None, headless: bool
+) -> None:
+    """
+    Open the bot's home page (logging in if needed) and store the renewed
+    session. Runs in the background between two runs of the bot.
+
+    Parameters
+    ----------
+    bot_name : str
+    pool : BrowserContextPool | None
+    headless : bool
+    """
+    async with async_session() as session, AsyncExitStack() as stack:
+        stack.enter_context(bot_context(bot_name))
+        bot_data = await get_bot_by_name(session, bot_name)
+        bot_data.session_data = await load_session_data(session, bot_data.id)
+        twitter_portal = await _open_portal(stack, bot_data, pool, headless)
         async with twitter_portal:
             await twitter_portal.get_following_tweets_page(
                 username=bot_data.username,
                 password=bot_data.password_decrypted.get_secret_value(),
+                logged_in=session_health.cached(bot_data.id),
             )
             session_data = await twitter_portal.get_session()
             await update_session_data(session, bot_data.id, session_data)
-            tweets = await twitter_portal.scrape_home_timeline(max_tweets)
-            logging.info(f"Tweets: {len(tweets)}")
 
-            most_viral = find_most_viral_tweet(tweets)
 
-            if most_viral:
-                logging.info(
-                    f"Most viral tweet: {most_viral.author} - {most_viral.text[:100]}... "
-                    f"Viral score: {most_viral.viral_score}"
+async def _schedule_session_refresh(
+    bot_name: str,
+    pool: BrowserContextPool | None,
+    headless: bool,
+    semaphore: asyncio.Semaphore | None = None,
+) -> asyncio.Task | None:
+    """
+    Start a background `_refresh_session` if the bot's stored session is
+    dead or about to expire.
+
+    Parameters
+    ----------
+    bot_name : str
+    pool : BrowserContextPool | None
+    headless : bool
+    semaphore : asyncio.Semaphore | None
+        Held by the refresh while it runs, so refreshes count towards the
+        same concurrency limit as bot runs.
+    Returns
+    -------
+    asyncio.Task | None
+        The refresh, if one was started.
+    """
+    async with async_session() as session:
+        bot_data = await get_bot_by_name(session, bot_name)
+        if bot_data:
+            bot_data.session_data = await load_session_data(session, bot_data.id)
+    if not bot_data or not session_health.needs_refresh(
+        bot_data.id, bot_data.session_data
+    ):
+        return None
+
+    async def _refresh() -> None:
+        async with semaphore or nullcontext():
+            await _refresh_session(bot_name, pool, headless)
+
+    logger.info("Refreshing session of bot %s in the background", bot_name)
+    return session_health.refresh_in_background(bot_data.id, _refresh)
+
+
+async def run_bot(
+    bot_name: str,
+    max_tweets: int = 8,
+    pool: BrowserContextPool | None = None,
+    headless: bool = False,
+    top_k: int = 1,
+    session_minutes: float = 0.0,
+    pacing: PacingProfile = HUMAN_PACING,
+) -> None:
+    """
+    Main function to run the bot.
+
+    The run is pipelined: the bot's seen-tweet keys load while the timeline
+    opens, tweets are deduplicated and ranked while the timeline scrolls
+    (`ScrapePipeline`), session and reply writes go through a background
+    `DbWriter`, and the reply is generated while the browser opens and likes
+    the tweet.
+    The login state comes from `session_health` (cookie check and a small
+    API probe) instead of waiting for the home timeline to render.
+    Likes, replies and retweets are rate limited per bot by an
+    `ActionScheduler` whose token buckets persist in the database.
+    Portal, database and LLM steps are recorded as spans of a `RunTrace`,
+    summarized at the end of the run (see `src.utils.metrics`).
+
+    Parameters
+    ----------
+    bot_name : str
+    max_tweets : int
+    pool : BrowserContextPool | None
+        Pool to lease the bot's warm browser context from. When omitted the
+        portal launches (and closes) its own Chromium.
+    headless : bool
+    top_k : int
+        Best-ranked tweets to act on per scrape.
+    session_minutes : float
+        Keep the browser session open this long, scraping again whenever the
+        like budget allows. ``0`` acts on a single scrape. Failed steps stop
+        retrying `RETRY_GRACE` seconds after the session's planned end.
+    pacing : PacingProfile
+        Humanizing delays of this bot's portal.
+    """
+    logger.info("Running bot %s with %s tweets", bot_name, max_tweets)
+
+    async with async_session() as session, AsyncExitStack() as stack:
+        stack.enter_context(bot_context(bot_name))
+        trace = stack.enter_context(trace_run(bot_name, _spans_path()))
+        stack.callback(_report_trace, trace)
+        stack.enter_context(retry_deadline(session_minutes * 60 + RETRY_GRACE))
+        bot_data = await get_bot_by_name(session, bot_name)
+        if not bot_data:
+            raise ValueError(f"Bot {bot_name} not found")
+        # A background refresh may be about to store a new session.
+        await session_health.wait_refresh(bot_data.id)
+        bot_data.session_data = await load_session_data(session, bot_data.id)
+
+        logger.info("Bot %s found", bot_name)
+        twitter_portal = await _open_portal(stack, bot_data, pool, headless, pacing)
+        writer = await stack.enter_async_context(DbWriter(logger))
+
+        def _forget_health(exc_type, exc, tb) -> None:
+            if exc_type is not None:
+                session_health.invalidate(bot_data.id)
+
+        stack.push(_forget_health)
+
+        async with twitter_portal:
+            logged_in = await session_health.check(
+                bot_data.id, bot_data.session_data, twitter_portal.context
+            )
+            _, seen_keys = await asyncio.gather(
+                twitter_portal.get_following_tweets_page(
+                    username=bot_data.username,
+                    password=bot_data.password_decrypted.get_secret_value(),
+                    logged_in=logged_in,
+                ),
+                get_seen_tweet_keys(session, bot_data.id),
+            )
+            session_data = await twitter_portal.get_session()
+            session_health.mark(bot_data.id, True)
+            await writer.submit(update_session_data, bot_data.id, session_data)
+            twitter_portal.seen.seed(seen_keys)
+            scheduler = ActionScheduler(
+                logger,
+                twitter_portal,
+                bot_data.id,
+                await load_token_buckets(session, bot_data.id),
+                writer,
+            )
+            deadline = asyncio.get_running_loop().time() + session_minutes * 60
+
+            while True:
+                pipeline = ScrapePipeline(logger, twitter_portal, bot_data.id, session)
+                ranked = await pipeline.run(max_tweets, top_k, RANKING_WEIGHTS)
+                logger.info("Tweets: %s", pipeline.stats.summary())
+                await _act_on_top_tweets(session, scheduler, writer, bot_data, ranked)
+                if not await scheduler.wait_until_ready(deadline):
+                    break
+                await twitter_portal.get_following_tweets_page(
+                    username=bot_data.username,
+                    password=bot_data.password_decrypted.get_secret_value(),
+                    logged_in=True,
+                )
+
+            logger.info("Bot finished: %s", dict(scheduler.actions))
+            logger.info("Bot %s timings: %s", bot_name, twitter_portal.pacer.summary())
+            if twitter_portal.request_stats is not None:
+                logger.info(
+                    "Bot %s traffic: %s",
+                    bot_name,
+                    twitter_portal.request_stats.summary(),
                 )
-                if await tweet_exists(session, most_viral.author, most_viral.text):
-                    logging.info("Tweet already exists in database")
-                    return
 
-                logger.info("Creating tweet in database")
-                db_tweet = await create_tweet(session, bot_data.id, most_viral)
 
-                logger.info("Generating reply")
-                reply_text = await generate_reply(most_viral)
+async def run_many(
+    bot_names: list[str],
+    max_tweets: int = 8,
+    concurrency: int = 4,
+    headless: bool = False,
+    rounds: int = 1,
+    interval: float = 0.0,
+    request_profile: str = "full",
+    top_k: int = 1,
+    session_minutes: float = 0.0,
+    pacing: str = "human",
+) -> dict[str, BaseException | None]:
+    """
+    Run several bots concurrently on one shared Chromium.
+
+    Each bot gets its own isolated browser context from a warm pool, so later
+    rounds reuse the context (and its login) of earlier ones. A failing bot
+    is logged and reported in the result, the others keep running.
+
+    Parameters
+    ----------
+    bot_names : list[str]
+    max_tweets : int
+    concurrency : int
+        Maximum number of bots running at the same time.
+    headless : bool
+    rounds : int
+        How many times to run every bot.
+    interval : float
+        Seconds to wait between rounds.
+    request_profile : str
+        Name of the `REQUEST_PROFILES` entry applied to every bot context.
+    top_k : int
+        Best-ranked tweets each bot acts on per scrape.
+    session_minutes : float
+        How long each bot keeps acting within a round; see `run_bot`.
+    pacing : str
+        Name of the `PACING_PROFILES` entry used by every bot.
+    Returns
+    -------
+    dict[str, BaseException | None]
+        Bot name → the exception its last run failed with, or ``None``.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    refreshes: dict[str, asyncio.Task] = {}
+
+    async def _run_one(
+        bot_name: str, pool: BrowserContextPool
+    ) -> BaseException | None:
+        # The refresh needs a slot of its own: wait for it before taking one.
+        refresh = refreshes.pop(bot_name, None)
+        if refresh is not None:
+            await asyncio.shield(refresh)
 
-                logger.info("Applying bot actions")
-                await twitter_portal.apply_bot_actions(
-                    tweet=most_viral, reply_text=reply_text
+        error = None
+        async with semaphore:
+            try:
+                await run_bot(
+                    bot_name,
+                    max_tweets,
+                    pool=pool,
+                    top_k=top_k,
+                    session_minutes=session_minutes,
+                    pacing=PACING_PROFILES[pacing],
                 )
-                await update_tweet_reply(session, db_tweet.id, reply_text)
-            else:
-                logger.info("No most viral tweet found")
+            except Exception as e:
+                logger.exception("Bot %s failed", bot_name)
+                error = e
 
-            logger.info("Bot finished")
+        try:
+            refresh = await _schedule_session_refresh(
+                bot_name, pool, headless, semaphore
+            )
+        except Exception:
+            logger.exception("Scheduling a session refresh of bot %s failed", bot_name)
+        else:
+            if refresh is not None:
+                refreshes[bot_name] = refresh
+        return error
+
+    pool = BrowserContextPool(
+        logger=logger,
+        max_contexts=max(concurrency, len(bot_names)),
+        headless=headless,
+        request_profile=REQUEST_PROFILES[request_profile],
+    )
+    results: list[BaseException | None] = [None] * len(bot_names)
+    async with pool:
+        for round_no in range(rounds):
+            if round_no:
+                await asyncio.sleep(interval)
+            results = await asyncio.gather(
+                *(_run_one(name, pool) for name in bot_names)
+            )
+        await session_health.aclose()
+
+    logger.info(
+        "DB pool: %s checkouts, avg wait %.1f ms, max wait %.1f ms, %s timeouts",
+        pool_metrics.checkouts,
+        pool_metrics.wait_avg * 1000,
+        pool_metrics.wait_max * 1000,
+        pool_metrics.timeouts,
+    )
+    logger.info(
+        "Reply cache: %s hits, %s misses (%.0f%% hit rate)",
+        reply_cache.stats.hits,
+        reply_cache.stats.misses,
+        reply_cache.stats.hit_rate * 100,
+    )
+    logger.info(
+        "Session health: %s cached, %s probes, %s expired by cookies, "
+        "%s background refreshes",
+        session_health.stats.cache_hits,
+        session_health.stats.probes,
+        session_health.stats.cookie_rejects,
+        session_health.stats.refreshes,
+    )
+    for name, stats in retry_stats.items():
+        logger.info(
+            "Retries of %s: %s retried, %s gave up, %.1f s lost",
+            name,
+            stats.retries,
+            stats.exhausted,
+            stats.time_lost,
+        )
+    return dict(zip(bot_names, results))
+
+
+def main() -> None:
+    """
+    Run one or more bots from the command line.
+    """
+    parser = argparse.ArgumentParser(
+        prog="run-bot", description="Run one or more bots on a shared browser."
+    )
+    parser.add_argument(
+        "--bot-name",
+        "-n",
+        action="append",
+        required=True,
+        help="Bot to run; repeat the flag to run several bots",
+    )
+    parser.add_argument(
+        "--max-tweets", "-m", type=int, default=8, help="Tweets to scrape per bot"
+    )
+    parser.add_argument(
+        "--concurrency",
+        "-c",
+        type=int,
+        default=4,
+        help="Maximum number of bots running at the same time",
+    )
+    parser.add_argument(
+        "--headless", action="store_true", help="Run Chromium without a window"
+    )
+    parser.add_argument(
+        "--request-profile",
+        choices=sorted(REQUEST_PROFILES),
+        default="full",
+        help="Which requests to block ('light' skips images, video, fonts, analytics)",
+    )
+    parser.add_argument(
+        "--rounds", type=int, default=1, help="How many times to run every bot"
+    )
+    parser.add_argument(
+        "--interval", type=float, default=0.0, help="Seconds to wait between rounds"
+    )
+    parser.add_argument(
+        "--top-k",
+        type=int,
+        default=1,
+        help="Best-ranked tweets each bot acts on per scrape",
+    )
+    parser.add_argument(
+        "--session-minutes",
+        type=float,
+        default=0.0,
+        help="Keep each bot acting this long, within its rate limits",
+    )
+    parser.add_argument(
+        "--pacing",
+        choices=sorted(PACING_PROFILES),
+        default="human",
+        help="Humanizing delays between steps ('fast' is 10x shorter)",
+    )
+    args = parser.parse_args()
+
+    listener = configure_logging(settings.log_level, settings.log_format)
+    try:
+        results = asyncio.run(
+            run_many(
+                bot_names=args.bot_name,
+                max_tweets=args.max_tweets,
+                concurrency=args.concurrency,
+                headless=args.headless,
+                rounds=args.rounds,
+                interval=args.interval,
+                request_profile=args.request_profile,
+                top_k=args.top_k,
+                session_minutes=args.session_minutes,
+                pacing=args.pacing,
+            )
+        )
+        failed = [name for name, error in results.items() if error is not None]
+        if failed:
+            logger.error("Failed bots: %s", ", ".join(failed))
+            sys.exit(1)
+    finally:
+        listener.stop()
 
 
 if __name__ == "__main__":
-    asyncio.run(run_bot("bebbogdan"))
+    main()
@@ -5,6 +5,31 @@ class Settings(BaseSettings):
     database_url: str
     fernet_key: str
 
+    # SQLAlchemy connection pool (PostgreSQL only)
+    db_pool_size: int = 10
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    # asyncpg prepared-statement cache, per connection; 0 disables it
+    db_statement_cache_size: int = 100
+
+    # Per-bot action rate limits (token buckets, persisted in action_budgets)
+    likes_per_hour: float = 30.0
+    replies_per_hour: float = 8.0
+    retweets_per_hour: float = 8.0
+    action_burst: int = 3
+
+    # Scales every humanizing delay in TwitterPortal; readiness waits are unaffected
+    pacing_speed: float = 1.0
+
+    # Root log level and format ("text" or "json"); per-card logs are DEBUG
+    log_level: str = "INFO"
+    log_format: str = "text"
+
+    # Where run_bot appends spans.jsonl and rewrites metrics.prom; unset disables
+    metrics_dir: str | None = None
+
     model_config = SettingsConfigDict(
         env_file=".env", extra="ignore", env_ignore_empty=True
     )
@@ -0,0 +1,93 @@
+"""
+Compare per-row tweet persistence with `bulk_upsert_tweets`.
+
+Point it at a scratch database: a local Postgres container, or SQLite as a
+stand-in (needs ``aiosqlite``). Tables are created if missing and the rows
+written by the benchmark are removed afterwards.
+
+Usage
+-----
+uv run -m src.tests.bench_bulk_upsert --database-url sqlite+aiosqlite:///bench.db
+uv run -m src.tests.bench_bulk_upsert --tweets 500
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.database.db import Base
+from src.database.models import Bots, Tweets
+from src.settings import settings
+from src.twitter.tweets import Tweet
+from src.twitter.tweets_crud import bulk_upsert_tweets, create_tweet, tweet_exists
+
+
+def _fake_tweets(n: int, tag: str) -> list[Tweet]:
+    return [
+        Tweet(
+            author=f"author{i % 97}",
+            text=f"{tag} tweet {i} " + "lorem ipsum " * 10,
+            likes=i * 3,
+            retweets=i,
+            replies=i // 2,
+            views=i * 100,
+            url=f"/author{i % 97}/status/{tag}{i}",
+        )
+        for i in range(n)
+    ]
+
+
+async def main(database_url: str, n: int) -> None:
+    engine = create_async_engine(database_url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    async with session_factory() as session:
+        bot = Bots(bot_name=f"bench-{uuid.uuid4().hex[:8]}")
+        session.add(bot)
+        await session.commit()
+
+        try:
+            per_row = _fake_tweets(n, f"row{uuid.uuid4().hex[:6]}")
+            start = time.perf_counter()
+            for tweet in per_row:
+                if not await tweet_exists(session, tweet.author, tweet.text):
+                    await create_tweet(session, bot.id, tweet)
+            per_row_s = time.perf_counter() - start
+
+            bulk = _fake_tweets(n, f"bulk{uuid.uuid4().hex[:6]}")
+            start = time.perf_counter()
+            ids = await bulk_upsert_tweets(session, bot.id, bulk)
+            bulk_insert_s = time.perf_counter() - start
+            assert len(ids) == n
+
+            for tweet in bulk:
+                tweet.likes += 1
+            start = time.perf_counter()
+            await bulk_upsert_tweets(session, bot.id, bulk)
+            bulk_update_s = time.perf_counter() - start
+        finally:
+            await session.execute(delete(Tweets).where(Tweets.bot_id == bot.id))
+            await session.delete(bot)
+            await session.commit()
+
+    await engine.dispose()
+
+    print(f"{n} tweets on {engine.dialect.name}")
+    print(f"per-row exists+insert: {per_row_s * 1000:9.1f} ms")
+    print(f"bulk upsert (insert):  {bulk_insert_s * 1000:9.1f} ms")
+    print(f"bulk upsert (update):  {bulk_update_s * 1000:9.1f} ms")
+    print(f"speed-up (insert):     {per_row_s / bulk_insert_s:9.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--database-url", default=settings.database_url)
+    parser.add_argument("--tweets", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.database_url, args.tweets))
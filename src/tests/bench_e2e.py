@@ -0,0 +1,162 @@
+"""
+End-to-end throughput against the local x.com stand-in (`FakeX`).
+
+Two stages, both on a fresh login:
+
+- portal: `TwitterPortal` logs in, opens the Following tab, scrolls the
+  timeline for ``--tweets`` tweets and likes / replies to / retweets the
+  first ``--actions`` of them;
+- run_bot: `run_bot` for a throwaway bot on a context leased from a
+  `BrowserContextPool`, with a stub LLM. Needs a migrated database
+  (``DATABASE_URL``).
+
+Reports tweets/sec, per-method latency percentiles (from the portal's
+`Pacer`) and the peak RSS of this process and of the browser. ``--speed``
+scales the humanizing delays; ``0`` measures the portal alone.
+
+Usage
+-----
+uv run -m src.tests.bench_e2e [--tweets 200] [--actions 5] [--speed 0]
+uv run -m src.tests.bench_e2e --skip-run-bot
+"""
+
+import argparse
+import asyncio
+import logging
+import resource
+import time
+import uuid
+from dataclasses import replace
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from sqlalchemy import delete
+
+from src.ai_services import ai_generate_reply
+from src.ai_services.ai_generate_reply import ReplyGenerator
+from src.bots.bots_crud import create_bot
+from src.database.db import async_session
+from src.database.models import ActionBudgets, Bots, ReplyCache, Tweets
+from src.run_bot import run_bot
+from src.tests.fake_x import FakeX
+from src.twitter.context_pool import BrowserContextPool
+from src.twitter.pacing import PACING_PROFILES, PacingProfile
+from src.twitter.twitter_portal import TwitterPortal
+
+logger = logging.getLogger(__name__)
+
+
+def _peak_rss_mb(who: int = resource.RUSAGE_SELF) -> float:
+    # ru_maxrss is in KiB on Linux.
+    return resource.getrusage(who).ru_maxrss / 1024
+
+
+def _print_latencies(portal: TwitterPortal) -> None:
+    print(f"{'method':<28}{'calls':>6}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}")
+    for name, timing in sorted(portal.pacer.timings.items()):
+        if not timing.samples:
+            continue
+        p50, p90, p99 = timing.percentiles(50, 90, 99)
+        print(
+            f"{name:<28}{timing.calls:>6}"
+            f"{p50 * 1000:>10.1f}{p90 * 1000:>10.1f}{p99 * 1000:>10.1f}"
+        )
+
+
+async def bench_portal(
+    fake: FakeX, n_tweets: int, n_actions: int, pacing: PacingProfile
+) -> None:
+    portal = TwitterPortal(logger=logger, headless=True, pacing=pacing)
+    async with portal:
+        await fake.route(portal.context)
+        start = time.perf_counter()
+        await portal.get_following_tweets_page("bench", "bench", logged_in=False)
+        login_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        tweets = await portal.scrape_home_timeline(max_tweets=n_tweets)
+        scrape_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for tweet in tweets[:n_actions]:
+            await portal.apply_bot_actions(tweet, f"Reply to {tweet.author}")
+        actions_s = time.perf_counter() - start
+
+    assert len(fake.state.liked) == min(n_actions, len(tweets))
+    print(f"portal: {len(tweets)} tweets scraped, {n_actions} acted on")
+    print(f"login + Following tab:  {login_s:8.2f} s")
+    print(
+        f"scrape:                 {scrape_s:8.2f} s "
+        f"({len(tweets) / scrape_s:.1f} tweets/s)"
+    )
+    if n_actions:
+        print(f"like + reply + retweet: {actions_s / n_actions:8.2f} s/tweet")
+    _print_latencies(portal)
+
+
+async def bench_run_bot(fake: FakeX, n_tweets: int, pacing: PacingProfile) -> None:
+    ai_generate_reply._reply_generator = ReplyGenerator(
+        llm=FakeListChatModel(responses=["Great thread, thanks for sharing!"])
+    )
+    bot_name = f"bench-{uuid.uuid4().hex[:8]}"
+    async with async_session() as session:
+        bot = await create_bot(session, bot_name, "bench", "bench", "bench")
+
+    served_before = fake.state.tweets_served
+    try:
+        async with BrowserContextPool(logger, headless=True) as pool:
+            # Route the bot's pooled context before run_bot leases it again.
+            async with pool.lease(bot.id, None) as leased:
+                await fake.route(leased.context)
+            start = time.perf_counter()
+            await run_bot(
+                bot_name, max_tweets=n_tweets, pool=pool, headless=True, pacing=pacing
+            )
+            run_s = time.perf_counter() - start
+    finally:
+        async with async_session() as session:
+            # Everything with a foreign key to the bot goes first.
+            for model in (Tweets, ActionBudgets):
+                await session.execute(delete(model).where(model.bot_id == bot.id))
+            await session.execute(
+                delete(ReplyCache).where(ReplyCache.reply.startswith("Great thread"))
+            )
+            await session.execute(delete(Bots).where(Bots.id == bot.id))
+            await session.commit()
+
+    print(
+        f"run_bot: {n_tweets} tweets in {run_s:.2f} s "
+        f"({n_tweets / run_s:.1f} tweets/s)"
+    )
+    print(
+        f"server: {fake.state.tweets_served - served_before} tweets served, "
+        f"{len(fake.state.liked)} liked, {len(fake.state.replies)} replied to, "
+        f"{len(fake.state.retweeted)} retweeted in total"
+    )
+
+
+async def main(
+    n_tweets: int, n_actions: int, pacing: PacingProfile, skip_run_bot: bool
+) -> None:
+    with FakeX(n_tweets=max(n_tweets * 2, 100)) as fake:
+        await bench_portal(fake, n_tweets, n_actions, pacing)
+        if not skip_run_bot:
+            await bench_run_bot(fake, n_tweets, pacing)
+
+    print(f"peak RSS, python:  {_peak_rss_mb():8.1f} MiB")
+    # Children are accounted once they exit, i.e. after the browsers closed.
+    print(f"peak RSS, browser: {_peak_rss_mb(resource.RUSAGE_CHILDREN):8.1f} MiB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tweets", type=int, default=200)
+    parser.add_argument("--actions", type=int, default=5)
+    parser.add_argument("--pacing", choices=sorted(PACING_PROFILES), default="fast")
+    parser.add_argument("--speed", type=float, default=None)
+    parser.add_argument("--skip-run-bot", action="store_true")
+    args = parser.parse_args()
+
+    pacing = PACING_PROFILES[args.pacing]
+    if args.speed is not None:
+        pacing = replace(pacing, speed=args.speed)
+    asyncio.run(main(args.tweets, args.actions, pacing, args.skip_run_bot))
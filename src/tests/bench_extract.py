@@ -0,0 +1,49 @@
+"""
+Compare per-article and batched tweet extraction against a saved timeline.
+
+Usage
+-----
+uv run -m src.tests.bench_extract [--rounds 20]
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from pathlib import Path
+
+from src.twitter.twitter_portal import TwitterPortal
+
+FIXTURE = Path(__file__).parent / "fixtures" / "timeline.html"
+
+logger = logging.getLogger(__name__)
+
+
+async def _bench(extract, rounds: int) -> tuple[float, list]:
+    result = await extract()
+    start = time.perf_counter()
+    for _ in range(rounds):
+        result = await extract()
+    return (time.perf_counter() - start) / rounds, [t for t, _ in result]
+
+
+async def main(rounds: int) -> None:
+    portal = TwitterPortal(logger=logger, headless=True)
+    async with portal:
+        await portal.page.set_content(FIXTURE.read_text(encoding="utf-8"))
+
+        per_article, slow = await _bench(portal._extract_tweets_per_article, rounds)
+        batched, fast = await _bench(portal._extract_tweets_batch, rounds)
+
+    assert slow == fast, "batched extraction returned different tweets"
+    print(f"articles:     {len(fast)}")
+    print(f"per-article:  {per_article * 1000:8.2f} ms/pass")
+    print(f"batched:      {batched * 1000:8.2f} ms/pass")
+    print(f"speed-up:     {per_article / batched:8.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.rounds))
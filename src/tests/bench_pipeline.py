@@ -0,0 +1,94 @@
+"""
+Measure how much of the LLM latency the pipelined `run_bot` hides.
+
+Serves a saved tweet page for every ``x.com`` URL and replies through a stub
+LLM (``FakeListChatModel`` with a fixed delay), then times the reply + bot
+actions stage both ways:
+
+- sequential: ``await generate_reply`` and only then `apply_bot_actions`;
+- pipelined: generation runs as a task and `apply_bot_actions` awaits it right
+  before typing the reply, as `run_bot` does.
+
+Usage
+-----
+uv run -m src.tests.bench_pipeline [--rounds 5] [--llm-latency 2.0]
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+from pathlib import Path
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from playwright.async_api import Route
+
+from src.ai_services.ai_generate_reply import ReplyGenerator
+from src.twitter.tweets import Tweet
+from src.twitter.twitter_portal import TwitterPortal
+
+FIXTURE = Path(__file__).parent / "fixtures" / "tweet_detail.html"
+
+TWEET = Tweet(
+    author="Ukraine Now",
+    text="Big day for open source: the new release is out.",
+    likes=4500,
+    retweets=12,
+    replies=1204,
+    views=98_000,
+    url="/UkraineNow/status/1945000000000000000",
+)
+
+logger = logging.getLogger(__name__)
+
+
+async def _sequential(portal: TwitterPortal, generator: ReplyGenerator) -> None:
+    reply = await generator.generate_reply(TWEET)
+    await portal.apply_bot_actions(TWEET, reply)
+
+
+async def _pipelined(portal: TwitterPortal, generator: ReplyGenerator) -> None:
+    reply_task = asyncio.create_task(generator.generate_reply(TWEET))
+    await portal.apply_bot_actions(TWEET, reply_task)
+
+
+async def _bench(
+    stage, portal: TwitterPortal, generator: ReplyGenerator, rounds: int
+) -> list[float]:
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        await stage(portal, generator)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+async def main(rounds: int, llm_latency: float) -> None:
+    html = FIXTURE.read_text(encoding="utf-8")
+
+    async def serve_fixture(route: Route) -> None:
+        await route.fulfill(status=200, content_type="text/html", body=html)
+
+    generator = ReplyGenerator(
+        llm=FakeListChatModel(responses=["Чудові новини!"], sleep=llm_latency)
+    )
+    portal = TwitterPortal(logger=logger, headless=True)
+    async with portal:
+        await portal.context.route("https://x.com/**", serve_fixture)
+        sequential = await _bench(_sequential, portal, generator, rounds)
+        pipelined = await _bench(_pipelined, portal, generator, rounds)
+
+    seq, pipe = statistics.mean(sequential), statistics.mean(pipelined)
+    print(f"stub LLM latency: {llm_latency:8.2f} s")
+    print(f"sequential:       {seq:8.2f} s/tweet")
+    print(f"pipelined:        {pipe:8.2f} s/tweet")
+    print(f"saved:            {seq - pipe:8.2f} s/tweet")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--llm-latency", type=float, default=2.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.rounds, args.llm_latency))
@@ -0,0 +1,123 @@
+"""
+Time the ranking paths on a large synthetic batch of tweets.
+
+Compares a full ``sorted`` baseline, the streaming heap `top_k`, and the
+numpy paths: `rank_batch` (including the Tweet -> column conversion) and
+`score_arrays` + `top_k_indices` on ready-made columns, as used for rows
+loaded from the ``tweets`` table. Needs the ``fast`` extra (numpy).
+
+Usage
+-----
+uv run -m src.tests.bench_ranking [--tweets 100000] [--k 20] [--weights engagement]
+"""
+
+import argparse
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from src.twitter.ranking import (
+    ENGAGEMENT_WEIGHTS,
+    VIRAL_WEIGHTS,
+    make_scorer,
+    penalize_authors,
+    rank_batch,
+    score_arrays,
+    top_k,
+    top_k_indices,
+)
+from src.twitter.tweets import Tweet
+
+WEIGHTS = {"viral": VIRAL_WEIGHTS, "engagement": ENGAGEMENT_WEIGHTS}
+
+
+def _fake_tweets(n: int, now: datetime) -> list[Tweet]:
+    rng = random.Random(0)
+    tweets = []
+    for i in range(n):
+        views = int(rng.paretovariate(1.2) * 1_000)
+        likes = int(views * rng.uniform(0, 0.05))
+        tweets.append(
+            Tweet(
+                author=f"author{rng.randrange(n // 20 or 1)}",
+                text=f"tweet {i}",
+                likes=likes,
+                retweets=int(likes * rng.uniform(0, 0.3)),
+                replies=int(likes * rng.uniform(0, 0.2)),
+                views=views,
+                url=f"/author/status/{i}",
+                posted_at=now - timedelta(hours=rng.uniform(0, 72)),
+            )
+        )
+    return tweets
+
+
+def _timed(fn, rounds: int):
+    result = fn()
+    start = time.perf_counter()
+    for _ in range(rounds):
+        result = fn()
+    return (time.perf_counter() - start) / rounds, result
+
+
+def main(n: int, k: int, weights_name: str, rounds: int) -> None:
+    weights = WEIGHTS[weights_name]
+    now = datetime.now(timezone.utc)
+    tweets = _fake_tweets(n, now)
+    columns = {
+        "likes": np.array([t.likes for t in tweets]),
+        "retweets": np.array([t.retweets for t in tweets]),
+        "replies": np.array([t.replies for t in tweets]),
+        "views": np.array([t.views for t in tweets]),
+        "age_hours": np.array(
+            [(now - t.posted_at).total_seconds() / 3600 for t in tweets]
+        ),
+        "author": np.array([t.author for t in tweets]),
+    }
+
+    def full_sort():
+        scorer = make_scorer(weights, now)
+        return sorted(tweets, key=scorer, reverse=True)[:k]
+
+    def heap():
+        return top_k(iter(tweets), k, weights, now=now)
+
+    def batch():
+        return rank_batch(tweets, k, weights, now=now)
+
+    def arrays():
+        scores = score_arrays(
+            columns["likes"],
+            columns["retweets"],
+            columns["replies"],
+            columns["views"],
+            columns["age_hours"],
+            weights,
+        )
+        scores = penalize_authors(scores, columns["author"], weights.author_penalty)
+        return top_k_indices(scores, k)
+
+    heap_s, heap_top = _timed(heap, rounds)
+    batch_s, batch_top = _timed(batch, rounds)
+    assert [t.tweet.url for t in heap_top] == [t.tweet.url for t in batch_top]
+
+    print(f"{n} tweets, k={k}, weights={weights_name}")
+    if not weights.author_penalty:
+        sort_s, _ = _timed(full_sort, rounds)
+        print(f"sorted() baseline:      {sort_s * 1000:9.1f} ms")
+    print(f"heap top_k (stream):    {heap_s * 1000:9.1f} ms")
+    print(f"rank_batch (numpy):     {batch_s * 1000:9.1f} ms")
+    arrays_s, _ = _timed(arrays, rounds)
+    print(f"columns only (numpy):   {arrays_s * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tweets", type=int, default=100_000)
+    parser.add_argument("--k", type=int, default=20)
+    parser.add_argument("--weights", choices=sorted(WEIGHTS), default="engagement")
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+    main(args.tweets, args.k, args.weights, args.rounds)
@@ -0,0 +1,67 @@
+"""
+Replay a recorded HomeLatestTimeline response through a local route handler
+and check that network capture yields the same tweets as the parser.
+
+Usage
+-----
+uv run -m src.tests.bench_timeline_capture
+"""
+
+import asyncio
+import json
+import logging
+import time
+from pathlib import Path
+
+from playwright.async_api import Route
+
+from src.twitter.timeline_capture import parse_timeline_payload
+from src.twitter.twitter_portal import TwitterPortal
+
+FIXTURE = Path(__file__).parent / "fixtures" / "home_latest_timeline.json"
+
+HOME_HTML = """<!DOCTYPE html>
+<html><body>
+  <div aria-label="Home timeline"></div>
+  <script>
+    fetch("/i/api/graphql/replay/HomeLatestTimeline?variables=%7B%22count%22%3A20%7D");
+  </script>
+</body></html>
+"""
+
+logger = logging.getLogger(__name__)
+
+
+async def main() -> None:
+    payload = FIXTURE.read_text(encoding="utf-8")
+    expected = parse_timeline_payload(json.loads(payload))
+
+    async def fulfill_home(route: Route) -> None:
+        await route.fulfill(content_type="text/html", body=HOME_HTML)
+
+    async def fulfill_timeline(route: Route) -> None:
+        await route.fulfill(content_type="application/json", body=payload)
+
+    portal = TwitterPortal(logger=logger, headless=True, capture_network=True)
+    async with portal:
+        await portal.context.route("https://x.com/home", fulfill_home)
+        await portal.context.route("**/HomeLatestTimeline*", fulfill_timeline)
+
+        start = time.perf_counter()
+        await portal.page.goto("https://x.com/home")
+        captured = [
+            t
+            async for t in portal.iter_home_timeline(
+                max_tweets=len(expected), max_idle_scrolls=0
+            )
+        ]
+        elapsed = time.perf_counter() - start
+
+    assert captured == expected, f"captured {captured!r}, expected {expected!r}"
+    print(f"captured {len(captured)} tweets in {elapsed * 1000:.1f} ms")
+    for t in captured:
+        print(f"  {t.url}: likes={t.likes} retweets={t.retweets} views={t.views}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
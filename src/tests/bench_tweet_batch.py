@@ -0,0 +1,129 @@
+"""
+Memory and construction cost of `TweetBatch` versus a list of `Tweet`.
+
+Builds the same synthetic scrape (parsed values, as `_tweet_from_raw` has
+them) three ways -- validated ``Tweet(...)``, ``Tweet.model_construct`` and
+`TweetBatch.append` -- and reports the time and the memory each container
+holds (tracemalloc, in a separate run; the text and URL strings are shared
+by all three and not counted). Then times the conversions, and ranking with
+`rank_batch` on the list against `TweetBatch.rank`. Needs the ``fast``
+extra (numpy).
+
+Usage
+-----
+uv run -m src.tests.bench_tweet_batch [--tweets 50000] [--k 20] [--weights engagement]
+"""
+
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+from src.twitter.ranking import ENGAGEMENT_WEIGHTS, VIRAL_WEIGHTS, rank_batch
+from src.twitter.tweet_batch import TweetBatch
+from src.twitter.tweets import Tweet
+
+WEIGHTS = {"viral": VIRAL_WEIGHTS, "engagement": ENGAGEMENT_WEIGHTS}
+
+
+def _fake_rows(n: int, now: datetime) -> list[dict]:
+    rng = random.Random(0)
+    rows = []
+    for i in range(n):
+        views = int(rng.paretovariate(1.2) * 1_000)
+        likes = int(views * rng.uniform(0, 0.05))
+        rows.append(
+            {
+                # A fresh string per row, as the scraper returns them.
+                "author": "".join(("author", str(rng.randrange(n // 20 or 1)))),
+                "text": f"tweet {i}",
+                "likes": likes,
+                "retweets": int(likes * rng.uniform(0, 0.3)),
+                "replies": int(likes * rng.uniform(0, 0.2)),
+                "views": views,
+                "url": f"/author/status/{i}",
+                "posted_at": now - timedelta(hours=rng.uniform(0, 72)),
+            }
+        )
+    return rows
+
+
+def _build(fn) -> tuple[float, float, object]:
+    """Seconds to run *fn* and MiB its result holds."""
+    gc.collect()
+    start = time.perf_counter()
+    fn()
+    seconds = time.perf_counter() - start
+
+    # tracemalloc slows allocation down, so memory gets a run of its own.
+    gc.collect()
+    tracemalloc.start()
+    result = fn()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, current / 2**20, result
+
+
+def _timed(fn, rounds: int):
+    result = fn()
+    start = time.perf_counter()
+    for _ in range(rounds):
+        result = fn()
+    return (time.perf_counter() - start) / rounds, result
+
+
+def main(n: int, k: int, weights_name: str, rounds: int) -> None:
+    weights = WEIGHTS[weights_name]
+    now = datetime.now(timezone.utc)
+    rows = _fake_rows(n, now)
+
+    def validated():
+        return [Tweet(**row) for row in rows]
+
+    def constructed():
+        return [Tweet.model_construct(**row) for row in rows]
+
+    def columns():
+        batch = TweetBatch()
+        append = batch.append
+        for row in rows:
+            append(**row)
+        return batch
+
+    print(f"{n} tweets, k={k}, weights={weights_name}")
+    print(f"{'build':<26}{'ms':>10}{'MiB':>10}{'bytes/tweet':>14}")
+    results = {}
+    for name, fn in (
+        ("Tweet(...)", validated),
+        ("Tweet.model_construct", constructed),
+        ("TweetBatch.append", columns),
+    ):
+        seconds, mib, results[name] = _build(fn)
+        print(f"{name:<26}{seconds * 1000:>10.1f}{mib:>10.1f}{mib * 2**20 / n:>14.0f}")
+
+    tweets = results["Tweet(...)"]
+    batch = results["TweetBatch.append"]
+    print(f"{len(batch.author_names)} distinct authors")
+
+    from_s, _ = _timed(lambda: TweetBatch.from_tweets(tweets), rounds)
+    to_s, _ = _timed(batch.to_tweets, rounds)
+    print(f"TweetBatch.from_tweets:   {from_s * 1000:9.1f} ms")
+    print(f"TweetBatch.to_tweets:     {to_s * 1000:9.1f} ms")
+
+    list_s, list_top = _timed(lambda: rank_batch(tweets, k, weights, now), rounds)
+    batch_s, batch_top = _timed(lambda: batch.rank(k, weights, now), rounds)
+    assert [r.tweet.url for r in list_top] == [r.tweet.url for r in batch_top]
+    print(f"rank_batch (list):        {list_s * 1000:9.1f} ms")
+    print(f"TweetBatch.rank:          {batch_s * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tweets", type=int, default=50_000)
+    parser.add_argument("--k", type=int, default=20)
+    parser.add_argument("--weights", choices=sorted(WEIGHTS), default="engagement")
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+    main(args.tweets, args.k, args.weights, args.rounds)
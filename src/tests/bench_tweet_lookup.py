@@ -0,0 +1,123 @@
+"""
+Measure tweet lookups on a large `tweets` table with and without indexes.
+
+Fills a temporary table shaped like `tweets` with synthetic rows (PostgreSQL),
+times `tweet_exists`-style hash lookups and a per-bot "latest tweets" query,
+then adds the indexes from migration f3ad577956a7 and repeats. The query
+plans are printed for both runs.
+
+Usage
+-----
+uv run -m src.tests.bench_tweet_lookup [--rows 1000000] [--lookups 200]
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+
+from src.settings import settings
+
+CREATE_SQL = """
+CREATE TEMP TABLE tweets_bench (
+    id bigserial PRIMARY KEY,
+    bot_id integer NOT NULL,
+    tweet_content text NOT NULL,
+    tweet_author text NOT NULL,
+    likes bigint NOT NULL,
+    retweets bigint NOT NULL,
+    views bigint NOT NULL,
+    url text NOT NULL,
+    viral_score double precision NOT NULL,
+    hash text NOT NULL,
+    created_at timestamp NOT NULL,
+    updated_at timestamp NOT NULL
+)
+"""
+
+FILL_SQL = """
+INSERT INTO tweets_bench (
+    bot_id, tweet_content, tweet_author, likes, retweets, views, url,
+    viral_score, hash, created_at, updated_at
+)
+SELECT
+    g % :bots,
+    'tweet text ' || g,
+    'author' || (g % 5000),
+    g % 10000, g % 1000, g % 100000,
+    '/author' || (g % 5000) || '/status/' || g,
+    g % 12000,
+    encode(sha256(('author' || (g % 5000) || 'tweet text ' || g)::bytea), 'hex'),
+    now() - (g || ' seconds')::interval,
+    now()
+FROM generate_series(1, :rows) AS g
+"""
+
+HASH_LOOKUP = "SELECT 1 FROM tweets_bench WHERE hash = :hash LIMIT 1"
+LATEST_FOR_BOT = (
+    "SELECT id FROM tweets_bench WHERE bot_id = :bot_id "
+    "ORDER BY created_at DESC LIMIT 50"
+)
+
+
+async def _time_queries(
+    conn: AsyncConnection, sql: str, params: list[dict]
+) -> tuple[float, str]:
+    start = time.perf_counter()
+    for p in params:
+        await conn.execute(text(sql), p)
+    per_query_ms = (time.perf_counter() - start) / len(params) * 1000
+    plan = await conn.execute(text(f"EXPLAIN ANALYZE {sql}"), params[0])
+    return per_query_ms, "\n".join(f"    {row[0]}" for row in plan)
+
+
+async def _run(
+    conn: AsyncConnection, label: str, rows: int, lookups: int, bots: int
+) -> None:
+    hashes = await conn.execute(
+        text("SELECT hash FROM tweets_bench WHERE id = ANY(:ids)"),
+        {"ids": random.sample(range(1, rows + 1), lookups)},
+    )
+    hash_params = [{"hash": h} for (h,) in hashes]
+    bot_params = [{"bot_id": random.randrange(bots)} for _ in range(lookups)]
+
+    for name, sql, params in (
+        ("hash lookup", HASH_LOOKUP, hash_params),
+        ("latest 50 for bot", LATEST_FOR_BOT, bot_params),
+    ):
+        ms, plan = await _time_queries(conn, sql, params)
+        print(f"[{label}] {name}: {ms:.3f} ms/query")
+        print(plan)
+
+
+async def main(database_url: str, rows: int, lookups: int, bots: int) -> None:
+    engine = create_async_engine(database_url)
+    async with engine.connect() as conn:
+        await conn.execute(text(CREATE_SQL))
+        start = time.perf_counter()
+        await conn.execute(text(FILL_SQL), {"rows": rows, "bots": bots})
+        await conn.execute(text("ANALYZE tweets_bench"))
+        print(f"filled {rows} rows in {time.perf_counter() - start:.1f} s")
+
+        await _run(conn, "no indexes", rows, lookups, bots)
+
+        await conn.execute(text("CREATE UNIQUE INDEX ON tweets_bench (hash)"))
+        await conn.execute(text("CREATE INDEX ON tweets_bench (bot_id, created_at)"))
+        await conn.execute(text("ANALYZE tweets_bench"))
+
+        await _run(conn, "indexed", rows, lookups, bots)
+        await conn.rollback()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--database-url", default=settings.database_url)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--lookups", type=int, default=200)
+    parser.add_argument("--bots", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.database_url, args.rows, args.lookups, args.bots))
@@ -0,0 +1,95 @@
+"""
+Measure `human_type` overhead beyond its configured keystroke delays.
+
+Types a reply into a local contenteditable box twice with the same keystroke
+plan: once the old way (``page.type(selector, ch)`` per character, which
+re-resolves the selector every time) and once with `human_type`. Overhead is
+wall time minus `planned_duration`.
+
+Usage
+-----
+uv run -m src.tests.bench_typing [--chars 200] [--profile fast]
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from playwright.async_api import Page, async_playwright
+
+from src.utils.portal_utils import (
+    FAST_TYPING,
+    HUMAN_TYPING,
+    Burst,
+    human_type,
+    plan_keystrokes,
+    planned_duration,
+)
+
+PROFILES = {"human": HUMAN_TYPING, "fast": FAST_TYPING}
+
+PAGE_HTML = """
+<!DOCTYPE html>
+<html><body>
+  <div role="dialog"><div role="textbox" contenteditable="true"></div></div>
+</body></html>
+"""
+TEXTBOX = 'div[role="dialog"] div[role="textbox"]'
+
+SAMPLE = (
+    "Чудові новини, дякую! Так тримати, це справді надихає. "
+    "Great to see this shipped; faster startup matters. "
+)
+
+
+async def _per_char(page: Page, bursts: list[Burst]) -> None:
+    for burst in bursts:
+        for ch in burst.text:
+            await page.type(TEXTBOX, ch, delay=burst.delay)
+        if burst.pause_after:
+            await asyncio.sleep(burst.pause_after / 1000)
+
+
+async def _bench(page: Page, type_fn, bursts: list[Burst], text: str) -> float:
+    await page.set_content(PAGE_HTML)
+    start = time.perf_counter()
+    await type_fn(page, bursts)
+    elapsed = time.perf_counter() - start
+    typed = await page.locator(TEXTBOX).inner_text()
+    assert typed == text, f"typed {typed!r}"
+    return elapsed - planned_duration(bursts)
+
+
+async def main(chars: int, profile_name: str) -> None:
+    text = (SAMPLE * (chars // len(SAMPLE) + 1))[:chars].strip()
+    profile = PROFILES[profile_name]
+    bursts = plan_keystrokes(text, profile, random.Random(0))
+
+    async def _locator_once(page: Page, _: list[Burst]) -> None:
+        # Same seed, same plan as `bursts`.
+        await human_type(page, TEXTBOX, text, profile, rng=random.Random(0))
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        page = await browser.new_page()
+        old = await _bench(page, _per_char, bursts, text)
+        new = await _bench(page, _locator_once, bursts, text)
+        await browser.close()
+
+    print(f"{len(text)} chars, {len(bursts)} bursts, profile={profile_name}")
+    print(f"configured delay:        {planned_duration(bursts) * 1000:9.1f} ms")
+    print(f"per-char page.type:      {old * 1000:9.1f} ms overhead")
+    print(f"human_type:              {new * 1000:9.1f} ms overhead")
+    print(
+        f"overhead per char:       {old / len(text) * 1000:9.2f} -> "
+        f"{new / len(text) * 1000:.2f} ms"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--chars", type=int, default=200)
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="human")
+    args = parser.parse_args()
+    asyncio.run(main(args.chars, args.profile))
@@ -0,0 +1,56 @@
+import os
+from contextlib import asynccontextmanager
+
+import pytest
+from cryptography.fernet import Fernet
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.twitter.tweets import Tweet
+
+# Settings are read at import time. Database tests run against in-memory
+# SQLite (aiosqlite, in the dev group) and no test reads stored sessions, so
+# throwaway values do.
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite://")
+os.environ.setdefault("FERNET_KEY", Fernet.generate_key().decode())
+
+
+def make_tweet(
+    i: int, author: str = "alice", url: str | None = None, likes: int = 0
+) -> Tweet:
+    return Tweet(
+        author=author,
+        text=f"tweet {i}",
+        likes=likes,
+        retweets=0,
+        replies=0,
+        views=0,
+        url=url or f"/{author}/status/{i}",
+    )
+
+
+@pytest.fixture
+def sqlite_session():
+    """
+    Opens a session on a fresh in-memory database, inside the test's loop.
+
+    Use as ``async with sqlite_session() as session``; the tables exist and
+    hold two bots, ids 1 and 2.
+    """
+    # Imported late: the settings they load need the environment above.
+    from src.database.db import Base
+    from src.database.models import Bots
+
+    @asynccontextmanager
+    async def open_session():
+        engine = create_async_engine("sqlite+aiosqlite://")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        try:
+            async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+                session.add_all([Bots(bot_name="a"), Bots(bot_name="b")])
+                await session.commit()
+                yield session
+        finally:
+            await engine.dispose()
+
+    return open_session
@@ -0,0 +1,497 @@
+"""
+Local stand-in for x.com, for benchmarks that must not touch the live site.
+
+`FakeX` serves, from a stdlib HTTP server on a background thread:
+
+- ``/home``: the login modal when the ``auth_token`` cookie is missing,
+  otherwise the For you / Following tabs and a Home timeline that loads
+  *page_size* generated tweets at a time as it is scrolled. Like X, it only
+  keeps the last *max_cards* articles in the DOM;
+- ``/<author>/status/<id>``: the tweet detail page with like / unlike
+  toggles, the reply dialog and the Repost menu;
+- ``/i/fake/...``: the timeline pages and the like, reply and retweet
+  endpoints the pages call, recorded in `FakeX.state`.
+
+The markup matches every selector in ``SELECTOR_CONFIG`` and the login flow
+of `TwitterPortal.login`. `FakeX.route` sends a browser context's
+``https://x.com`` requests to the server, so the portal runs unchanged.
+
+Usage
+-----
+uv run -m src.tests.fake_x [--tweets 1000] [--port 8765]
+"""
+
+import argparse
+import html
+import json
+import random
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from playwright.async_api import BrowserContext, Route
+
+FIRST_ID = 1_945_000_000_000_000_000
+
+WORDS = (
+    "open source release faster startup fewer allocations satellite launch "
+    "upper atmosphere python rust benchmark latency memory cache network "
+    "browser timeline market energy climate election football music film"
+).split()
+
+STYLE = """
+body { margin: 0; font-family: sans-serif; }
+article { display: block; min-height: 180px; padding: 12px; border-bottom: 1px solid #eee; }
+[hidden] { display: none !important; }
+div[role="dialog"] { position: fixed; top: 80px; left: 25%; width: 50%; padding: 16px; background: #fff; border: 1px solid #ccc; }
+div[role="textbox"] { min-height: 60px; border: 1px solid #eee; }
+div[role="tab"] { display: inline-block; padding: 12px; cursor: pointer; }
+div[role="tab"][aria-selected="true"] { font-weight: bold; }
+"""
+
+HOME_HTML = """<!DOCTYPE html>
+<html lang="en">
+<head><meta charset="utf-8"><title>Home / X</title><style>{style}</style></head>
+<body>
+  <main role="main"></main>
+  <template id="login">
+    <div role="dialog" aria-label="Log in to X">
+      <h1 id="modal-header">Sign in to X</h1>
+      <div id="step-username">
+        <input name="text" autocomplete="username">
+        <button type="button" id="next"><span>Next</span></button>
+      </div>
+    </div>
+  </template>
+  <template id="password">
+    <input name="password" type="password" autocomplete="current-password">
+    <button type="button" id="login-button"><span>Log in</span></button>
+  </template>
+  <template id="home">
+    <div role="tablist">
+      <div role="tab" tabindex="0" aria-selected="true">For you</div>
+      <div role="tab" tabindex="0" aria-selected="false">Following</div>
+    </div>
+    <div aria-label="Home timeline"><div id="spacer"></div></div>
+  </template>
+  <script>
+    const PAGE_SIZE = {page_size};
+    const MAX_CARDS = {max_cards};
+    const main = document.querySelector("main");
+    const render = (id) => main.replaceChildren(
+      document.getElementById(id).content.cloneNode(true)
+    );
+
+    function showLogin() {{
+      render("login");
+      document.getElementById("next").addEventListener("click", () => {{
+        document.getElementById("step-username").replaceChildren(
+          document.getElementById("password").content.cloneNode(true)
+        );
+        document.getElementById("login-button").addEventListener("click", logIn);
+      }});
+    }}
+
+    async function logIn() {{
+      const password = document.querySelector('input[name="password"]').value;
+      const response = await fetch("/i/fake/login", {{method: "POST", body: password}});
+      const {{auth_token, ct0}} = await response.json();
+      for (const [name, value] of Object.entries({{auth_token, ct0}})) {{
+        document.cookie = `${{name}}=${{value}}; path=/; max-age=31536000; secure`;
+      }}
+      location.assign("/home");
+    }}
+
+    let timeline, spacer, offset = 0, loading = false, done = false;
+
+    async function loadMore() {{
+      if (loading || done) return;
+      loading = true;
+      const response = await fetch(`/i/fake/timeline?offset=${{offset}}&count=${{PAGE_SIZE}}`);
+      const cards = await response.text();
+      if (cards.trim()) {{
+        timeline.insertAdjacentHTML("beforeend", cards);
+        offset += PAGE_SIZE;
+        recycle();
+      }} else {{
+        done = true;
+      }}
+      loading = false;
+    }}
+
+    // Drop the oldest cards like X's virtualized list, keeping the page
+    // height (and the scroll position) through a spacer.
+    function recycle() {{
+      const articles = timeline.querySelectorAll("article");
+      for (let i = 0; i < articles.length - MAX_CARDS; i++) {{
+        spacer.style.height = `${{spacer.offsetHeight + articles[i].offsetHeight}}px`;
+        articles[i].remove();
+      }}
+    }}
+
+    async function showHome() {{
+      render("home");
+      timeline = document.querySelector('div[aria-label="Home timeline"]');
+      spacer = document.getElementById("spacer");
+      for (const tab of document.querySelectorAll('[role="tab"]')) {{
+        tab.addEventListener("click", () => selectTab(tab));
+      }}
+      await loadMore();
+      await loadMore();
+    }}
+
+    async function selectTab(tab) {{
+      for (const other of document.querySelectorAll('[role="tab"]')) {{
+        other.setAttribute("aria-selected", String(other === tab));
+      }}
+      for (const article of timeline.querySelectorAll("article")) article.remove();
+      spacer.style.height = "0px";
+      window.scrollTo(0, 0);
+      offset = 0;
+      done = false;
+      await loadMore();
+      await loadMore();
+    }}
+
+    window.addEventListener("scroll", () => {{
+      if (timeline && innerHeight + scrollY > document.body.scrollHeight - 2000) {{
+        loadMore();
+      }}
+    }});
+
+    document.cookie.split("; ").some((c) => c.startsWith("auth_token="))
+      ? showHome()
+      : showLogin();
+  </script>
+</body>
+</html>
+"""
+
+CARD_HTML = """<article data-testid="tweet" role="article" tabindex="0">
+  <div data-testid="User-Name"><a href="/{handle}" role="link"><span>{name}</span></a><a href="/{handle}" role="link"><span>@{handle}</span></a></div>
+  <a href="/{handle}/status/{id}" role="link"><time datetime="{posted_at}">{posted_label}</time></a>
+  <div data-testid="tweetText" lang="en" dir="auto"><span>{text}</span></div>
+  <div role="group" aria-label="Tweet actions">
+    <button data-testid="reply" type="button"><div dir="ltr"><span><span><span>{replies}</span></span></span></div></button>
+    <button data-testid="{retweet_testid}" type="button"><div dir="ltr"><span><span><span>{retweets}</span></span></span></div></button>
+    <button data-testid="{like_testid}" type="button"><div dir="ltr"><span><span><span>{likes}</span></span></span></div></button>
+    <a href="/{handle}/status/{id}/analytics" role="link"><div dir="ltr"><span><span><span>{views}</span></span></span></div></a>
+  </div>
+</article>
+"""
+
+DETAIL_HTML = """<!DOCTYPE html>
+<html lang="en">
+<head><meta charset="utf-8"><title>Post / X</title><style>{style}</style></head>
+<body>
+  <main role="main">
+    {card}
+  </main>
+  <div id="layers" role="group">
+    <div role="dialog" aria-label="Reply" hidden>
+      <div role="textbox" contenteditable="true" aria-label="Post text"></div>
+      <button data-testid="tweetButton" type="button">Reply</button>
+    </div>
+    <div role="menu" hidden>
+      <div role="menuitem" tabindex="0">Repost</div>
+    </div>
+  </div>
+  <script>
+    const TWEET_ID = "{id}";
+    const $ = (sel) => document.querySelector(sel);
+    const dialog = $('div[role="dialog"]');
+    const menu = $('div[role="menu"]');
+    const post = (action, body) =>
+      fetch(`/i/fake/${{action}}/${{TWEET_ID}}`, {{method: "POST", body}});
+
+    document.addEventListener("click", async (event) => {{
+      const button = event.target.closest("button, [role=menuitem]");
+      if (!button) return;
+      const testid = button.dataset.testid;
+      if (testid === "like") {{
+        await post("like");
+        button.dataset.testid = "unlike";
+      }} else if (testid === "reply") {{
+        dialog.hidden = false;
+        dialog.querySelector('[role="textbox"]').focus();
+      }} else if (testid === "tweetButton") {{
+        await post("reply", dialog.querySelector('[role="textbox"]').innerText);
+        dialog.hidden = true;
+      }} else if (testid === "retweet") {{
+        menu.hidden = false;
+      }} else if (button.getAttribute("role") === "menuitem") {{
+        await post("retweet");
+        menu.hidden = true;
+        $('button[data-testid="retweet"]').dataset.testid = "unretweet";
+      }}
+    }});
+  </script>
+</body>
+</html>
+"""
+
+
+def format_count(n: int) -> str:
+    """Render a count the way X does: ``950``, ``1,204``, ``4.5K``, ``1.2M``."""
+    if n >= 1_000_000:
+        return f"{n / 1_000_000:.1f}".rstrip("0").rstrip(".") + "M"
+    if n >= 10_000:
+        return f"{n / 1_000:.1f}".rstrip("0").rstrip(".") + "K"
+    return f"{n:,}"
+
+
+@dataclass(frozen=True)
+class FakeTweet:
+    id: int
+    handle: str
+    name: str
+    text: str
+    likes: int
+    retweets: int
+    replies: int
+    views: int
+    posted_at: datetime
+
+    @property
+    def url(self) -> str:
+        return f"/{self.handle}/status/{self.id}"
+
+
+def fake_tweet(index: int, seed: int = 0, now: datetime | None = None) -> FakeTweet:
+    """
+    The *index*-th tweet of the generated timeline; the same for a given seed.
+
+    Parameters
+    ----------
+    index : int
+    seed : int
+    now : datetime | None
+        Newest possible post time.
+    Returns
+    -------
+    FakeTweet
+    """
+    rng = random.Random(seed * 1_000_003 + index)
+    now = now or datetime.now(timezone.utc)
+    author = rng.randrange(max(index // 10, 1) + 50)
+    views = int(rng.paretovariate(1.2) * 1_000)
+    likes = int(views * rng.uniform(0, 0.05))
+    return FakeTweet(
+        id=FIRST_ID + index,
+        handle=f"author{author}",
+        name=f"Author {author}",
+        text=" ".join(rng.choices(WORDS, k=rng.randint(6, 30))).capitalize() + ".",
+        likes=likes,
+        retweets=int(likes * rng.uniform(0, 0.3)),
+        replies=int(likes * rng.uniform(0, 0.2)),
+        views=views,
+        posted_at=now - timedelta(minutes=index * 7 + rng.uniform(0, 7)),
+    )
+
+
+@dataclass
+class FakeXState:
+    """What the pages reported back, and how many requests were served."""
+
+    liked: set[int] = field(default_factory=set)
+    retweeted: set[int] = field(default_factory=set)
+    replies: dict[int, list[str]] = field(default_factory=dict)
+    logins: int = 0
+    tweets_served: int = 0
+    requests: Counter[str] = field(default_factory=Counter)
+
+
+class FakeX:
+    """
+    The stand-in server; a context manager that serves while entered.
+
+    Parameters
+    ----------
+    n_tweets : int
+        Length of the generated timeline.
+    page_size : int
+        Tweets per timeline page.
+    max_cards : int
+        Articles kept in the DOM before the oldest are recycled.
+    seed : int
+    host : str
+    port : int
+        ``0`` picks a free port.
+    """
+
+    def __init__(
+        self,
+        n_tweets: int = 1_000,
+        page_size: int = 20,
+        max_cards: int = 60,
+        seed: int = 0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.n_tweets = n_tweets
+        self.page_size = page_size
+        self.max_cards = max_cards
+        self.seed = seed
+        self.now = datetime.now(timezone.utc)
+        self.state = FakeXState()
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "FakeX":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def tweet(self, index: int) -> FakeTweet:
+        return fake_tweet(index, self.seed, self.now)
+
+    async def route(self, context: BrowserContext) -> None:
+        """
+        Serve *context*'s ``https://x.com`` traffic from this server.
+
+        Parameters
+        ----------
+        context : BrowserContext
+        """
+
+        async def forward(route: Route) -> None:
+            parts = urlsplit(route.request.url)
+            target = self.url + parts.path + (f"?{parts.query}" if parts.query else "")
+            response = await route.fetch(url=target, max_redirects=0)
+            await route.fulfill(response=response)
+
+        await context.route("https://x.com/**", forward)
+
+    def render_card(self, tweet: FakeTweet) -> str:
+        return CARD_HTML.format(
+            handle=tweet.handle,
+            name=html.escape(tweet.name),
+            id=tweet.id,
+            posted_at=tweet.posted_at.strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+            posted_label=tweet.posted_at.strftime("%b %d"),
+            text=html.escape(tweet.text),
+            replies=format_count(
+                tweet.replies + len(self.state.replies.get(tweet.id, []))
+            ),
+            retweets=format_count(tweet.retweets),
+            likes=format_count(tweet.likes),
+            views=format_count(tweet.views),
+            like_testid="unlike" if tweet.id in self.state.liked else "like",
+            retweet_testid=(
+                "unretweet" if tweet.id in self.state.retweeted else "retweet"
+            ),
+        )
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args) -> None:
+                pass
+
+            def _send(self, body: str, content_type: str = "text/html") -> None:
+                data = body.encode()
+                self.send_response(HTTPStatus.OK)
+                self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _tweet_index(self, tweet_id: str) -> int | None:
+                index = int(tweet_id) - FIRST_ID if tweet_id.isdigit() else -1
+                return index if 0 <= index < fake.n_tweets else None
+
+            def do_GET(self) -> None:
+                parts = urlsplit(self.path)
+                segments = parts.path.strip("/").split("/")
+                with fake._lock:
+                    if parts.path in ("/", "/home"):
+                        fake.state.requests["home"] += 1
+                        return self._send(
+                            HOME_HTML.format(
+                                style=STYLE,
+                                page_size=fake.page_size,
+                                max_cards=fake.max_cards,
+                            )
+                        )
+                    if parts.path == "/i/fake/timeline":
+                        fake.state.requests["timeline"] += 1
+                        query = parse_qs(parts.query)
+                        offset = int(query.get("offset", ["0"])[0])
+                        count = int(query.get("count", [str(fake.page_size)])[0])
+                        end = min(offset + count, fake.n_tweets)
+                        fake.state.tweets_served += max(end - offset, 0)
+                        return self._send(
+                            "".join(
+                                fake.render_card(fake.tweet(i))
+                                for i in range(offset, end)
+                            )
+                        )
+                    if len(segments) == 3 and segments[1] == "status":
+                        index = self._tweet_index(segments[2])
+                        if index is not None:
+                            fake.state.requests["detail"] += 1
+                            tweet = fake.tweet(index)
+                            return self._send(
+                                DETAIL_HTML.format(
+                                    style=STYLE,
+                                    card=fake.render_card(tweet),
+                                    id=tweet.id,
+                                )
+                            )
+                self.send_error(HTTPStatus.NOT_FOUND)
+
+            def do_POST(self) -> None:
+                segments = urlsplit(self.path).path.strip("/").split("/")
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length).decode()
+                with fake._lock:
+                    if segments == ["i", "fake", "login"]:
+                        fake.state.logins += 1
+                        return self._send(
+                            json.dumps({"auth_token": "fake", "ct0": "fake-csrf"}),
+                            "application/json",
+                        )
+                    if len(segments) == 4 and segments[:2] == ["i", "fake"]:
+                        action, tweet_id = segments[2:]
+                        index = self._tweet_index(tweet_id)
+                        if index is not None:
+                            fake.state.requests[action] += 1
+                            tweet_id = FIRST_ID + index
+                            if action == "like":
+                                fake.state.liked.add(tweet_id)
+                            elif action == "retweet":
+                                fake.state.retweeted.add(tweet_id)
+                            elif action == "reply":
+                                fake.state.replies.setdefault(tweet_id, []).append(body)
+                            return self._send("{}", "application/json")
+                self.send_error(HTTPStatus.NOT_FOUND)
+
+        return Handler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tweets", type=int, default=1_000)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    with FakeX(args.tweets, port=args.port) as fake:
+        print(f"Serving {args.tweets} tweets on {fake.url}/home")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,139 @@
+import asyncio
+import logging
+
+import pytest
+
+from src.bots.action_scheduler import ActionScheduler
+from src.bots.rate_limits import RateLimit, TokenBucket
+from src.twitter.tweets import Tweet
+from src.twitter.twitter_portal import TwitterPortal
+
+TWEET = Tweet(
+    author="alice",
+    text="hello",
+    likes=0,
+    retweets=0,
+    replies=0,
+    views=0,
+    url="/alice/status/1",
+)
+
+
+class FakePortal(TwitterPortal):
+    """`TwitterPortal` whose page actions are recorded instead of clicked."""
+
+    def __init__(self, liked: bool = False, fail_on: str | None = None):
+        super().__init__(logging.getLogger("test"))
+        self.already_liked = liked
+        self.fail_on = fail_on
+        self.calls: list[str] = []
+
+    def _record(self, action: str) -> None:
+        if action == self.fail_on:
+            raise RuntimeError(action)
+        self.calls.append(action)
+
+    async def goto(self, url: str, **kwargs) -> None:
+        self._record("goto")
+
+    async def click_like(self) -> bool:
+        self._record("like")
+        return not self.already_liked
+
+    async def reply_to_tweet(self, text: str) -> None:
+        self._record(f"reply:{text}")
+
+    async def click_retweet(self) -> bool:
+        self._record("retweet")
+        return True
+
+
+class FakeWriter:
+    def __init__(self):
+        self.saves = 0
+
+    async def submit(self, fn, *args, **kwargs):
+        self.saves += 1
+
+
+def _scheduler(portal: FakePortal, **tokens: int) -> ActionScheduler:
+    buckets = {}
+    for action in ("like", "reply", "retweet"):
+        buckets[action] = TokenBucket.full(RateLimit(0.0, 3))
+        buckets[action].tokens = tokens.get(action, 3)
+    return ActionScheduler(
+        logging.getLogger("test"), portal, 1, buckets, FakeWriter(), jitter=(0, 0)
+    )
+
+
+def _tokens(scheduler: ActionScheduler) -> dict[str, float]:
+    return {action: b.tokens for action, b in scheduler.buckets.items()}
+
+
+def test_all_actions():
+    portal = FakePortal()
+    scheduler = _scheduler(portal)
+    assert asyncio.run(scheduler.act_on(TWEET, "hi")) == "hi"
+    assert portal.calls == ["goto", "like", "reply:hi", "retweet"]
+    assert _tokens(scheduler) == {"like": 2, "reply": 2, "retweet": 2}
+    assert scheduler.actions == {"like": 1, "reply": 1, "retweet": 1}
+    assert scheduler.writer.saves == 1
+
+
+def test_reply_task_is_awaited():
+    async def reply() -> str:
+        return "later"
+
+    async def run(scheduler):
+        return await scheduler.act_on(TWEET, asyncio.ensure_future(reply()))
+
+    portal = FakePortal()
+    assert asyncio.run(run(_scheduler(portal))) == "later"
+    assert "reply:later" in portal.calls
+
+
+def test_no_like_token_opens_nothing():
+    portal = FakePortal()
+    scheduler = _scheduler(portal, like=0)
+    assert asyncio.run(scheduler.act_on(TWEET, "hi")) is None
+    assert portal.calls == []
+
+
+def test_empty_buckets_skip_single_actions():
+    portal = FakePortal()
+    scheduler = _scheduler(portal, reply=0, retweet=0)
+    assert asyncio.run(scheduler.act_on(TWEET, "hi")) is None
+    assert portal.calls == ["goto", "like"]
+    assert _tokens(scheduler) == {"like": 2, "reply": 0, "retweet": 0}
+
+
+def test_already_liked_gives_every_token_back():
+    portal = FakePortal(liked=True)
+    scheduler = _scheduler(portal)
+    assert asyncio.run(scheduler.act_on(TWEET, "hi")) is None
+    assert portal.calls == ["goto", "like"]
+    assert _tokens(scheduler) == {"like": 3, "reply": 3, "retweet": 3}
+
+
+def test_missing_reply_gives_the_reply_token_back():
+    async def reply() -> None:
+        return None
+
+    async def run(scheduler):
+        return await scheduler.act_on(TWEET, reply())
+
+    portal = FakePortal()
+    scheduler = _scheduler(portal)
+    assert asyncio.run(run(scheduler)) is None
+    assert portal.calls == ["goto", "like", "retweet"]
+    assert _tokens(scheduler) == {"like": 2, "reply": 3, "retweet": 2}
+
+
+def test_failure_keeps_the_tokens_of_what_happened():
+    portal = FakePortal(fail_on="reply:hi")
+    scheduler = _scheduler(portal)
+    with pytest.raises(RuntimeError):
+        asyncio.run(scheduler.act_on(TWEET, "hi"))
+    assert _tokens(scheduler) == {"like": 2, "reply": 3, "retweet": 3}
+    assert scheduler.actions == {"like": 1, "reply": 0, "retweet": 0}
+    assert scheduler.writer.saves == 1
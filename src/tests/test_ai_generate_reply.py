@@ -0,0 +1,41 @@
+import asyncio
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from src.ai_services.ai_generate_reply import PROMPT_TEMPLATE, ReplyGenerator
+from src.tests.conftest import make_tweet
+
+
+class EchoChatModel(FakeListChatModel):
+    """Answers with the prompt it was given."""
+
+    responses: list[str] = [""]
+
+    def _call(self, messages, stop=None, run_manager=None, **kwargs) -> str:
+        return messages[-1].content
+
+
+def test_reply_is_the_model_output():
+    generator = ReplyGenerator(FakeListChatModel(responses=["Дякую!", "Клас!"]))
+    replies = [
+        asyncio.run(generator.generate_reply(make_tweet(i))) for i in range(3)
+    ]
+    assert replies == ["Дякую!", "Клас!", "Дякую!"]
+
+
+def test_prompt_quotes_the_tweet():
+    generator = ReplyGenerator(EchoChatModel())
+    prompt = asyncio.run(generator.generate_reply(make_tweet(1)))
+    assert prompt == PROMPT_TEMPLATE.format(text="tweet 1")
+    assert "«tweet 1»" in prompt
+
+
+def test_concurrent_replies_keep_their_tweet():
+    generator = ReplyGenerator(EchoChatModel())
+    tweets = [make_tweet(i) for i in range(20)]
+
+    async def main():
+        return await asyncio.gather(*(generator.generate_reply(t) for t in tweets))
+
+    replies = asyncio.run(main())
+    assert replies == [generator.build_prompt(t) for t in tweets]
@@ -0,0 +1,162 @@
+import asyncio
+import logging
+
+from src.twitter.context_pool import BrowserContextPool
+
+
+class FakeContext:
+    def __init__(self, browser: "FakeBrowser", storage_state: dict | None):
+        self.browser = browser
+        self.storage_state = storage_state
+        self.closed = False
+
+    async def route(self, pattern: str, handler) -> None:
+        pass
+
+    def on(self, event: str, handler) -> None:
+        pass
+
+    async def new_page(self) -> object:
+        return object()
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class FakeBrowser:
+    """Stands in for Chromium; opening a context can be held back."""
+
+    def __init__(self):
+        self.contexts: list[FakeContext] = []
+        self.gate: asyncio.Event | None = None
+
+    async def new_context(self, storage_state=None, **kwargs) -> FakeContext:
+        if self.gate is not None:
+            await self.gate.wait()
+        context = FakeContext(self, storage_state)
+        self.contexts.append(context)
+        return context
+
+    @property
+    def live(self) -> int:
+        return sum(not c.closed for c in self.contexts)
+
+
+def _pool(**kwargs) -> tuple[BrowserContextPool, FakeBrowser]:
+    pool = BrowserContextPool(logging.getLogger("test"), **kwargs)
+    pool.browser = FakeBrowser()
+    return pool, pool.browser
+
+
+def test_released_context_is_reused():
+    async def main():
+        pool, browser = _pool()
+        first = await pool.acquire(1, {"cookies": []})
+        await pool.release(first)
+        second = await pool.acquire(1, None)
+        return pool, browser, first, second
+
+    pool, browser, first, second = asyncio.run(main())
+    assert second is first
+    assert first.context.storage_state == {"cookies": []}
+    assert (pool.stats.hits, pool.stats.misses) == (1, 1)
+    assert len(browser.contexts) == 1
+
+
+def test_old_context_is_recycled():
+    async def main():
+        pool, browser = _pool(max_age=60.0)
+        first = await pool.acquire(1, None)
+        await pool.release(first)
+        first.created_at -= 61.0
+        second = await pool.acquire(1, None)
+        return pool, first, second
+
+    pool, first, second = asyncio.run(main())
+    assert second is not first
+    assert first.context.closed
+    assert second.pooled
+    assert (pool.stats.recycled, pool.stats.misses) == (1, 2)
+
+
+def test_least_recently_used_idle_context_is_evicted():
+    async def main():
+        pool, browser = _pool(max_contexts=2)
+        a = await pool.acquire(1, None)
+        b = await pool.acquire(2, None)
+        await pool.release(a)
+        await pool.release(b)
+        c = await pool.acquire(3, None)
+        return pool, browser, a, b, c
+
+    pool, browser, a, b, c = asyncio.run(main())
+    assert a.context.closed
+    assert not b.context.closed
+    assert c.pooled
+    assert pool.stats.evictions == 1
+    assert browser.live == 2
+
+
+def test_full_pool_of_busy_contexts_serves_a_throwaway():
+    async def main():
+        pool, browser = _pool(max_contexts=1)
+        busy = await pool.acquire(1, None)
+        extra = await pool.acquire(2, None)
+        await pool.release(extra)
+        return busy, extra
+
+    busy, extra = asyncio.run(main())
+    assert busy.pooled
+    assert not extra.pooled
+    assert extra.context.closed
+
+
+def test_leased_bot_gets_a_throwaway_context():
+    async def main():
+        pool, browser = _pool()
+        leased = await pool.acquire(1, None)
+        extra = await pool.acquire(1, None)
+        await pool.release(extra)
+        await pool.release(leased)
+        again = await pool.acquire(1, None)
+        return leased, extra, again
+
+    leased, extra, again = asyncio.run(main())
+    assert extra is not leased
+    assert not extra.pooled
+    assert extra.context.closed
+    assert again is leased
+
+
+def test_warm_hit_does_not_wait_for_a_cold_open():
+    async def main():
+        pool, browser = _pool()
+        warm = await pool.acquire(1, None)
+        await pool.release(warm)
+
+        browser.gate = asyncio.Event()
+        cold = asyncio.create_task(pool.acquire(2, None))
+        await asyncio.sleep(0)
+        hit = await asyncio.wait_for(pool.acquire(1, None), timeout=1.0)
+        browser.gate.set()
+        return warm, hit, await cold
+
+    warm, hit, cold = asyncio.run(main())
+    assert hit is warm
+    assert cold.pooled
+
+
+def test_opening_slot_counts_against_max_contexts():
+    async def main():
+        pool, browser = _pool(max_contexts=1)
+        browser.gate = asyncio.Event()
+        first = asyncio.create_task(pool.acquire(1, None))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(pool.acquire(2, None))
+        await asyncio.sleep(0)
+        browser.gate.set()
+        return await first, await second
+
+    first, second = asyncio.run(main())
+    assert first.pooled
+    assert not second.pooled
@@ -0,0 +1,58 @@
+import json
+
+from src.database.db import PoolMetrics
+from src.utils.metrics import Metrics, RunTrace, Span, span, trace_run
+
+
+def _span(i: int, name: str = "portal.goto") -> Span:
+    return Span(name, "bot", i, None, 0.0, 0.5)
+
+
+def test_trace_without_a_path_keeps_totals_but_caps_records():
+    trace = RunTrace("bot", max_spans=3)
+    for i in range(5):
+        trace.add(_span(i))
+    assert len(trace.spans) == 3
+    assert trace.dropped == 2
+    assert trace.totals() == {"portal.goto": (5, 2.5)}
+
+
+def test_trace_flushes_full_batches_to_its_path(tmp_path):
+    path = tmp_path / "spans.jsonl"
+    trace = RunTrace("bot", path, max_spans=3)
+    for i in range(7):
+        trace.add(_span(i))
+    assert len(trace.spans) == 1
+    trace.flush()
+
+    ids = [json.loads(line)["id"] for line in path.read_text().splitlines()]
+    assert ids == list(range(7))
+    assert trace.spans == []
+    assert trace.dropped == 0
+
+
+def test_spans_are_traced_with_their_parent():
+    with trace_run("bot") as trace:
+        with span("outer"):
+            with span("inner"):
+                pass
+    inner, outer = trace.spans
+    assert (inner.name, outer.name) == ("inner", "outer")
+    assert inner.parent == outer.id
+    assert outer.parent is None
+
+
+def test_registered_collectors_are_exported():
+    metrics = Metrics()
+    pool = PoolMetrics()
+    pool.record(0.25)
+    pool.record(0.75)
+    pool.record(2.0, timed_out=True)
+    metrics.register(pool.prometheus_lines)
+
+    exported = metrics.to_prometheus().splitlines()
+    assert "xbot_db_pool_checkouts_total 2" in exported
+    assert "xbot_db_pool_timeouts_total 1" in exported
+    assert "xbot_db_pool_wait_seconds_total 1.000000" in exported
+    assert "xbot_db_pool_wait_seconds_max 2.000000" in exported
+    assert "# TYPE xbot_db_pool_checkouts_total counter" in exported
@@ -0,0 +1,208 @@
+import asyncio
+import random
+
+import pytest
+from playwright.async_api import TimeoutError
+
+from src.utils.portal_utils import (
+    FAST_TYPING,
+    HUMAN_TYPING,
+    PUNCTUATION,
+    Burst,
+    CircuitBreaker,
+    CircuitOpenError,
+    TypingProfile,
+    async_retry,
+    get_breaker,
+    human_type,
+    plan_keystrokes,
+    planned_duration,
+)
+
+TEXT = "Чудова новина! Дякую, що поділилися.\nСлава Україні"
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_bursts_cover_the_text_within_the_profile(seed):
+    p = HUMAN_TYPING
+    bursts = plan_keystrokes(TEXT, p, random.Random(seed))
+
+    assert "".join(b.text for b in bursts) == TEXT
+    for b in bursts:
+        assert p.min_delay <= b.delay <= p.max_delay
+        assert 1 <= len(b.text) <= p.burst[1]
+        # Punctuation only ever ends a burst.
+        assert not PUNCTUATION.intersection(b.text[:-1])
+    for b in bursts[:-1]:
+        if b.text[-1] in PUNCTUATION:
+            assert p.punctuation_pause[0] <= b.pause_after <= p.punctuation_pause[1]
+        else:
+            assert len(b.text) >= p.burst[0]
+            assert p.burst_pause[0] <= b.pause_after <= p.burst_pause[1]
+    assert bursts[-1].pause_after == 0.0
+
+
+def test_seeded_plans_are_reproducible():
+    assert plan_keystrokes(TEXT, rng=random.Random(1)) == plan_keystrokes(
+        TEXT, rng=random.Random(1)
+    )
+
+
+def test_single_burst_profiles():
+    (burst,) = plan_keystrokes(TEXT, FAST_TYPING, random.Random(0))
+    assert burst.text == TEXT
+    assert burst.pause_after == 0.0
+
+
+def test_burst_pauses_without_punctuation_pauses():
+    profile = TypingProfile(10, 10, burst=(4, 4), burst_pause=(50, 50))
+    bursts = plan_keystrokes("ab, cdefg", profile)
+    assert bursts == [Burst("ab, ", 10, 50), Burst("cdef", 10, 50), Burst("g", 10, 0)]
+
+
+def test_empty_text():
+    assert plan_keystrokes("") == []
+
+
+def test_planned_duration():
+    bursts = [Burst("abc", 100, 200), Burst("de", 50, 0)]
+    assert planned_duration(bursts) == pytest.approx(0.6)
+
+
+class FakeKeyboard:
+    def __init__(self):
+        self.typed: list[tuple[str, float]] = []
+
+    async def type(self, text: str, delay: float = 0) -> None:
+        self.typed.append((text, delay))
+
+
+class FakeLocator:
+    def __init__(self):
+        self.focused = 0
+
+    @property
+    def first(self):
+        return self
+
+    async def focus(self) -> None:
+        self.focused += 1
+
+
+class FakePage:
+    def __init__(self):
+        self.keyboard = FakeKeyboard()
+        self.input = FakeLocator()
+
+    def locator(self, selector: str) -> FakeLocator:
+        return self.input
+
+
+def test_human_type_focuses_once_and_types_the_plan():
+    page = FakePage()
+    profile = TypingProfile(0, 5, burst=(2, 4))
+    asyncio.run(human_type(page, "textarea", "hello world", profile, random.Random(3)))
+
+    assert page.input.focused == 1
+    plan = plan_keystrokes("hello world", profile, random.Random(3))
+    assert page.keyboard.typed == [(b.text, b.delay) for b in plan]
+
+
+# Shared by every function guarded with the same name, as in the portal.
+BREAKER = get_breaker("test", failure_threshold=2, reset_timeout=60.0)
+
+
+@pytest.fixture
+def breaker():
+    BREAKER.record_success()
+    return BREAKER
+
+
+def _elapse(breaker: CircuitBreaker, seconds: float) -> None:
+    breaker.opened_at -= seconds
+
+
+def _guarded(fn):
+    return async_retry(retries=0, breaker="test", on_retry=None)(fn)
+
+
+@_guarded
+async def _fail():
+    raise TimeoutError("x")
+
+
+@_guarded
+async def _succeed():
+    return "ok"
+
+
+def test_breaker_opens_half_opens_and_closes(breaker):
+    for _ in range(2):
+        with pytest.raises(TimeoutError):
+            asyncio.run(_fail())
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(_succeed())
+
+    _elapse(breaker, 60)
+    assert breaker.state == "half-open"
+    assert asyncio.run(_succeed()) == "ok"
+    assert breaker.state == "closed"
+    assert breaker.failures == 0
+
+
+def test_failed_trial_reopens_the_breaker(breaker):
+    for _ in range(2):
+        with pytest.raises(TimeoutError):
+            asyncio.run(_fail())
+    _elapse(breaker, 60)
+    with pytest.raises(TimeoutError):
+        asyncio.run(_fail())
+    assert breaker.state == "open"
+
+
+def test_one_trial_at_a_time(breaker):
+    breaker.failures = 2
+    breaker.opened_at = 0.0
+    assert breaker.allow()
+    assert not breaker.allow()
+
+
+def test_cancelled_trial_lets_the_next_one_in(breaker):
+    started = asyncio.Event()
+
+    @_guarded
+    async def hang():
+        started.set()
+        await asyncio.Event().wait()
+
+    async def cancel_trial():
+        task = asyncio.create_task(hang())
+        await started.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    for _ in range(2):
+        with pytest.raises(TimeoutError):
+            asyncio.run(_fail())
+    _elapse(breaker, 60)
+    asyncio.run(cancel_trial())
+
+    assert breaker.state == "half-open"
+    assert asyncio.run(_succeed()) == "ok"
+    assert breaker.state == "closed"
+
+
+def test_uncounted_error_in_a_trial_lets_the_next_one_in(breaker):
+    @_guarded
+    async def broken():
+        raise ValueError("not a breaker failure")
+
+    for _ in range(2):
+        with pytest.raises(TimeoutError):
+            asyncio.run(_fail())
+    _elapse(breaker, 60)
+    with pytest.raises(ValueError):
+        asyncio.run(broken())
+    assert asyncio.run(_succeed()) == "ok"
@@ -0,0 +1,111 @@
+import random
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.twitter.ranking import (
+    ENGAGEMENT_WEIGHTS,
+    VIRAL_WEIGHTS,
+    RankingWeights,
+    TopK,
+    rank_batch,
+    score_tweet,
+    top_k,
+)
+from src.twitter.tweet_batch import TweetBatch
+from src.twitter.tweets import Tweet
+
+NOW = datetime(2025, 7, 10, 12, tzinfo=timezone.utc)
+WEIGHTS = [
+    VIRAL_WEIGHTS,
+    ENGAGEMENT_WEIGHTS,
+    RankingWeights(replies=1.0, reply_ratio=50.0, half_life_hours=6.0),
+]
+
+
+def _tweets(n: int, seed: int = 0) -> list[Tweet]:
+    rng = random.Random(seed)
+    tweets = []
+    for i in range(n):
+        views = rng.choice((0, rng.randrange(1, 1_000_000)))
+        likes = rng.randrange(10_000)
+        tweets.append(
+            Tweet(
+                author=f"author{rng.randrange(n // 10)}",
+                text=f"tweet {i}",
+                likes=likes,
+                retweets=rng.randrange(likes + 1),
+                replies=rng.randrange(500),
+                views=views,
+                url=f"/author/status/{i}",
+                posted_at=(
+                    None
+                    if rng.random() < 0.1
+                    else NOW - timedelta(hours=rng.uniform(0, 48))
+                ),
+            )
+        )
+    return tweets
+
+
+def _ranked(ranked) -> list[tuple[float, str]]:
+    return [(score, t.url) for score, t in ranked]
+
+
+@pytest.mark.parametrize("weights", WEIGHTS)
+def test_top_k_matches_a_full_sort(weights):
+    weights = replace(weights, author_penalty=0.0)
+    tweets = _tweets(500)
+    expected = sorted(
+        tweets, key=lambda t: score_tweet(t, weights, NOW), reverse=True
+    )[:10]
+    assert [t.url for _, t in top_k(tweets, 10, weights, now=NOW)] == [
+        t.url for t in expected
+    ]
+
+
+def test_streaming_matches_one_batch():
+    tweets = _tweets(300)
+    ranker = TopK(10, ENGAGEMENT_WEIGHTS, now=NOW)
+    for i in range(0, len(tweets), 37):
+        ranker.extend(tweets[i : i + 37])
+    assert ranker.result() == top_k(tweets, 10, ENGAGEMENT_WEIGHTS, now=NOW)
+
+
+def _liked(author: str, i: int, likes: int) -> Tweet:
+    return Tweet(
+        author=author,
+        text=f"tweet {i}",
+        likes=likes,
+        retweets=0,
+        replies=0,
+        views=0,
+        url=f"/{author}/status/{i}",
+    )
+
+
+def test_author_penalty_spreads_the_top():
+    # a's second best scores 99 * 0.5, below b's 60.
+    tweets = [_liked("a", i, 100 - i) for i in range(5)] + [_liked("b", 1, 60)]
+    ranked = top_k(tweets, 2, RankingWeights(author_penalty=0.5), now=NOW)
+    assert [t.url for _, t in ranked] == ["/a/status/0", "/b/status/1"]
+
+
+def test_zero_k():
+    assert top_k(_tweets(10), 0, now=NOW) == []
+
+
+@pytest.mark.parametrize("weights", WEIGHTS)
+def test_numpy_ranking_matches_the_heap(weights):
+    pytest.importorskip("numpy")
+    tweets = _tweets(2_000)
+    expected = _ranked(top_k(tweets, 20, weights, now=NOW))
+    for ranked in (
+        rank_batch(tweets, 20, weights, NOW),
+        TweetBatch.from_tweets(tweets).rank(20, weights, NOW),
+    ):
+        assert [url for _, url in _ranked(ranked)] == [url for _, url in expected]
+        assert [score for score, _ in _ranked(ranked)] == pytest.approx(
+            [score for score, _ in expected]
+        )
@@ -0,0 +1,65 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.bots.rate_limits import RateLimit, TokenBucket
+
+T0 = datetime(2025, 7, 10, 12)
+
+
+def _bucket(per_hour: float = 6.0, burst: int = 3) -> TokenBucket:
+    return TokenBucket.full(RateLimit(per_hour, burst), T0)
+
+
+def test_burst_then_empty():
+    bucket = _bucket()
+    assert [bucket.take(T0) for _ in range(4)] == [True, True, True, False]
+    assert bucket.tokens == 0
+
+
+def test_refills_at_the_hourly_rate():
+    bucket = _bucket(per_hour=6.0)
+    for _ in range(3):
+        bucket.take(T0)
+    assert not bucket.available(T0 + timedelta(minutes=9))
+    assert bucket.take(T0 + timedelta(minutes=10))
+    assert not bucket.take(T0 + timedelta(minutes=10))
+
+
+def test_refill_is_capped_at_the_burst():
+    bucket = _bucket(burst=3)
+    bucket.take(T0)
+    bucket.refill(T0 + timedelta(days=1))
+    assert bucket.tokens == 3
+
+
+def test_clock_going_back_adds_nothing():
+    bucket = _bucket()
+    bucket.take(T0)
+    bucket.refill(T0 - timedelta(hours=1))
+    assert bucket.tokens == 2
+
+
+def test_give_back_is_capped_at_the_burst():
+    bucket = _bucket(burst=3)
+    bucket.take(T0)
+    bucket.give_back()
+    bucket.give_back()
+    assert bucket.tokens == 3
+
+
+def test_seconds_until_available():
+    bucket = _bucket(per_hour=6.0)
+    assert bucket.seconds_until_available(T0) == 0.0
+    for _ in range(3):
+        bucket.take(T0)
+    assert bucket.seconds_until_available(T0) == pytest.approx(600.0)
+    assert bucket.seconds_until_available(T0 + timedelta(minutes=4)) == (
+        pytest.approx(360.0)
+    )
+
+
+def test_zero_rate_never_refills():
+    bucket = _bucket(per_hour=0.0, burst=1)
+    bucket.take(T0)
+    assert bucket.seconds_until_available(T0) == float("inf")
@@ -0,0 +1,91 @@
+import pytest
+
+from src.twitter.request_profiles import (
+    FULL_PROFILE,
+    LIGHT_PROFILE,
+    RequestProfile,
+    RequestStats,
+)
+
+X = "https://x.com"
+TWIMG = "https://pbs.twimg.com"
+
+
+@pytest.mark.parametrize(
+    "resource_type, url, decision",
+    [
+        # The page itself and its API calls.
+        ("document", f"{X}/home", "allow"),
+        ("script", "https://abs.twimg.com/responsive-web/client-web/main.js", "allow"),
+        ("xhr", f"{X}/i/api/graphql/abc/HomeLatestTimeline", "allow"),
+        ("fetch", f"{X}/i/api/graphql/abc/FavoriteTweet", "allow"),
+        ("stylesheet", "https://abs.twimg.com/responsive-web/main.css", "allow"),
+        # Heavy resource types.
+        ("image", f"{TWIMG}/media/abc.jpg", "block"),
+        ("media", "https://video.twimg.com/ext_tw_video/1/pu/vid/a.mp4", "block"),
+        ("font", "https://abs.twimg.com/fonts/chirp.woff2", "block"),
+        # Blocked hosts, whatever the resource type.
+        ("xhr", "https://video.twimg.com/amplify_video/1/pl/a.m3u8", "block"),
+        ("script", "https://www.google-analytics.com/analytics.js", "block"),
+        ("script", "https://www.googletagmanager.com/gtm.js?id=1", "block"),
+        ("script", "https://static.ads-twitter.com/uwt.js", "block"),
+        ("xhr", "https://ads-api.x.com/12/measurement/web", "block"),
+        # Telemetry is answered with an empty 204.
+        ("xhr", "https://api.x.com/1.1/jot/client_event.json", "stub"),
+        ("xhr", f"{X}/i/api/1.1/jot/ces/p2", "stub"),
+        ("xhr", f"{X}/i/api/1.1/keyregistry/register", "stub"),
+        ("ping", f"{X}/client_event.json", "stub"),
+        # The login flow goes through, images included.
+        ("document", f"{X}/i/flow/login", "allow"),
+        ("image", f"{X}/i/flow/login/logo.png", "allow"),
+        ("xhr", "https://api.x.com/1.1/onboarding/task.json?flow_name=login", "allow"),
+        ("script", "https://client-api.arkoselabs.com/v2/api.js", "allow"),
+        ("image", "https://client-api.arkoselabs.com/cdn/fc/assets/a.png", "allow"),
+    ],
+)
+def test_light_profile(resource_type, url, decision):
+    assert LIGHT_PROFILE.decide(resource_type, url) == decision
+
+
+@pytest.mark.parametrize(
+    "resource_type, url",
+    [
+        ("image", f"{TWIMG}/media/abc.jpg"),
+        ("media", "https://video.twimg.com/ext_tw_video/1/pu/vid/a.mp4"),
+        ("xhr", "https://api.x.com/1.1/jot/client_event.json"),
+    ],
+)
+def test_full_profile_allows_everything(resource_type, url):
+    assert FULL_PROFILE.decide(resource_type, url) == "allow"
+    assert not FULL_PROFILE.intercepts
+
+
+BOTH = RequestProfile("p", blocked_url_patterns=("a",), stubbed_url_patterns=("a",))
+PING = RequestProfile("p", stubbed_url_patterns=(r"/ping$",))
+
+
+@pytest.mark.parametrize(
+    "profile, url, decision",
+    [
+        # Blocking wins over stubbing.
+        (BOTH, "https://a.test/", "block"),
+        # Patterns are regular expressions searched in the whole URL.
+        (PING, "https://b.test/ping", "stub"),
+        (PING, "https://b.test/ping?x=1", "allow"),
+    ],
+)
+def test_rule_precedence(profile, url, decision):
+    assert profile.decide("xhr", url) == decision
+    assert profile.intercepts
+
+
+def test_allowed_patterns_alone_do_not_intercept():
+    assert not RequestProfile("p", allowed_url_patterns=("a",)).intercepts
+
+
+def test_bytes_saved_uses_the_baseline_for_unseen_types():
+    stats = RequestStats(profile="light", baseline_sizes={"image": 1000.0})
+    stats.blocked_by_type = {"image": 3, "font": 2}
+    stats.bytes_by_type = {"font": 600}
+    stats.count_by_type = {"font": 2}
+    assert stats.bytes_saved == 3 * 1000 + 2 * 300
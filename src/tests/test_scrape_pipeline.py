@@ -0,0 +1,40 @@
+import asyncio
+import logging
+
+from sqlalchemy import func, select
+
+from src.database.models import Tweets
+from src.tests.conftest import make_tweet
+from src.twitter.scrape_pipeline import ScrapePipeline
+from src.twitter.tweets import Tweet
+from src.twitter.tweets_crud import claim_tweet
+
+
+class FakePortal:
+    def __init__(self, tweets: list[Tweet]):
+        self.tweets = tweets
+
+    async def feed_home_timeline(self, put, max_tweets, checkpoint) -> None:
+        for tweet in self.tweets[:max_tweets]:
+            await put(tweet)
+
+
+def test_scraped_tweets_are_stored_and_claimed_ones_skipped(sqlite_session):
+    async def main():
+        async with sqlite_session() as session:
+            await claim_tweet(session, 1, make_tweet(3))
+
+            tweets = [make_tweet(i, likes=i) for i in range(10)]
+            pipeline = ScrapePipeline(
+                logging.getLogger("test"), FakePortal(tweets), 1, session, batch_size=4
+            )
+            ranked = await pipeline.run(max_tweets=10, k=20)
+            stored = await session.scalar(select(func.count()).select_from(Tweets))
+        return pipeline.stats, ranked, stored
+
+    stats, ranked, stored = asyncio.run(main())
+    assert stored == 10
+    assert (stats.scraped, stats.stored, stats.already_claimed) == (10, 10, 1)
+    assert sorted(t.url for _, t in ranked) == sorted(
+        f"/alice/status/{i}" for i in range(10) if i != 3
+    )
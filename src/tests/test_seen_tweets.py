@@ -0,0 +1,62 @@
+from src.tests.conftest import make_tweet
+from src.twitter.seen_tweets import SeenTweets
+from src.twitter.tweets import compute_tweet_hash
+
+
+def test_add_reports_new_and_duplicate():
+    seen = SeenTweets()
+    assert seen.add(make_tweet(1))
+    assert not seen.add(make_tweet(1))
+    assert make_tweet(1) in seen
+    assert make_tweet(2) not in seen
+
+
+def test_same_text_under_another_url_is_a_duplicate():
+    seen = SeenTweets()
+    seen.add(make_tweet(1))
+    assert make_tweet(1, url="/quoted/status/99") in seen
+
+
+def test_has_url():
+    seen = SeenTweets()
+    seen.add(make_tweet(1))
+    assert seen.has_url("/alice/status/1")
+    assert not seen.has_url("/alice/status/2")
+
+
+def test_least_recently_seen_keys_are_evicted():
+    # Each tweet stores two keys: its URL and its hash.
+    seen = SeenTweets(maxsize=4)
+    for i in (1, 2, 3):
+        seen.add(make_tweet(i))
+    assert len(seen) == 4
+    assert make_tweet(1) not in seen
+    assert make_tweet(2) in seen
+    assert make_tweet(3) in seen
+
+
+def test_lookup_refreshes_a_key():
+    seen = SeenTweets(maxsize=4)
+    seen.add(make_tweet(1))
+    seen.add(make_tweet(2))
+    assert seen.has_url("/alice/status/1")
+    seen.add(make_tweet(3))
+    assert seen.has_url("/alice/status/1")
+    assert not seen.has_url("/alice/status/2")
+
+
+def test_seed_accepts_urls_and_hashes():
+    seen = SeenTweets()
+    seen.seed(["/alice/status/1", compute_tweet_hash("bob", "tweet 2")])
+    assert make_tweet(1) in seen
+    assert make_tweet(2, author="bob") in seen
+    assert not seen.add(make_tweet(2, author="bob"))
+
+
+def test_discard_forgets_url_and_hash():
+    seen = SeenTweets()
+    seen.add(make_tweet(1))
+    seen.discard(make_tweet(1))
+    assert make_tweet(1) not in seen
+    assert len(seen) == 0
+    assert seen.add(make_tweet(1))
@@ -0,0 +1,65 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.twitter.session_health import CookieState, cookie_state
+
+NOW = datetime(2025, 7, 10, 12, tzinfo=timezone.utc)
+HOUR = 3_600
+
+
+def _session(**expires: float) -> dict:
+    """Storage state with the named cookies, expiring at the given offsets."""
+    return {
+        "cookies": [
+            {"name": name, "value": "v", "expires": NOW.timestamp() + offset}
+            for name, offset in expires.items()
+        ],
+        "origins": [],
+    }
+
+
+def _session_cookie(name: str) -> dict:
+    return {"name": name, "value": "v", "expires": -1}
+
+
+@pytest.mark.parametrize(
+    "session_data, state",
+    [
+        (None, CookieState.MISSING),
+        ({}, CookieState.MISSING),
+        ({"cookies": []}, CookieState.MISSING),
+        (_session(auth_token=24 * HOUR), CookieState.MISSING),
+        (_session(ct0=24 * HOUR), CookieState.MISSING),
+        (_session(guest_id=24 * HOUR, ct0=24 * HOUR), CookieState.MISSING),
+        (_session(auth_token=24 * HOUR, ct0=24 * HOUR), CookieState.VALID),
+        # The earlier of the two expiries counts.
+        (_session(auth_token=-HOUR, ct0=24 * HOUR), CookieState.EXPIRED),
+        (_session(auth_token=24 * HOUR, ct0=0), CookieState.EXPIRED),
+        (_session(auth_token=24 * HOUR, ct0=HOUR), CookieState.EXPIRING),
+        (_session(auth_token=12 * HOUR, ct0=24 * HOUR), CookieState.EXPIRING),
+        (_session(auth_token=12 * HOUR + 1, ct0=24 * HOUR), CookieState.VALID),
+        # Session cookies (expires -1) never expire on their own.
+        (
+            {"cookies": [_session_cookie("auth_token"), _session_cookie("ct0")]},
+            CookieState.VALID,
+        ),
+        (
+            {
+                "cookies": [
+                    _session_cookie("auth_token"),
+                    *_session(ct0=-HOUR)["cookies"],
+                ]
+            },
+            CookieState.EXPIRED,
+        ),
+    ],
+)
+def test_cookie_state(session_data, state):
+    assert cookie_state(session_data, now=NOW) == state
+
+
+def test_margin():
+    session_data = _session(auth_token=2 * HOUR, ct0=24 * HOUR)
+    assert cookie_state(session_data, timedelta(hours=1), NOW) == CookieState.VALID
+    assert cookie_state(session_data, timedelta(hours=3), NOW) == CookieState.EXPIRING
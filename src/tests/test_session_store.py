@@ -0,0 +1,49 @@
+from src.bots.session_store import decode_session, encode_session, session_digest
+
+DAY = 86_400
+
+
+def _state(expires: float = 20_000 * DAY + 100, token: str = "t1") -> dict:
+    return {
+        "cookies": [
+            {"name": "auth_token", "value": token, "expires": expires},
+            {"name": "session", "value": "s", "expires": -1},
+        ],
+        "origins": [{"origin": "https://x.com", "localStorage": []}],
+    }
+
+
+def test_round_trip():
+    state = _state()
+    blob = encode_session(state)
+    assert isinstance(blob, bytes)
+    assert decode_session(blob) == state
+
+
+def test_missing_blob_is_an_empty_state():
+    assert decode_session(None) == {}
+    assert decode_session(b"") == {}
+
+
+def test_digest_ignores_key_order():
+    state = _state()
+    reordered = {"origins": state["origins"], "cookies": state["cookies"]}
+    assert session_digest(reordered) == session_digest(state)
+
+
+def test_digest_ignores_same_day_cookie_renewals():
+    assert session_digest(_state(20_000 * DAY + 100)) == session_digest(
+        _state(20_000 * DAY + 5_000)
+    )
+
+
+def test_digest_changes_with_the_day_or_the_values():
+    digest = session_digest(_state())
+    assert session_digest(_state(20_001 * DAY + 100)) != digest
+    assert session_digest(_state(token="t2")) != digest
+
+
+def test_digest_leaves_the_state_untouched():
+    state = _state()
+    session_digest(state)
+    assert state == _state()
@@ -0,0 +1,104 @@
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+
+from src.twitter.timeline_capture import parse_timeline_payload
+
+FIXTURE = Path(__file__).parent / "fixtures" / "home_latest_timeline.json"
+
+
+def _payload(*instructions: dict) -> dict:
+    return {"data": {"home": {"home_timeline_urt": {"instructions": instructions}}}}
+
+
+def _item(rest_id: str, **legacy) -> dict:
+    return {
+        "itemType": "TimelineTweet",
+        "tweet_results": {
+            "result": {
+                "__typename": "Tweet",
+                "rest_id": rest_id,
+                "core": {
+                    "user_results": {
+                        "result": {"legacy": {"name": "Ann", "screen_name": "ann"}}
+                    }
+                },
+                "legacy": {"full_text": f"tweet {rest_id}", **legacy},
+            }
+        },
+    }
+
+
+def _entry(item: dict) -> dict:
+    return {"content": {"entryType": "TimelineTimelineItem", "itemContent": item}}
+
+
+def test_recorded_response():
+    tweets = parse_timeline_payload(json.loads(FIXTURE.read_text(encoding="utf-8")))
+
+    # The promoted tweet, the cursors and the tombstone in the conversation
+    # module are skipped.
+    assert [t.url for t in tweets] == [
+        "/ThePSF/status/1945000000000000001",
+        "/KyivIndependent/status/1945000000000000002",
+        "/olena_dev/status/1945000000000000003",
+        "/mozilla/status/1945000000000000004",
+        "/taras_k/status/1945000000000000005",
+    ]
+    first = tweets[0]
+    assert (first.author, first.likes, first.retweets, first.replies, first.views) == (
+        "Python",
+        12873,
+        2311,
+        187,
+        1204331,
+    )
+    assert first.posted_at == datetime(2025, 7, 10, 8, 15, tzinfo=timezone.utc)
+    # Long tweets come from note_tweet rather than the truncated full_text.
+    assert tweets[2].text.endswith("Feedback welcome!")
+
+
+def test_counts_are_exact_and_missing_views_are_zero():
+    (tweet,) = parse_timeline_payload(
+        _payload(
+            {
+                "type": "TimelineAddEntries",
+                "entries": [_entry(_item("1", favorite_count=1234, retweet_count=5))],
+            }
+        )
+    )
+    assert (tweet.likes, tweet.retweets, tweet.replies, tweet.views) == (1234, 5, 0, 0)
+    assert tweet.author == "Ann"
+    assert tweet.url == "/ann/status/1"
+
+
+def test_single_entry_instruction_and_bad_timestamp():
+    (tweet,) = parse_timeline_payload(
+        _payload(
+            {
+                "type": "TimelinePinEntry",
+                "entry": _entry(_item("2", created_at="not a date")),
+            }
+        )
+    )
+    assert tweet.url == "/ann/status/2"
+    assert tweet.posted_at is None
+
+
+def test_promoted_and_incomplete_items_are_skipped():
+    promoted = {**_item("3"), "promotedMetadata": {"advertiser": "x"}}
+    no_user = _item("4")
+    no_user["tweet_results"]["result"]["core"] = {}
+    cursor = {"content": {"entryType": "TimelineTimelineCursor", "value": "abc"}}
+    payload = _payload(
+        {
+            "type": "TimelineAddEntries",
+            "entries": [_entry(promoted), _entry(no_user), cursor],
+        }
+    )
+    assert parse_timeline_payload(payload) == []
+
+
+def test_unrelated_payload():
+    assert parse_timeline_payload({}) == []
+    assert parse_timeline_payload({"errors": [{"message": "Rate limit"}]}) == []
@@ -0,0 +1,101 @@
+import asyncio
+import logging
+
+import pytest
+
+from src.twitter.pacing import FAST_PACING
+from src.twitter.twitter_portal import (
+    EXTRACT_TWEETS_JS,
+    UNTAG_ARTICLES_JS,
+    ScrapeCheckpoint,
+    TwitterPortal,
+)
+
+
+class FakeMouse:
+    async def move(self, x: float, y: float, steps: int = 1) -> None:
+        pass
+
+    async def wheel(self, dx: float, dy: float) -> None:
+        pass
+
+
+class FakeTimeline:
+    """
+    Page with a fixed home timeline, standing in for the browser.
+
+    Mirrors what `EXTRACT_TWEETS_JS` and `UNTAG_ARTICLES_JS` do to the
+    articles' ``data-xbot-seen`` tag.
+    """
+
+    def __init__(self, n: int):
+        self.mouse = FakeMouse()
+        self.articles = [
+            {"url": f"/alice/status/{i}", "text": f"tweet {i}", "seen": False}
+            for i in range(n)
+        ]
+
+    async def wait_for_selector(self, selector: str, timeout: float = 0) -> None:
+        pass
+
+    async def eval_on_selector_all(self, selector: str, script: str, arg):
+        if script == EXTRACT_TWEETS_JS:
+            new = [a for a in self.articles if not a["seen"]]
+            for a in new:
+                a["seen"] = True
+            return [
+                {
+                    "box": None,
+                    "author": "alice",
+                    "text": a["text"],
+                    "url": a["url"],
+                    "likes": "1",
+                    "retweets": "0",
+                    "replies": "0",
+                    "views": "10",
+                }
+                for a in new
+            ]
+        if script == UNTAG_ARTICLES_JS:
+            urls = set(arg[1])
+            for a in self.articles:
+                if a["url"] in urls:
+                    a["seen"] = False
+            return None
+        raise AssertionError("unexpected script")
+
+
+def _portal(n: int) -> TwitterPortal:
+    portal = TwitterPortal(logging.getLogger("test"), pacing=FAST_PACING)
+    portal.set_context(None, FakeTimeline(n))
+    return portal
+
+
+def _urls(tweets) -> list[str]:
+    return [t.url for t in tweets]
+
+
+def test_failed_hand_over_is_scraped_again():
+    portal = _portal(5)
+    checkpoint = ScrapeCheckpoint()
+    received = []
+
+    async def put(tweet):
+        if len(received) == 2 and not checkpoint.resumes:
+            raise RuntimeError("queue closed")
+        received.append(tweet)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(portal.feed_home_timeline(put, 5, checkpoint))
+    assert checkpoint.scraped == 2
+
+    asyncio.run(portal.feed_home_timeline(put, 5, checkpoint))
+    assert _urls(received) == [f"/alice/status/{i}" for i in range(5)]
+
+
+def test_stopping_early_leaves_the_rest_for_the_next_scrape():
+    portal = _portal(5)
+    first = asyncio.run(portal.scrape_home_timeline(max_tweets=2))
+    rest = asyncio.run(portal.scrape_home_timeline(max_tweets=10))
+    assert _urls(first) == ["/alice/status/0", "/alice/status/1"]
+    assert _urls(rest) == [f"/alice/status/{i}" for i in range(2, 5)]
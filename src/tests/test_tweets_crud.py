@@ -0,0 +1,41 @@
+import asyncio
+
+from src.tests.conftest import make_tweet
+from src.twitter.tweets import compute_tweet_hash
+from src.twitter.tweets_crud import (
+    bulk_upsert_tweets,
+    claim_tweet,
+    get_claimed_hashes,
+    get_seen_tweet_keys,
+)
+
+HASH = compute_tweet_hash("alice", "tweet 1")
+
+
+def test_a_tweet_is_claimed_once(sqlite_session):
+    async def main():
+        async with sqlite_session() as session:
+            assert await claim_tweet(session, 1, make_tweet(1)) is not None
+            assert await claim_tweet(session, 2, make_tweet(1)) is None
+            assert await get_claimed_hashes(session, [HASH]) == {HASH}
+
+    asyncio.run(main())
+
+
+def test_stored_tweets_stay_claimable(sqlite_session):
+    async def main():
+        async with sqlite_session() as session:
+            tweets = [make_tweet(1), make_tweet(2)]
+            ids = await bulk_upsert_tweets(session, 1, tweets)
+            assert await get_claimed_hashes(session, ids) == set()
+            assert await get_seen_tweet_keys(session, 1) == []
+
+            claimed = await claim_tweet(session, 2, make_tweet(1, likes=5))
+            assert claimed == ids[HASH]
+            assert await get_seen_tweet_keys(session, 2) == ["/alice/status/1", HASH]
+
+            # Refreshing the counts leaves the claim alone.
+            await bulk_upsert_tweets(session, 1, tweets)
+            assert await claim_tweet(session, 1, make_tweet(1)) is None
+
+    asyncio.run(main())
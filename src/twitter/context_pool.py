@@ -0,0 +1,258 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from logging import Logger
+from typing import AsyncIterator
+
+from playwright.async_api import (
+    Browser,
+    BrowserContext,
+    Page,
+    Playwright,
+    async_playwright,
+)
+
+from src.twitter.request_profiles import (
+    FULL_PROFILE,
+    RequestProfile,
+    RequestStats,
+    install_request_profile,
+)
+from src.twitter.twitter_portal import BaseService
+
+
+@dataclass
+class PooledContext:
+    bot_id: int
+    context: BrowserContext
+    page: Page
+    request_stats: RequestStats
+    created_at: float = field(default_factory=time.monotonic)
+    last_used: float = field(default_factory=time.monotonic)
+    in_use: bool = False
+    pooled: bool = True
+
+
+@dataclass
+class PoolStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    recycled: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class BrowserContextPool:
+    """
+    Long-lived Chromium with warm, per-bot browser contexts.
+
+    Contexts are keyed by bot id and keep their cookies, cache and an open
+    page between leases, so repeated runs of the same bot skip the browser
+    launch and the login flow. Contexts idle for longer than *idle_timeout*
+    are closed by a background sweep, and contexts older than *max_age* are
+    recycled on the next lease to bound memory growth.
+    """
+
+    def __init__(
+        self,
+        logger: Logger,
+        max_contexts: int = 8,
+        idle_timeout: float = 600.0,
+        max_age: float = 3600.0,
+        headless: bool = True,
+        request_profile: RequestProfile = FULL_PROFILE,
+    ):
+        self.logger = logger
+        self.max_contexts = max_contexts
+        self.idle_timeout = idle_timeout
+        self.max_age = max_age
+        self.headless = headless
+        self.request_profile = request_profile
+        self.stats = PoolStats()
+
+        self.playwright: Playwright | None = None
+        self.browser: Browser | None = None
+        self._entries: dict[int, PooledContext] = {}
+        # Bots whose pooled context is being opened.
+        self._opening: set[int] = set()
+        self._lock = asyncio.Lock()
+        self._sweeper: asyncio.Task | None = None
+
+    async def __aenter__(self):
+        self.playwright = await async_playwright().start()
+        self.browser = await BaseService.launch_browser(self.playwright, self.headless)
+        self._sweeper = asyncio.create_task(self._sweep_forever())
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if self._sweeper:
+            self._sweeper.cancel()
+        for entry in list(self._entries.values()):
+            await self._close(entry)
+        await self.browser.close()
+        await self.playwright.stop()
+        self.logger.info(
+            "Context pool closed: %s hits, %s misses (%.0f%% hit rate)",
+            self.stats.hits,
+            self.stats.misses,
+            self.stats.hit_rate * 100,
+        )
+
+    def _detach(self, entry: PooledContext) -> None:
+        if self._entries.get(entry.bot_id) is entry:
+            del self._entries[entry.bot_id]
+
+    async def _close(self, entry: PooledContext) -> None:
+        self._detach(entry)
+        await entry.context.close()
+
+    async def _open(self, bot_id: int, session: dict | None) -> PooledContext:
+        context = await BaseService.new_context(self.browser, session)
+        request_stats = await install_request_profile(context, self.request_profile)
+        page = await context.new_page()
+        return PooledContext(
+            bot_id=bot_id, context=context, page=page, request_stats=request_stats
+        )
+
+    def _make_room(self, closing: list[PooledContext]) -> bool:
+        # Contexts being opened hold their slot already.
+        if len(self._entries) + len(self._opening) < self.max_contexts:
+            return True
+        idle = [e for e in self._entries.values() if not e.in_use]
+        if not idle:
+            return False
+        lru = min(idle, key=lambda e: e.last_used)
+        self.stats.evictions += 1
+        self._detach(lru)
+        closing.append(lru)
+        return True
+
+    async def acquire(self, bot_id: int, session: dict | None) -> PooledContext:
+        """
+        Hand out the warm context of *bot_id*, opening one on a miss.
+
+        The lock only covers the bookkeeping: a slot is reserved for the bot
+        under it, and contexts are opened and closed outside it, so a warm
+        hit never waits behind another bot's cold open.
+
+        Parameters
+        ----------
+        bot_id : int
+        session : dict | None
+            Storage state used when a new context has to be opened.
+        Returns
+        -------
+        PooledContext
+        """
+        closing: list[PooledContext] = []
+        async with self._lock:
+            entry = self._entries.get(bot_id)
+            if entry and not entry.in_use:
+                if time.monotonic() - entry.created_at > self.max_age:
+                    self.stats.recycled += 1
+                    self._detach(entry)
+                    closing.append(entry)
+                else:
+                    self.stats.hits += 1
+                    entry.in_use = True
+                    return entry
+
+            self.stats.misses += 1
+            # Same bot already leased (or being opened), or pool full of busy
+            # contexts: serve a throwaway context that is closed on release.
+            pooled = (
+                bot_id not in self._entries
+                and bot_id not in self._opening
+                and self._make_room(closing)
+            )
+            if pooled:
+                self._opening.add(bot_id)
+
+        try:
+            for old in closing:
+                await old.context.close()
+            entry = await self._open(bot_id, session)
+        finally:
+            if pooled:
+                self._opening.discard(bot_id)
+        entry.in_use = True
+        if pooled:
+            self._entries[bot_id] = entry
+        else:
+            entry.pooled = False
+        return entry
+
+    async def release(self, entry: PooledContext, discard: bool = False) -> None:
+        """
+        Take a context back into the pool.
+
+        Parameters
+        ----------
+        entry : PooledContext
+        discard : bool
+            Close the context instead of keeping it warm, e.g. after an error
+            left the page in an unknown state.
+        """
+        async with self._lock:
+            entry.in_use = False
+            entry.last_used = time.monotonic()
+            close = discard or not entry.pooled
+            if close:
+                self._detach(entry)
+        if close:
+            await entry.context.close()
+
+    @asynccontextmanager
+    async def lease(
+        self, bot_id: int, session: dict | None
+    ) -> AsyncIterator[PooledContext]:
+        """
+        Acquire a context for the duration of an ``async with`` block.
+
+        Parameters
+        ----------
+        bot_id : int
+        session : dict | None
+        """
+        entry = await self.acquire(bot_id, session)
+        try:
+            yield entry
+        except BaseException:
+            await self.release(entry, discard=True)
+            raise
+        await self.release(entry)
+
+    async def evict_idle(self) -> int:
+        """
+        Close contexts that have not been leased for *idle_timeout* seconds.
+
+        Returns
+        -------
+        int
+            Number of contexts closed.
+        """
+        now = time.monotonic()
+        async with self._lock:
+            stale = [
+                e
+                for e in self._entries.values()
+                if not e.in_use and now - e.last_used > self.idle_timeout
+            ]
+            for entry in stale:
+                self.stats.evictions += 1
+                self._detach(entry)
+        for entry in stale:
+            await entry.context.close()
+        return len(stale)
+
+    async def _sweep_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self.idle_timeout / 2)
+            evicted = await self.evict_idle()
+            if evicted:
+                self.logger.info("Evicted %s idle browser contexts", evicted)
@@ -0,0 +1,192 @@
+import asyncio
+import random
+import statistics
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field, replace
+from functools import wraps
+from typing import Awaitable, Callable, Mapping
+
+from playwright.async_api import TimeoutError
+
+from src.settings import settings
+from src.utils.metrics import span
+from src.utils.portal_utils import FAST_TYPING, HUMAN_TYPING, TypingProfile
+
+
+@dataclass(frozen=True)
+class PacingProfile:
+    """
+    Humanizing delays of a bot, as ``(min, max)`` milliseconds per step.
+
+    Steps are named ``<portal method>.<moment>``. *speed* scales every delay
+    (``0`` disables them); readiness waits are never scaled. *typing* is
+    the keystroke timing `human_type` uses for the bot's input.
+    """
+
+    delays: Mapping[str, tuple[float, float]]
+    speed: float = 1.0
+    typing: TypingProfile = HUMAN_TYPING
+
+
+HUMAN_PACING = PacingProfile(
+    {
+        "login.typed": (1500, 2500),
+        "get_following_tweets_page.tab": (300, 900),
+        "iter_home_timeline.card": (300, 1200),
+        "iter_home_timeline.scroll": (400, 1200),
+        "click_like.read": (1500, 3000),
+        "click_like.after": (200, 500),
+        "reply_to_tweet.typed": (300, 700),
+        "reply_to_tweet.after": (300, 800),
+        "click_retweet.menu": (400, 900),
+        "click_retweet.after": (200, 500),
+    }
+)
+# Local fixtures and low-risk accounts.
+FAST_PACING = replace(HUMAN_PACING, speed=0.1, typing=FAST_TYPING)
+
+PACING_PROFILES: dict[str, PacingProfile] = {
+    "human": HUMAN_PACING,
+    "fast": FAST_PACING,
+}
+
+
+@dataclass
+class MethodTiming:
+    calls: int = 0
+    wall: float = 0.0
+    ready: float = 0.0
+    delay: float = 0.0
+    ready_timeouts: int = 0
+    # Wall time of each call, for latency percentiles.
+    samples: list[float] = field(default_factory=list)
+
+    @property
+    def other(self) -> float:
+        return max(self.wall - self.ready - self.delay, 0.0)
+
+    def percentiles(self, *qs: int) -> list[float]:
+        """
+        Per-call wall time percentiles, in seconds.
+
+        Parameters
+        ----------
+        *qs : int
+            Percentiles between 1 and 99.
+        Returns
+        -------
+        list[float]
+        """
+        if len(self.samples) < 2:
+            return [self.samples[0] if self.samples else 0.0 for _ in qs]
+        cuts = statistics.quantiles(self.samples, n=100, method="inclusive")
+        return [cuts[q - 1] for q in qs]
+
+
+class Pacer:
+    """
+    Separates the two kinds of waiting a portal does.
+
+    `ready` awaits an event (a selector, a state change) and returns as soon
+    as the page is ready; `delay` sleeps a humanizing pause drawn from the
+    bot's `PacingProfile`. Both are timed per portal method, together with
+    the wall time of methods decorated with `paced`.
+
+    Parameters
+    ----------
+    profile : PacingProfile
+    speed : float | None
+        Global factor on top of ``profile.speed``; defaults to the
+        ``PACING_SPEED`` setting.
+    rng : random.Random | None
+    """
+
+    def __init__(
+        self,
+        profile: PacingProfile = HUMAN_PACING,
+        speed: float | None = None,
+        rng: random.Random | None = None,
+    ):
+        self.profile = profile
+        self.speed = profile.speed * (settings.pacing_speed if speed is None else speed)
+        self.rng = rng or random.Random()
+        self.timings: defaultdict[str, MethodTiming] = defaultdict(MethodTiming)
+
+    @staticmethod
+    def _method(step: str) -> str:
+        return step.split(".", 1)[0]
+
+    async def delay(self, step: str) -> None:
+        """
+        Sleep the humanizing delay configured for *step*.
+
+        Parameters
+        ----------
+        step : str
+        """
+        low, high = self.profile.delays[step]
+        seconds = self.rng.uniform(low, high) * self.speed / 1000
+        self.timings[self._method(step)].delay += seconds
+        if seconds > 0:
+            await asyncio.sleep(seconds)
+
+    async def ready(
+        self, step: str, condition: Awaitable, optional: bool = False
+    ) -> bool:
+        """
+        Await a readiness *condition* (e.g. ``locator.wait_for()``).
+
+        Parameters
+        ----------
+        step : str
+        condition : Awaitable
+        optional : bool
+            Swallow a Playwright timeout and carry on instead of raising.
+        Returns
+        -------
+        bool
+            ``False`` if an optional condition timed out.
+        """
+        timing = self.timings[self._method(step)]
+        start = time.perf_counter()
+        try:
+            await condition
+            return True
+        except TimeoutError:
+            timing.ready_timeouts += 1
+            if not optional:
+                raise
+            return False
+        finally:
+            timing.ready += time.perf_counter() - start
+
+    def summary(self) -> str:
+        return "; ".join(
+            f"{name}: {t.calls} calls, {t.wall:.1f} s wall, {t.ready:.1f} s ready, "
+            f"{t.delay:.1f} s delay, {t.other:.1f} s other"
+            for name, t in sorted(self.timings.items())
+        )
+
+
+def paced(fn: Callable[..., Awaitable]) -> Callable[..., Awaitable]:
+    """
+    Record calls and wall time of a portal method on ``self.pacer``, and as
+    a ``portal.<method>`` metrics span.
+    """
+    name = f"portal.{fn.__name__}"
+
+    @wraps(fn)
+    async def wrapper(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            with span(name):
+                return await fn(self, *args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            timing = self.pacer.timings[fn.__name__]
+            timing.calls += 1
+            timing.wall += elapsed
+            timing.samples.append(elapsed)
+
+    return wrapper
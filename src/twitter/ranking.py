@@ -0,0 +1,417 @@
+import heapq
+import itertools
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Callable, Iterable, Mapping, NamedTuple, Sequence
+
+from src.twitter.tweets import Tweet
+
+if TYPE_CHECKING:
+    import numpy as np
+
+Scorer = Callable[[Tweet], float]
+
+
+@dataclass(frozen=True)
+class RankingWeights:
+    """
+    Weights of the terms summed into a tweet's engagement score.
+
+    Attributes
+    ----------
+    likes, retweets, replies : float
+        Per raw count.
+    engagement_rate : float
+        Per unit of ``(likes + retweets + replies) / views``; tweets without
+        a view count get no rate term.
+    reply_ratio : float
+        Per unit of ``replies / (likes + retweets + 1)`` -- conversation
+        rather than passive approval.
+    half_life_hours : float | None
+        The score halves every *half_life_hours* since the tweet was posted.
+        ``None`` disables decay; tweets without ``posted_at`` never decay.
+    author_penalty : float
+        When picking the top K, an author's n-th tweet (0-based) is scaled by
+        ``(1 - author_penalty) ** n``, so one account can't fill every slot.
+    """
+
+    likes: float = 1.0
+    retweets: float = 2.0
+    replies: float = 0.0
+    engagement_rate: float = 0.0
+    reply_ratio: float = 0.0
+    half_life_hours: float | None = None
+    author_penalty: float = 0.0
+
+
+# Same ordering as `Tweet.viral_score`.
+VIRAL_WEIGHTS = RankingWeights()
+
+ENGAGEMENT_WEIGHTS = RankingWeights(
+    likes=1.0,
+    retweets=2.0,
+    replies=1.0,
+    engagement_rate=20_000.0,
+    reply_ratio=500.0,
+    half_life_hours=12.0,
+    author_penalty=0.5,
+)
+
+
+class RankedTweet(NamedTuple):
+    score: float
+    tweet: Tweet
+
+
+def _age_hours(posted_at: datetime | None, now: datetime) -> float | None:
+    if posted_at is None:
+        return None
+    if posted_at.tzinfo is None:
+        # Database timestamps are naive UTC.
+        posted_at = posted_at.replace(tzinfo=timezone.utc)
+    return max((now - posted_at).total_seconds() / 3600, 0.0)
+
+
+def score_tweet(
+    tweet: Tweet, weights: RankingWeights = VIRAL_WEIGHTS, now: datetime | None = None
+) -> float:
+    """
+    Weighted engagement score of a single tweet.
+
+    Parameters
+    ----------
+    tweet : Tweet
+    weights : RankingWeights
+    now : datetime | None
+        Reference time for recency decay; defaults to the current UTC time.
+    Returns
+    -------
+    float
+    """
+    w = weights
+    score = (
+        w.likes * tweet.likes + w.retweets * tweet.retweets + w.replies * tweet.replies
+    )
+    if w.engagement_rate and tweet.views:
+        engagements = tweet.likes + tweet.retweets + tweet.replies
+        score += w.engagement_rate * engagements / tweet.views
+    if w.reply_ratio:
+        score += w.reply_ratio * tweet.replies / (tweet.likes + tweet.retweets + 1)
+    if w.half_life_hours:
+        age = _age_hours(tweet.posted_at, now or datetime.now(timezone.utc))
+        if age is not None:
+            score *= 0.5 ** (age / w.half_life_hours)
+    return score
+
+
+def make_scorer(weights: RankingWeights, now: datetime | None = None) -> Scorer:
+    """
+    Bind *weights* and a fixed reference time into a `Scorer`.
+
+    Parameters
+    ----------
+    weights : RankingWeights
+    now : datetime | None
+    Returns
+    -------
+    Scorer
+    """
+    now = now or datetime.now(timezone.utc)
+    return lambda tweet: score_tweet(tweet, weights, now)
+
+
+class TopK:
+    """
+    Incremental `top_k`: feed tweets as they arrive, read the ranking any time.
+
+    Keeps only a size-*k* heap -- one per author when
+    ``weights.author_penalty`` is set. Ties go to the tweet seen first.
+
+    Parameters
+    ----------
+    k : int
+    weights : RankingWeights
+    scorer : Scorer | None
+        Custom scoring function; defaults to ``make_scorer(weights, now)``.
+        ``weights.author_penalty`` still applies.
+    now : datetime | None
+    """
+
+    def __init__(
+        self,
+        k: int,
+        weights: RankingWeights = VIRAL_WEIGHTS,
+        *,
+        scorer: Scorer | None = None,
+        now: datetime | None = None,
+    ):
+        self.k = k
+        self.penalty = weights.author_penalty
+        self.scorer = scorer or make_scorer(weights, now)
+        self.seen = 0
+        self._heaps: dict[str, list[tuple[float, int, Tweet]]] = {}
+
+    def extend(self, tweets: Iterable[Tweet]) -> None:
+        k, penalty, scorer, heaps = self.k, self.penalty, self.scorer, self._heaps
+        if k <= 0:
+            return
+        # Entries are (score, -seq, tweet): on equal scores the later tweet is
+        # the smaller entry and gets evicted first.
+        for seq, tweet in enumerate(tweets, start=self.seen):
+            heap = heaps.setdefault(tweet.author if penalty else "", [])
+            score = scorer(tweet)
+            if len(heap) < k:
+                heapq.heappush(heap, (score, -seq, tweet))
+            elif score > heap[0][0]:
+                heapq.heapreplace(heap, (score, -seq, tweet))
+            self.seen = seq + 1
+
+    def push(self, tweet: Tweet) -> None:
+        self.extend((tweet,))
+
+    def result(self) -> list[RankedTweet]:
+        """The best *k* tweets so far, highest (penalized) score first."""
+        penalty = self.penalty
+        candidates = itertools.chain.from_iterable(
+            (
+                (score * (1 - penalty) ** n, neg_seq, tweet)
+                for n, (score, neg_seq, tweet) in enumerate(
+                    sorted(heap, key=lambda e: e[:2], reverse=True)
+                )
+            )
+            for heap in self._heaps.values()
+        )
+        best = heapq.nlargest(self.k, candidates, key=lambda e: e[:2])
+        return [RankedTweet(score, tweet) for score, _, tweet in best]
+
+
+def top_k(
+    tweets: Iterable[Tweet],
+    k: int,
+    weights: RankingWeights = VIRAL_WEIGHTS,
+    *,
+    scorer: Scorer | None = None,
+    now: datetime | None = None,
+) -> list[RankedTweet]:
+    """
+    Best *k* tweets of a stream, highest score first.
+
+    Consumes *tweets* lazily (e.g. `TwitterPortal.iter_home_timeline`)
+    through a `TopK`.
+
+    Parameters
+    ----------
+    tweets : Iterable[Tweet]
+    k : int
+    weights : RankingWeights
+    scorer : Scorer | None
+        Custom scoring function; defaults to ``make_scorer(weights, now)``.
+        ``weights.author_penalty`` still applies.
+    now : datetime | None
+    Returns
+    -------
+    list[RankedTweet]
+    """
+    ranker = TopK(k, weights, scorer=scorer, now=now)
+    ranker.extend(tweets)
+    return ranker.result()
+
+
+def require_numpy():
+    """
+    Import numpy for the vectorized code paths.
+
+    numpy is an optional dependency (the ``fast`` extra); the pure-Python
+    `top_k` and `Tweet` paths work without it.
+
+    Returns
+    -------
+    module
+    """
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError(
+            "This needs numpy: install the `fast` extra "
+            "(`uv sync --extra fast`), or use `top_k` instead."
+        ) from e
+    return numpy
+
+
+def score_arrays(
+    likes: Sequence[float],
+    retweets: Sequence[float],
+    replies: Sequence[float],
+    views: Sequence[float],
+    age_hours: Sequence[float] | None = None,
+    weights: RankingWeights = VIRAL_WEIGHTS,
+) -> "np.ndarray":
+    """
+    Vectorized `score_tweet` over column arrays (requires numpy).
+
+    Parameters
+    ----------
+    likes, retweets, replies, views : Sequence[float]
+    age_hours : Sequence[float] | None
+        Hours since posting; NaN means unknown (no decay).
+    weights : RankingWeights
+    Returns
+    -------
+    np.ndarray
+    """
+    np = require_numpy()
+    w = weights
+    likes, retweets, replies, views = (
+        np.asarray(col, dtype=np.float64) for col in (likes, retweets, replies, views)
+    )
+    score = w.likes * likes + w.retweets * retweets + w.replies * replies
+    if w.engagement_rate:
+        engagements = likes + retweets + replies
+        rate = np.divide(engagements, views, out=np.zeros_like(views), where=views > 0)
+        score += w.engagement_rate * rate
+    if w.reply_ratio:
+        score += w.reply_ratio * replies / (likes + retweets + 1)
+    if w.half_life_hours and age_hours is not None:
+        age = np.asarray(age_hours, dtype=np.float64)
+        age = np.nan_to_num(np.maximum(age, 0.0), nan=0.0)
+        score *= np.exp2(-age / w.half_life_hours)
+    return score
+
+
+def penalize_authors(
+    scores: Sequence[float], authors: Sequence[str], author_penalty: float
+) -> "np.ndarray":
+    """
+    Scale each author's n-th best score by ``(1 - author_penalty) ** n``
+    (requires numpy). See `RankingWeights.author_penalty`.
+
+    Parameters
+    ----------
+    scores : Sequence[float]
+    authors : Sequence[str]
+    author_penalty : float
+    Returns
+    -------
+    np.ndarray
+    """
+    np = require_numpy()
+    scores = np.asarray(scores, dtype=np.float64)
+    if not author_penalty or not len(scores):
+        return scores
+
+    codes = np.unique(np.asarray(authors), return_inverse=True)[1]
+    # Group by author, best first, and number each author's tweets 0, 1, ...
+    order = np.lexsort((-scores, codes))
+    new_group = np.r_[True, np.diff(codes[order]) != 0]
+    group_start = np.maximum.accumulate(np.where(new_group, np.arange(len(order)), 0))
+    nth = np.empty(len(order), dtype=np.float64)
+    nth[order] = np.arange(len(order)) - group_start
+    return scores * (1 - author_penalty) ** nth
+
+
+def top_k_indices(scores: Sequence[float], k: int) -> "np.ndarray":
+    """
+    Indices of the *k* best scores, highest first (requires numpy).
+
+    Uses ``argpartition``, so only the *k* winners are sorted.
+
+    Parameters
+    ----------
+    scores : Sequence[float]
+    k : int
+    Returns
+    -------
+    np.ndarray
+    """
+    np = require_numpy()
+    scores = np.asarray(scores, dtype=np.float64)
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    idx = np.argpartition(-scores, k - 1)[:k]
+    return idx[np.argsort(-scores[idx], kind="stable")]
+
+
+def rank_batch(
+    tweets: Sequence[Tweet],
+    k: int,
+    weights: RankingWeights = VIRAL_WEIGHTS,
+    now: datetime | None = None,
+) -> list[RankedTweet]:
+    """
+    `top_k` for a large in-memory batch, scored in one numpy pass.
+
+    Parameters
+    ----------
+    tweets : Sequence[Tweet]
+    k : int
+    weights : RankingWeights
+    now : datetime | None
+    Returns
+    -------
+    list[RankedTweet]
+    """
+    np = require_numpy()
+    now = now or datetime.now(timezone.utc)
+    ages = None
+    if weights.half_life_hours:
+        ages = [_age_hours(t.posted_at, now) for t in tweets]
+        ages = np.array([np.nan if a is None else a for a in ages])
+    scores = score_arrays(
+        [t.likes for t in tweets],
+        [t.retweets for t in tweets],
+        [t.replies for t in tweets],
+        [t.views for t in tweets],
+        ages,
+        weights,
+    )
+    if weights.author_penalty:
+        authors = [t.author for t in tweets]
+        scores = penalize_authors(scores, authors, weights.author_penalty)
+    idx = top_k_indices(scores, k)
+    return [RankedTweet(float(scores[i]), tweets[i]) for i in idx]
+
+
+def rank_rows(
+    columns: Mapping[str, Sequence],
+    k: int,
+    weights: RankingWeights = VIRAL_WEIGHTS,
+    now: datetime | None = None,
+) -> list[tuple[int, float]]:
+    """
+    Rank stored tweets from `get_tweet_columns` in one numpy pass.
+
+    The ``tweets`` table keeps no reply counts, so reply terms are zero, and
+    the row's ``created_at`` stands in for the posting time.
+
+    Parameters
+    ----------
+    columns : Mapping[str, Sequence]
+        ``id``, ``author``, ``likes``, ``retweets``, ``views``, ``created_at``.
+    k : int
+    weights : RankingWeights
+    now : datetime | None
+    Returns
+    -------
+    list[tuple[int, float]]
+        ``(tweet id, score)`` pairs, best first.
+    """
+    np = require_numpy()
+    ages = None
+    if weights.half_life_hours:
+        now = now or datetime.now(timezone.utc)
+        if now.tzinfo is not None:
+            now = now.astimezone(timezone.utc).replace(tzinfo=None)
+        created = np.asarray(columns["created_at"], dtype="datetime64[us]")
+        ages = (np.datetime64(now, "us") - created) / np.timedelta64(1, "h")
+    scores = score_arrays(
+        columns["likes"],
+        columns["retweets"],
+        np.zeros(len(columns["id"])),
+        columns["views"],
+        ages,
+        weights,
+    )
+    scores = penalize_authors(scores, columns["author"], weights.author_penalty)
+    idx = top_k_indices(scores, k)
+    return [(int(columns["id"][i]), float(scores[i])) for i in idx]
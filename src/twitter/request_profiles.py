@@ -0,0 +1,194 @@
+import re
+from dataclasses import dataclass, field
+
+from playwright.async_api import BrowserContext, Request, Route
+
+
+def _compile(patterns: tuple[str, ...]) -> re.Pattern | None:
+    return re.compile("|".join(patterns)) if patterns else None
+
+
+@dataclass(frozen=True)
+class RequestProfile:
+    """
+    Which requests a scraping context is allowed to make.
+
+    Requests matching *allowed_url_patterns* always go through. Otherwise a
+    request is aborted if its resource type is in *blocked_resource_types* or
+    its URL matches *blocked_url_patterns*, and answered with an empty 204 if
+    it matches *stubbed_url_patterns* (for scripts whose failure would break
+    the page but whose work we don't need).
+    """
+
+    name: str
+    blocked_resource_types: frozenset[str] = frozenset()
+    blocked_url_patterns: tuple[str, ...] = ()
+    stubbed_url_patterns: tuple[str, ...] = ()
+    allowed_url_patterns: tuple[str, ...] = ()
+
+    def __post_init__(self):
+        object.__setattr__(self, "_blocked", _compile(self.blocked_url_patterns))
+        object.__setattr__(self, "_stubbed", _compile(self.stubbed_url_patterns))
+        object.__setattr__(self, "_allowed", _compile(self.allowed_url_patterns))
+
+    @property
+    def intercepts(self) -> bool:
+        return bool(
+            self.blocked_resource_types
+            or self.blocked_url_patterns
+            or self.stubbed_url_patterns
+        )
+
+    def decide(self, resource_type: str, url: str) -> str:
+        """
+        Return ``"allow"``, ``"block"`` or ``"stub"`` for a request.
+
+        Parameters
+        ----------
+        resource_type : str
+        url : str
+        Returns
+        -------
+        str
+        """
+        if self._allowed and self._allowed.search(url):
+            return "allow"
+        if resource_type in self.blocked_resource_types:
+            return "block"
+        if self._blocked and self._blocked.search(url):
+            return "block"
+        if self._stubbed and self._stubbed.search(url):
+            return "stub"
+        return "allow"
+
+
+FULL_PROFILE = RequestProfile(name="full")
+
+# Enough to log in, read tweet text/counts and click the action buttons: the
+# buttons are inline SVG, so images, video and fonts can go. The login flow
+# (including the Arkose challenge) is always let through.
+LIGHT_PROFILE = RequestProfile(
+    name="light",
+    blocked_resource_types=frozenset({"image", "media", "font"}),
+    blocked_url_patterns=(
+        r"video\.twimg\.com",
+        r"google-analytics\.com",
+        r"googletagmanager\.com",
+        r"ads-twitter\.com",
+        r"ads-api\.x\.com",
+    ),
+    stubbed_url_patterns=(
+        r"/1\.1/jot/",
+        r"/i/api/1\.1/jot/",
+        r"/client_event\.json",
+        r"/i/api/1\.1/keyregistry",
+    ),
+    allowed_url_patterns=(
+        r"/i/flow/",
+        r"/onboarding/",
+        r"arkoselabs\.com",
+    ),
+)
+
+REQUEST_PROFILES = {p.name: p for p in (FULL_PROFILE, LIGHT_PROFILE)}
+
+
+@dataclass
+class RequestStats:
+    """
+    Traffic counters for one browser context.
+
+    ``bytes_saved`` is an estimate: every blocked request is costed at the
+    average size seen for its resource type in this context, or in
+    *baseline_sizes* (e.g. taken from a run with `FULL_PROFILE`).
+    """
+
+    profile: str
+    requests: int = 0
+    blocked: int = 0
+    stubbed: int = 0
+    bytes_received: int = 0
+    page_loads: list[float] = field(default_factory=list)
+    blocked_by_type: dict[str, int] = field(default_factory=dict)
+    bytes_by_type: dict[str, int] = field(default_factory=dict)
+    count_by_type: dict[str, int] = field(default_factory=dict)
+    baseline_sizes: dict[str, float] = field(default_factory=dict)
+
+    def average_size(self, resource_type: str) -> float:
+        count = self.count_by_type.get(resource_type)
+        if count:
+            return self.bytes_by_type[resource_type] / count
+        return self.baseline_sizes.get(resource_type, 0.0)
+
+    @property
+    def bytes_saved(self) -> int:
+        return int(
+            sum(n * self.average_size(t) for t, n in self.blocked_by_type.items())
+        )
+
+    def record_page_load(self, seconds: float) -> None:
+        self.page_loads.append(seconds)
+
+    def summary(self) -> dict:
+        loads = self.page_loads
+        return {
+            "profile": self.profile,
+            "requests": self.requests,
+            "blocked": self.blocked,
+            "stubbed": self.stubbed,
+            "bytes_received": self.bytes_received,
+            "bytes_saved": self.bytes_saved,
+            "page_loads": len(loads),
+            "avg_page_load_s": round(sum(loads) / len(loads), 3) if loads else None,
+        }
+
+
+async def install_request_profile(
+    context: BrowserContext, profile: RequestProfile
+) -> RequestStats:
+    """
+    Apply *profile* to every page of *context* and start counting traffic.
+
+    Parameters
+    ----------
+    context : BrowserContext
+    profile : RequestProfile
+    Returns
+    -------
+    RequestStats
+    """
+    stats = RequestStats(profile=profile.name)
+
+    async def handle(route: Route) -> None:
+        request = route.request
+        decision = profile.decide(request.resource_type, request.url)
+        if decision == "block":
+            stats.blocked += 1
+            rtype = request.resource_type
+            stats.blocked_by_type[rtype] = stats.blocked_by_type.get(rtype, 0) + 1
+            await route.abort("blockedbyclient")
+        elif decision == "stub":
+            stats.stubbed += 1
+            await route.fulfill(status=204, body="")
+        else:
+            await route.fallback()
+
+    async def on_finished(request: Request) -> None:
+        try:
+            sizes = await request.sizes()
+        except Exception:
+            return
+        size = sizes["responseBodySize"] + sizes["responseHeadersSize"]
+        rtype = request.resource_type
+        stats.bytes_received += size
+        stats.bytes_by_type[rtype] = stats.bytes_by_type.get(rtype, 0) + size
+        stats.count_by_type[rtype] = stats.count_by_type.get(rtype, 0) + 1
+
+    def on_request(request: Request) -> None:
+        stats.requests += 1
+
+    if profile.intercepts:
+        await context.route("**/*", handle)
+    context.on("request", on_request)
+    context.on("requestfinished", on_finished)
+    return stats
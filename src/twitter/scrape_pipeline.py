@@ -0,0 +1,152 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from logging import Logger
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.twitter.ranking import VIRAL_WEIGHTS, RankedTweet, RankingWeights, TopK
+from src.twitter.tweets import Tweet, compute_tweet_hash
+from src.twitter.tweets_crud import bulk_upsert_tweets, get_claimed_hashes
+from src.twitter.twitter_portal import ScrapeCheckpoint, TwitterPortal
+
+# Marks the end of the timeline on the queue.
+_DONE = None
+
+
+@dataclass
+class PipelineStats:
+    scraped: int = 0
+    # Distinct tweets written by `bulk_upsert_tweets` (new or refreshed).
+    stored: int = 0
+    already_claimed: int = 0
+    batches: int = 0
+    resumes: int = 0
+    # Time the scraper spent waiting for room on the queue (backpressure).
+    blocked: float = 0.0
+
+    def summary(self) -> str:
+        return (
+            f"{self.scraped} scraped, {self.stored} stored, "
+            f"{self.already_claimed} already acted on, "
+            f"{self.batches} batches, {self.resumes} resumes, "
+            f"{self.blocked:.1f} s backpressure"
+        )
+
+
+class ScrapePipeline:
+    """
+    Streams the home timeline into ranking while it is being scrolled.
+
+    A producer task feeds scraped tweets into a bounded ``asyncio.Queue``
+    (`TwitterPortal.feed_home_timeline`); the consumer drains it in batches,
+    stores each batch (`bulk_upsert_tweets`), drops tweets any bot has
+    already acted on and keeps the rest in a `TopK`. When the database falls
+    behind, the queue fills up and scrolling pauses instead of buffering
+    tweets. A failed scroll is retried from a `ScrapeCheckpoint`, so tweets
+    already queued are kept.
+
+    Parameters
+    ----------
+    logger : Logger
+    portal : TwitterPortal
+    bot_id : int
+        Recorded as the bot that stored newly scraped tweets.
+    session : AsyncSession
+        Used by the consumer only; nothing else may use it during `run`.
+    maxsize : int
+        Queue capacity, in tweets.
+    batch_size : int
+        Most tweets stored and checked against the database at once.
+    """
+
+    def __init__(
+        self,
+        logger: Logger,
+        portal: TwitterPortal,
+        bot_id: int,
+        session: AsyncSession,
+        maxsize: int = 32,
+        batch_size: int = 16,
+    ):
+        self.logger = logger
+        self.portal = portal
+        self.bot_id = bot_id
+        self.session = session
+        self.maxsize = maxsize
+        self.batch_size = batch_size
+        self.stats = PipelineStats()
+
+    async def run(
+        self,
+        max_tweets: int | None,
+        k: int,
+        weights: RankingWeights = VIRAL_WEIGHTS,
+    ) -> list[RankedTweet]:
+        """
+        Scrape up to *max_tweets* tweets and rank the ones not acted on yet.
+
+        Parameters
+        ----------
+        max_tweets : int | None
+        k : int
+        weights : RankingWeights
+        Returns
+        -------
+        list[RankedTweet]
+            The best *k* new tweets, highest score first.
+        """
+        queue: asyncio.Queue[Tweet | None] = asyncio.Queue(self.maxsize)
+        ranker = TopK(k, weights)
+        checkpoint = ScrapeCheckpoint()
+
+        producer = asyncio.create_task(self._produce(queue, max_tweets, checkpoint))
+        try:
+            await self._consume(queue, ranker)
+        except BaseException:
+            producer.cancel()
+            raise
+        finally:
+            self.stats.resumes += checkpoint.resumes
+        # Re-raises the scraper's error once the consumer has drained the queue.
+        await producer
+        return ranker.result()
+
+    async def _produce(
+        self,
+        queue: asyncio.Queue[Tweet | None],
+        max_tweets: int | None,
+        checkpoint: ScrapeCheckpoint,
+    ) -> None:
+        async def put(tweet: Tweet) -> None:
+            start = time.perf_counter()
+            await queue.put(tweet)
+            self.stats.blocked += time.perf_counter() - start
+
+        try:
+            await self.portal.feed_home_timeline(put, max_tweets, checkpoint)
+        finally:
+            # Cancelled means the consumer is gone: nobody would make room.
+            if not asyncio.current_task().cancelling():
+                await queue.put(_DONE)
+
+    async def _consume(self, queue: asyncio.Queue[Tweet | None], ranker: TopK) -> None:
+        while True:
+            batch = [await queue.get()]
+            while batch[-1] is not _DONE and len(batch) < self.batch_size:
+                if queue.empty():
+                    break
+                batch.append(queue.get_nowait())
+
+            tweets = [t for t in batch if t is not _DONE]
+            if tweets:
+                hashes = [compute_tweet_hash(t.author, t.text) for t in tweets]
+                stored = await bulk_upsert_tweets(self.session, self.bot_id, tweets)
+                claimed = await get_claimed_hashes(self.session, hashes)
+                ranker.extend(t for t, h in zip(tweets, hashes) if h not in claimed)
+                self.stats.scraped += len(tweets)
+                self.stats.stored += len(stored)
+                self.stats.already_claimed += len(claimed)
+                self.stats.batches += 1
+            if batch[-1] is _DONE:
+                return
@@ -0,0 +1,93 @@
+from collections import OrderedDict
+from typing import Iterable
+
+from src.twitter.tweets import Tweet, compute_tweet_hash
+
+
+class SeenTweets:
+    """
+    Bounded LRU set of tweets already handled during a scroll session.
+
+    Tweets are keyed on their status URL, with the author+text hash from
+    `compute_tweet_hash` as a fallback for the same tweet served under a
+    different URL (quote cards, reposts). Once *maxsize* keys are stored the
+    least recently seen ones are dropped, so long sessions stay bounded.
+    """
+
+    def __init__(self, maxsize: int = 10_000):
+        self.maxsize = maxsize
+        self._keys: OrderedDict[str, None] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _remember(self, key: str) -> None:
+        self._keys[key] = None
+        self._keys.move_to_end(key)
+        while len(self._keys) > self.maxsize:
+            self._keys.popitem(last=False)
+
+    def _lookup(self, key: str) -> bool:
+        if key not in self._keys:
+            return False
+        self._keys.move_to_end(key)
+        return True
+
+    def has_url(self, url: str) -> bool:
+        """
+        Check a status URL before paying for a full extraction.
+
+        Parameters
+        ----------
+        url : str
+        Returns
+        -------
+        bool
+        """
+        return self._lookup(url)
+
+    def __contains__(self, tweet: Tweet) -> bool:
+        return self._lookup(tweet.url) or self._lookup(
+            compute_tweet_hash(tweet.author, tweet.text)
+        )
+
+    def add(self, tweet: Tweet) -> bool:
+        """
+        Mark *tweet* as seen.
+
+        Parameters
+        ----------
+        tweet : Tweet
+        Returns
+        -------
+        bool
+            ``True`` if the tweet was new, ``False`` if it is a duplicate.
+        """
+        if tweet in self:
+            return False
+        self._remember(tweet.url)
+        self._remember(compute_tweet_hash(tweet.author, tweet.text))
+        return True
+
+    def discard(self, tweet: Tweet) -> None:
+        """
+        Forget *tweet*, e.g. when handing it over failed and a retry should
+        pick it up again.
+
+        Parameters
+        ----------
+        tweet : Tweet
+        """
+        self._keys.pop(tweet.url, None)
+        self._keys.pop(compute_tweet_hash(tweet.author, tweet.text), None)
+
+    def seed(self, keys: Iterable[str]) -> None:
+        """
+        Pre-load status URLs and/or tweet hashes, e.g. from `get_seen_tweet_keys`.
+
+        Parameters
+        ----------
+        keys : Iterable[str]
+        """
+        for key in keys:
+            self._remember(key)
@@ -0,0 +1,256 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+from logging import Logger
+from typing import Awaitable, Callable
+
+from playwright.async_api import BrowserContext
+from playwright.async_api import Error as PlaywrightError
+
+from src.utils.metrics import span
+
+# Cookies the web client needs for an authenticated session.
+AUTH_COOKIES = ("auth_token", "ct0")
+
+# Small authenticated JSON endpoint: answers 200 for a live session and 401/403
+# otherwise, without rendering (or even downloading) the home page.
+PROBE_URL = "https://x.com/i/api/1.1/account/settings.json"
+# Public bearer token the x.com web client sends with every API call.
+WEB_BEARER_TOKEN = (
+    "AAAAAAAAAAAAAAAAAAAAANRILgAAAAAAnNwIzUejRCOuH5E6I8xnZz4puTs"
+    "%3D1Zv7ttfk8LF81IUq16cHjhLTvJu4FA33AGWWjCpTnA"
+)
+
+
+class CookieState(str, Enum):
+    MISSING = "missing"
+    EXPIRED = "expired"
+    EXPIRING = "expiring"
+    VALID = "valid"
+
+
+def _auth_cookies(session_data: dict | None) -> dict[str, dict]:
+    cookies = (session_data or {}).get("cookies", [])
+    return {c["name"]: c for c in cookies if c.get("name") in AUTH_COOKIES}
+
+
+def cookie_state(
+    session_data: dict | None,
+    margin: timedelta = timedelta(hours=12),
+    now: datetime | None = None,
+) -> CookieState:
+    """
+    Judge a stored ``storage_state`` by its auth cookies alone.
+
+    Parameters
+    ----------
+    session_data : dict | None
+    margin : timedelta
+        Sessions expiring within *margin* are reported as ``EXPIRING``.
+    now : datetime | None
+    Returns
+    -------
+    CookieState
+    """
+    cookies = _auth_cookies(session_data)
+    if set(cookies) != set(AUTH_COOKIES):
+        return CookieState.MISSING
+
+    now = now or datetime.now(timezone.utc)
+    # Playwright stores expiry as a Unix timestamp; -1 marks a session cookie.
+    expiries = [c["expires"] for c in cookies.values() if c.get("expires", -1) > 0]
+    if not expiries:
+        return CookieState.VALID
+    expires_at = datetime.fromtimestamp(min(expiries), timezone.utc)
+    if expires_at <= now:
+        return CookieState.EXPIRED
+    if expires_at <= now + margin:
+        return CookieState.EXPIRING
+    return CookieState.VALID
+
+
+async def probe_session(
+    context: BrowserContext, url: str = PROBE_URL, timeout: float = 5_000
+) -> bool:
+    """
+    One authenticated API request with the context's cookies.
+
+    Parameters
+    ----------
+    context : BrowserContext
+    url : str
+    timeout : float
+        Milliseconds.
+    Returns
+    -------
+    bool
+        ``True`` when the server accepts the session.
+    """
+    cookies = {c["name"]: c["value"] for c in await context.cookies(url)}
+    if "ct0" not in cookies:
+        return False
+    response = await context.request.get(
+        url,
+        headers={
+            "authorization": f"Bearer {WEB_BEARER_TOKEN}",
+            "x-csrf-token": cookies["ct0"],
+        },
+        timeout=timeout,
+        max_redirects=0,
+    )
+    return response.ok
+
+
+@dataclass
+class HealthStats:
+    cache_hits: int = 0
+    cookie_rejects: int = 0
+    probes: int = 0
+    probe_failures: int = 0
+    refreshes: int = 0
+
+
+class SessionHealth:
+    """
+    Per-bot session validity, cached for *ttl* seconds.
+
+    `check` first looks at the auth cookies of the stored session, and only
+    probes the server (`probe_session`) when they look usable. Sessions
+    that are dead or close to expiring can be renewed with
+    `refresh_in_background`, off the bot's critical path. A run waits for
+    its bot's refresh with `wait_refresh` before using the session.
+
+    Parameters
+    ----------
+    logger : Logger
+    ttl : float
+    expiry_margin : timedelta
+        Cookie lifetime left below which a session is refreshed early.
+    """
+
+    def __init__(
+        self,
+        logger: Logger,
+        ttl: float = 600.0,
+        expiry_margin: timedelta = timedelta(hours=12),
+    ):
+        self.logger = logger
+        self.ttl = ttl
+        self.expiry_margin = expiry_margin
+        self.stats = HealthStats()
+        self._cache: dict[int, tuple[float, bool]] = {}
+        self._refreshes: dict[int, asyncio.Task] = {}
+
+    def mark(self, bot_id: int, healthy: bool) -> None:
+        self._cache[bot_id] = (time.monotonic(), healthy)
+
+    def invalidate(self, bot_id: int) -> None:
+        self._cache.pop(bot_id, None)
+
+    def cached(self, bot_id: int) -> bool | None:
+        entry = self._cache.get(bot_id)
+        if entry is None or time.monotonic() - entry[0] > self.ttl:
+            return None
+        return entry[1]
+
+    def needs_refresh(self, bot_id: int, session_data: dict | None) -> bool:
+        if self.cached(bot_id) is False:
+            return True
+        return cookie_state(session_data, self.expiry_margin) != CookieState.VALID
+
+    async def check(
+        self,
+        bot_id: int,
+        session_data: dict | None,
+        context: BrowserContext | None = None,
+    ) -> bool | None:
+        """
+        Whether *bot_id*'s session is logged in.
+
+        Parameters
+        ----------
+        bot_id : int
+        session_data : dict | None
+            The stored ``storage_state``.
+        context : BrowserContext | None
+            Context loaded with that session, used for the server probe.
+        Returns
+        -------
+        bool | None
+            ``None`` when it can't be told without loading the page: no
+            *context* to probe with, or the probe itself failed.
+        """
+        cached = self.cached(bot_id)
+        if cached is not None:
+            self.stats.cache_hits += 1
+            return cached
+
+        state = cookie_state(session_data, self.expiry_margin)
+        if state in (CookieState.MISSING, CookieState.EXPIRED):
+            self.stats.cookie_rejects += 1
+            self.logger.info("Session of bot %s: cookies %s", bot_id, state.value)
+            self.mark(bot_id, False)
+            return False
+        if context is None:
+            return None
+
+        self.stats.probes += 1
+        try:
+            with span("session.probe"):
+                healthy = await probe_session(context)
+        except PlaywrightError as e:
+            self.stats.probe_failures += 1
+            self.logger.warning("Session probe for bot %s failed: %s", bot_id, e)
+            return None
+        verdict = "ok" if healthy else "rejected"
+        self.logger.info("Session of bot %s: probe %s", bot_id, verdict)
+        self.mark(bot_id, healthy)
+        return healthy
+
+    def refresh_in_background(
+        self, bot_id: int, refresh: Callable[[], Awaitable[None]]
+    ) -> asyncio.Task:
+        """
+        Run *refresh* (a re-login that stores the new session) as a task,
+        unless one is already running for *bot_id*.
+
+        Parameters
+        ----------
+        bot_id : int
+        refresh : Callable[[], Awaitable[None]]
+        Returns
+        -------
+        asyncio.Task
+        """
+        task = self._refreshes.get(bot_id)
+        if task is not None and not task.done():
+            return task
+
+        async def _run() -> None:
+            self.stats.refreshes += 1
+            try:
+                await refresh()
+                self.mark(bot_id, True)
+                self.logger.info("Session of bot %s refreshed", bot_id)
+            except Exception:
+                self.invalidate(bot_id)
+                self.logger.exception("Refreshing session of bot %s failed", bot_id)
+
+        task = asyncio.create_task(_run())
+        self._refreshes[bot_id] = task
+        return task
+
+    async def wait_refresh(self, bot_id: int) -> bool:
+        """Wait for *bot_id*'s running refresh; ``True`` if there was one."""
+        task = self._refreshes.pop(bot_id, None)
+        if task is None:
+            return False
+        await asyncio.shield(task)
+        return True
+
+    async def aclose(self) -> None:
+        """Let running refreshes finish."""
+        await asyncio.gather(*self._refreshes.values(), return_exceptions=True)
+        self._refreshes.clear()
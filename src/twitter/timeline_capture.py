@@ -0,0 +1,151 @@
+import asyncio
+from datetime import datetime
+from logging import Logger
+from typing import Iterator
+
+from playwright.async_api import Page, Response
+
+from src.twitter.tweets import Tweet
+
+# GraphQL operation behind the "Following" tab; "/HomeTimeline" serves "For you".
+TIMELINE_OPERATIONS = ("/HomeLatestTimeline",)
+
+
+def _iter_item_contents(payload: dict) -> Iterator[dict]:
+    timeline = payload.get("data", {}).get("home", {}).get("home_timeline_urt", {})
+    for instruction in timeline.get("instructions", []):
+        entries = instruction.get("entries", [])
+        if "entry" in instruction:
+            entries = [instruction["entry"]]
+        for entry in entries:
+            content = entry.get("content", {})
+            if "itemContent" in content:
+                yield content["itemContent"]
+            for item in content.get("items", []):
+                if "itemContent" in item.get("item", {}):
+                    yield item["item"]["itemContent"]
+
+
+def _parse_created_at(raw: str | None) -> datetime | None:
+    # GraphQL timestamps look like "Thu Jul 10 08:15:00 +0000 2025".
+    try:
+        return datetime.strptime(raw, "%a %b %d %H:%M:%S %z %Y") if raw else None
+    except ValueError:
+        return None
+
+
+def _tweet_from_result(result: dict) -> Tweet | None:
+    if result.get("__typename") == "TweetWithVisibilityResults":
+        result = result.get("tweet", {})
+    legacy = result.get("legacy")
+    user = result.get("core", {}).get("user_results", {}).get("result", {})
+    if not legacy or not user or "rest_id" not in result:
+        return None
+
+    # Newer payloads moved name/screen_name from user.legacy to user.core.
+    user_core = {**user.get("legacy", {}), **user.get("core", {})}
+    note = result.get("note_tweet", {}).get("note_tweet_results", {})
+    text = note.get("result", {}).get("text") or legacy.get("full_text", "")
+
+    return Tweet(
+        author=user_core.get("name", ""),
+        text=text.strip(),
+        likes=legacy.get("favorite_count", 0),
+        retweets=legacy.get("retweet_count", 0),
+        replies=legacy.get("reply_count", 0),
+        views=int(result.get("views", {}).get("count", 0)),
+        url=f"/{user_core.get('screen_name', 'i')}/status/{result['rest_id']}",
+        posted_at=_parse_created_at(legacy.get("created_at")),
+    )
+
+
+def parse_timeline_payload(payload: dict) -> list[Tweet]:
+    """
+    Parse a HomeLatestTimeline / HomeTimeline GraphQL response into tweets.
+
+    Counts come straight from the API, so they are exact rather than the
+    rounded "1.2K" strings shown in the DOM. Cursors, promoted tweets and
+    unavailable (tombstoned) tweets are skipped.
+
+    Parameters
+    ----------
+    payload : dict
+        Decoded JSON body of the response.
+    Returns
+    -------
+    list[Tweet]
+    """
+    tweets = []
+    for item in _iter_item_contents(payload):
+        if item.get("itemType") != "TimelineTweet" or "promotedMetadata" in item:
+            continue
+        tweet = _tweet_from_result(item.get("tweet_results", {}).get("result", {}))
+        if tweet:
+            tweets.append(tweet)
+    return tweets
+
+
+class TimelineCapture:
+    """
+    Collects timeline tweets from the page's GraphQL responses as they arrive.
+    """
+
+    def __init__(
+        self, logger: Logger, operations: tuple[str, ...] = TIMELINE_OPERATIONS
+    ):
+        self.logger = logger
+        self.operations = operations
+        self.queue: asyncio.Queue[Tweet] = asyncio.Queue()
+        self.responses = 0
+        self._page: Page | None = None
+
+    def attach(self, page: Page) -> None:
+        """
+        Start listening to *page*; attach before navigating to the timeline.
+
+        Parameters
+        ----------
+        page : Page
+        """
+        self._page = page
+        page.on("response", self._on_response)
+
+    def detach(self) -> None:
+        if self._page is not None:
+            self._page.remove_listener("response", self._on_response)
+            self._page = None
+
+    async def _on_response(self, response: Response) -> None:
+        if not any(op in response.url for op in self.operations):
+            return
+        if not response.ok:
+            self.logger.warning(
+                "Timeline response %s: %s", response.status, response.url
+            )
+            return
+        try:
+            payload = await response.json()
+        except Exception:
+            self.logger.warning("Could not decode timeline response %s", response.url)
+            return
+
+        self.responses += 1
+        for tweet in parse_timeline_payload(payload):
+            self.queue.put_nowait(tweet)
+
+    async def next_tweet(self, timeout: float) -> Tweet | None:
+        """
+        Wait up to *timeout* seconds for the next captured tweet.
+
+        Parameters
+        ----------
+        timeout : float
+        Returns
+        -------
+        Tweet | None
+            ``None`` if nothing arrived in time.
+        """
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
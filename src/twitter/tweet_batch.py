@@ -0,0 +1,270 @@
+import sys
+from array import array
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Iterable, Iterator
+
+from src.twitter.ranking import (
+    VIRAL_WEIGHTS,
+    RankedTweet,
+    RankingWeights,
+    penalize_authors,
+    require_numpy,
+    score_arrays,
+    top_k_indices,
+)
+from src.twitter.tweets import Tweet
+
+if TYPE_CHECKING:
+    import numpy as np
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+# Read by numpy as NaT ("not a time") in a datetime64 column.
+_NO_TIME = -(2**63)
+
+
+def _to_micros(posted_at: datetime | None) -> int:
+    if posted_at is None:
+        return _NO_TIME
+    if posted_at.tzinfo is None:
+        # Database timestamps are naive UTC.
+        posted_at = posted_at.replace(tzinfo=timezone.utc)
+    return (posted_at - _EPOCH) // _MICROSECOND
+
+
+class TweetBatch:
+    """
+    Column store for many scraped tweets.
+
+    One `Tweet` costs a pydantic model, its ``__dict__`` and one int object
+    per count. Here the counts live in ``array('q')`` columns (8 bytes a
+    value), authors are dictionary-encoded against one interned string
+    each, and only text and URL stay per-row objects. `append` takes values
+    that are already parsed, so nothing is validated.
+
+    The columns are read as numpy arrays (`likes`, `posted_at`, ...), which
+    is what `rank` scores; numpy is needed for those only. Convert at the
+    edges with `from_tweets` and `to_tweets` / `tweet`.
+
+    ``posted_at`` is kept as UTC microseconds: `tweet` returns an aware UTC
+    datetime whatever time zone went in.
+    """
+
+    __slots__ = (
+        "texts",
+        "urls",
+        "author_names",
+        "_author_codes",
+        "_author_index",
+        "_likes",
+        "_retweets",
+        "_replies",
+        "_views",
+        "_posted_at",
+    )
+
+    def __init__(self):
+        self.texts: list[str] = []
+        self.urls: list[str] = []
+        self.author_names: list[str] = []
+        self._author_index: dict[str, int] = {}
+        self._author_codes = array("i")
+        self._likes = array("q")
+        self._retweets = array("q")
+        self._replies = array("q")
+        self._views = array("q")
+        self._posted_at = array("q")
+
+    @classmethod
+    def from_tweets(cls, tweets: Iterable[Tweet]) -> "TweetBatch":
+        """
+        Copy *tweets* into a new batch.
+
+        Parameters
+        ----------
+        tweets : Iterable[Tweet]
+        Returns
+        -------
+        TweetBatch
+        """
+        batch = cls()
+        batch.extend(tweets)
+        return batch
+
+    def __len__(self) -> int:
+        return len(self.urls)
+
+    def __iter__(self) -> Iterator[Tweet]:
+        return map(self.tweet, range(len(self)))
+
+    def append(
+        self,
+        author: str,
+        text: str,
+        likes: int,
+        retweets: int,
+        replies: int,
+        views: int,
+        url: str,
+        posted_at: datetime | None = None,
+    ) -> None:
+        """
+        Add one tweet from already parsed values (see `Tweet` for the fields).
+        """
+        code = self._author_index.get(author)
+        if code is None:
+            code = self._author_index[author] = len(self.author_names)
+            self.author_names.append(sys.intern(author))
+        self._author_codes.append(code)
+        self.texts.append(text)
+        self.urls.append(url)
+        self._likes.append(likes)
+        self._retweets.append(retweets)
+        self._replies.append(replies)
+        self._views.append(views)
+        self._posted_at.append(_to_micros(posted_at))
+
+    def extend(self, tweets: Iterable[Tweet]) -> None:
+        append = self.append
+        for t in tweets:
+            append(
+                t.author,
+                t.text,
+                t.likes,
+                t.retweets,
+                t.replies,
+                t.views,
+                t.url,
+                t.posted_at,
+            )
+
+    def author(self, i: int) -> str:
+        return self.author_names[self._author_codes[i]]
+
+    def tweet(self, i: int) -> Tweet:
+        """
+        Row *i* as a `Tweet`.
+
+        The values are already typed, which makes validating them cheaper
+        than ``Tweet.model_construct`` (pure Python in pydantic 2).
+
+        Parameters
+        ----------
+        i : int
+        Returns
+        -------
+        Tweet
+        """
+        micros = self._posted_at[i]
+        return Tweet(
+            author=self.author(i),
+            text=self.texts[i],
+            likes=self._likes[i],
+            retweets=self._retweets[i],
+            replies=self._replies[i],
+            views=self._views[i],
+            url=self.urls[i],
+            posted_at=None if micros == _NO_TIME else _EPOCH + micros * _MICROSECOND,
+        )
+
+    def to_tweets(self, indices: Iterable[int] | None = None) -> list[Tweet]:
+        """
+        Rows as `Tweet` models, e.g. for the database or the portal.
+
+        Parameters
+        ----------
+        indices : Iterable[int] | None
+            Rows to convert; all of them by default.
+        Returns
+        -------
+        list[Tweet]
+        """
+        return list(map(self.tweet, range(len(self)) if indices is None else indices))
+
+    @property
+    def author_codes(self) -> "np.ndarray":
+        """Index into `author_names` per row."""
+        return require_numpy().array(self._author_codes, dtype="int32")
+
+    @property
+    def likes(self) -> "np.ndarray":
+        return require_numpy().array(self._likes, dtype="int64")
+
+    @property
+    def retweets(self) -> "np.ndarray":
+        return require_numpy().array(self._retweets, dtype="int64")
+
+    @property
+    def replies(self) -> "np.ndarray":
+        return require_numpy().array(self._replies, dtype="int64")
+
+    @property
+    def views(self) -> "np.ndarray":
+        return require_numpy().array(self._views, dtype="int64")
+
+    @property
+    def posted_at(self) -> "np.ndarray":
+        """``datetime64[us]`` in UTC; NaT where the time is unknown."""
+        micros = require_numpy().array(self._posted_at, dtype="int64")
+        return micros.view("datetime64[us]")
+
+    def age_hours(self, now: datetime | None = None) -> "np.ndarray":
+        """
+        Hours since each tweet was posted; NaN where unknown.
+
+        Parameters
+        ----------
+        now : datetime | None
+            Defaults to the current UTC time.
+        Returns
+        -------
+        np.ndarray
+        """
+        np = require_numpy()
+        now64 = np.datetime64(_to_micros(now or datetime.now(timezone.utc)), "us")
+        return (now64 - self.posted_at) / np.timedelta64(1, "h")
+
+    def scores(
+        self, weights: RankingWeights = VIRAL_WEIGHTS, now: datetime | None = None
+    ) -> "np.ndarray":
+        """
+        `score_tweet` of every row, in one numpy pass.
+
+        Parameters
+        ----------
+        weights : RankingWeights
+        now : datetime | None
+        Returns
+        -------
+        np.ndarray
+        """
+        ages = self.age_hours(now) if weights.half_life_hours else None
+        return score_arrays(
+            self.likes, self.retweets, self.replies, self.views, ages, weights
+        )
+
+    def rank(
+        self,
+        k: int,
+        weights: RankingWeights = VIRAL_WEIGHTS,
+        now: datetime | None = None,
+    ) -> list[RankedTweet]:
+        """
+        Same ranking as `rank_batch`, but only the winners are built as `Tweet`.
+
+        Parameters
+        ----------
+        k : int
+        weights : RankingWeights
+        now : datetime | None
+        Returns
+        -------
+        list[RankedTweet]
+        """
+        scores = self.scores(weights, now)
+        if weights.author_penalty:
+            scores = penalize_authors(scores, self.author_codes, weights.author_penalty)
+        return [
+            RankedTweet(float(scores[i]), self.tweet(int(i)))
+            for i in top_k_indices(scores, k)
+        ]
@@ -1,5 +1,7 @@
+from datetime import datetime
 from pydantic import BaseModel
 from typing import Iterable
+import hashlib
 import re
 
 
@@ -11,6 +13,7 @@ class Tweet(BaseModel):
     replies: int
     views: int
     url: str
+    posted_at: datetime | None = None
 
     @property
     def viral_score(self) -> int:
@@ -23,10 +26,27 @@ class Tweet(BaseModel):
         return self.likes + 2 * self.retweets
 
 
+def compute_tweet_hash(author: str, text: str) -> str:
+    """
+    SHA-256 of author+text, used to recognise the same tweet across runs.
+
+    Parameters
+    ----------
+    author : str
+    text : str
+    Returns
+    -------
+    str
+    """
+    hash_input = (author + text).encode("utf-8")
+    return hashlib.sha256(hash_input).hexdigest()
+
+
 def find_most_viral_tweet(tweets: Iterable[Tweet]) -> Tweet | None:
     """
     Return the tweet with the highest `.viral_score`.
     If *tweets* is empty, return ``None`` instead of raising.
+    See `src.twitter.ranking` for weighted top-K ranking.
 
     Parameters
     ----------
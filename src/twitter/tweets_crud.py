@@ -1,16 +1,17 @@
-import hashlib
+from datetime import datetime
+from typing import Iterable
+
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import func, select
 
+from src.database.db import dialect_insert
 from src.database.models import Tweets
 from src.twitter.tweets import Tweet as TweetModel
+from src.twitter.tweets import compute_tweet_hash as _compute_tweet_hash
+from src.utils.metrics import timed
 
 
-def _compute_tweet_hash(author: str, text: str) -> str:
-    hash_input = (author + text).encode("utf-8")
-    return hashlib.sha256(hash_input).hexdigest()
-
-
+@timed("db.create_tweet")
 async def create_tweet(
     session: AsyncSession,
     bot_id: int,
@@ -49,6 +50,128 @@ async def create_tweet(
     return db_tweet
 
 
+# asyncpg caps a statement at 32767 bind parameters; 9 columns per row.
+_BULK_CHUNK_SIZE = 1_000
+
+
+@timed("db.bulk_upsert_tweets")
+async def bulk_upsert_tweets(
+    session: AsyncSession,
+    bot_id: int,
+    tweets: Iterable[TweetModel],
+) -> dict[str, int]:
+    """
+    Insert many tweets in one round trip per chunk, deduplicating on hash.
+
+    Uses ``INSERT ... ON CONFLICT (hash) DO UPDATE`` so tweets already in the
+    table only get their engagement counts refreshed, and ``RETURNING`` to
+    hand back the row ids without a follow-up query. Stored tweets are not
+    claimed: that is `claim_tweet`'s job.
+
+    Parameters
+    ----------
+    session : AsyncSession
+    bot_id : int
+    tweets : Iterable[TweetModel]
+    Returns
+    -------
+    dict[str, int]
+        Tweet hash → row id, for every tweet passed in.
+    """
+    # A single statement may not touch the same conflict row twice.
+    rows = {}
+    for tweet in tweets:
+        tweet_hash = _compute_tweet_hash(tweet.author, tweet.text)
+        rows[tweet_hash] = {
+            "bot_id": bot_id,
+            "tweet_author": tweet.author,
+            "tweet_content": tweet.text,
+            "likes": tweet.likes,
+            "retweets": tweet.retweets,
+            "views": tweet.views,
+            "url": tweet.url,
+            "viral_score": tweet.viral_score,
+            "hash": tweet_hash,
+        }
+    if not rows:
+        return {}
+
+    insert = dialect_insert(session)
+    values = list(rows.values())
+    ids: dict[str, int] = {}
+    for start in range(0, len(values), _BULK_CHUNK_SIZE):
+        stmt = insert(Tweets).values(values[start : start + _BULK_CHUNK_SIZE])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Tweets.hash],
+            set_={
+                "likes": stmt.excluded.likes,
+                "retweets": stmt.excluded.retweets,
+                "views": stmt.excluded.views,
+                "viral_score": stmt.excluded.viral_score,
+                "updated_at": func.now(),
+            },
+        ).returning(Tweets.hash, Tweets.id)
+        result = await session.execute(stmt)
+        ids.update(result.all())
+    await session.commit()
+    return ids
+
+
+@timed("db.claim_tweet")
+async def claim_tweet(
+    session: AsyncSession,
+    bot_id: int,
+    tweet: TweetModel,
+) -> int | None:
+    """
+    Atomically claim *tweet* for *bot_id* to act on, storing it if needed.
+
+    Tweets may already be stored by `bulk_upsert_tweets` without a claim;
+    ``INSERT ... ON CONFLICT (hash) DO UPDATE ... WHERE acted_at IS NULL``
+    lets exactly one of several bots running in parallel claim each tweet.
+
+    Parameters
+    ----------
+    session : AsyncSession
+    bot_id : int
+    tweet : TweetModel
+    Returns
+    -------
+    int | None
+        Id of the claimed row, or ``None`` if another bot already acted on
+        the tweet.
+    """
+    stmt = dialect_insert(session)(Tweets).values(
+        bot_id=bot_id,
+        tweet_author=tweet.author,
+        tweet_content=tweet.text,
+        likes=tweet.likes,
+        retweets=tweet.retweets,
+        views=tweet.views,
+        url=tweet.url,
+        viral_score=tweet.viral_score,
+        hash=_compute_tweet_hash(tweet.author, tweet.text),
+        acted_at=func.now(),
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Tweets.hash],
+        set_={
+            "bot_id": bot_id,
+            "likes": stmt.excluded.likes,
+            "retweets": stmt.excluded.retweets,
+            "views": stmt.excluded.views,
+            "viral_score": stmt.excluded.viral_score,
+            "acted_at": func.now(),
+            "updated_at": func.now(),
+        },
+        where=Tweets.acted_at.is_(None),
+    ).returning(Tweets.id)
+    tweet_id = (await session.execute(stmt)).scalar_one_or_none()
+    await session.commit()
+    return tweet_id
+
+
+@timed("db.tweet_exists")
 async def tweet_exists(
     session: AsyncSession,
     author: str,
@@ -72,6 +195,35 @@ async def tweet_exists(
     return result.scalars().first() is not None
 
 
+@timed("db.get_claimed_hashes")
+async def get_claimed_hashes(
+    session: AsyncSession,
+    hashes: Iterable[str],
+) -> set[str]:
+    """
+    Which of *hashes* some bot has already claimed (see `claim_tweet`).
+
+    Parameters
+    ----------
+    session : AsyncSession
+    hashes : Iterable[str]
+        Tweet hashes from `compute_tweet_hash`.
+    Returns
+    -------
+    set[str]
+    """
+    hashes = list(hashes)
+    if not hashes:
+        return set()
+    result = await session.execute(
+        select(Tweets.hash).where(
+            Tweets.hash.in_(hashes) & Tweets.acted_at.is_not(None)
+        )
+    )
+    return set(result.scalars())
+
+
+@timed("db.update_tweet_reply")
 async def update_tweet_reply(
     session: AsyncSession,
     tweet_id: int,
@@ -97,3 +249,75 @@ async def update_tweet_reply(
     await session.commit()
     await session.refresh(tweet)
     return tweet
+
+
+@timed("db.get_seen_tweet_keys")
+async def get_seen_tweet_keys(
+    session: AsyncSession,
+    bot_id: int,
+    limit: int = 10_000,
+) -> list[str]:
+    """
+    Return status URLs and hashes of the tweets a bot has claimed.
+
+    Keys come oldest first, so feeding them to `SeenTweets.seed` keeps the
+    most recent ones when *limit* exceeds the seen-set size.
+
+    Parameters
+    ----------
+    session : AsyncSession
+    bot_id : int
+    limit : int
+        Only the *limit* most recent tweets are returned.
+    Returns
+    -------
+    list[str]
+    """
+    result = await session.execute(
+        select(Tweets.url, Tweets.hash)
+        .where((Tweets.bot_id == bot_id) & Tweets.acted_at.is_not(None))
+        .order_by(Tweets.created_at.desc())
+        .limit(limit)
+    )
+    keys: list[str] = []
+    for url, tweet_hash in reversed(result.all()):
+        keys.extend((url, tweet_hash))
+    return keys
+
+
+@timed("db.get_tweet_columns")
+async def get_tweet_columns(
+    session: AsyncSession,
+    bot_id: int,
+    since: datetime | None = None,
+) -> dict[str, list]:
+    """
+    Return a bot's stored tweets column-wise, ready for `ranking.rank_rows`.
+
+    Parameters
+    ----------
+    session : AsyncSession
+    bot_id : int
+    since : datetime | None
+        Only tweets stored at or after this (naive UTC) time.
+    Returns
+    -------
+    dict[str, list]
+        ``id``, ``author``, ``likes``, ``retweets``, ``views``, ``created_at``.
+    """
+    stmt = select(
+        Tweets.id,
+        Tweets.tweet_author,
+        Tweets.likes,
+        Tweets.retweets,
+        Tweets.views,
+        Tweets.created_at,
+    ).where(Tweets.bot_id == bot_id)
+    if since is not None:
+        stmt = stmt.where(Tweets.created_at >= since)
+    names = ("id", "author", "likes", "retweets", "views", "created_at")
+    columns: dict[str, list] = {name: [] for name in names}
+    for row in await session.execute(stmt):
+        for name, value in zip(names, row):
+            columns[name].append(value)
+    return columns
@@ -1,12 +1,29 @@
 from playwright.async_api import (
     async_playwright,
-    TimeoutError,
+    Browser,
+    BrowserContext,
+    Playwright,
     ElementHandle,
 )
+from playwright.async_api import Error as PlaywrightError
+from contextlib import aclosing
+from dataclasses import dataclass
 from logging import Logger
+from typing import AsyncIterator, Awaitable, Callable, Iterable
 import random
+import time
 
+from src.twitter.request_profiles import (
+    FULL_PROFILE,
+    RequestProfile,
+    RequestStats,
+    install_request_profile,
+)
+from src.twitter.seen_tweets import SeenTweets
+from src.twitter.timeline_capture import TimelineCapture
 from src.twitter.tweets import Tweet, parse_twitter_count
+from src.twitter.pacing import HUMAN_PACING, Pacer, PacingProfile, paced
+from src.utils.metrics import span
 from src.utils.portal_utils import human_type, async_retry
 
 
@@ -18,6 +35,7 @@ SELECTOR_CONFIG = {
     "RETWEET_SELECTOR": 'button[data-testid="retweet"] div[dir="ltr"] span span span',
     "REPLY_SELECTOR": 'button[data-testid="reply"]   div[dir="ltr"] span span span',
     "VIEW_SELECTOR": 'a[href*="/analytics"]      div[dir="ltr"] span span span',
+    "TIME_SELECTOR": "time[datetime]",
     "TWEET_SELECTOR": 'div[aria-label="Home timeline"] article',
     "DETAIL_TWEET_SELECTOR": "article[data-testid='tweet']",
     "DETAIL_TWEET_LIKE_SELECTOR": 'button[data-testid="like"]',
@@ -28,6 +46,114 @@ SELECTOR_CONFIG = {
     "DETAIL_TWEET_RETWEET_SELECTOR": 'button[data-testid="retweet"]',
 }
 
+# Articles extracted successfully are tagged so the next pass can skip them;
+# X recycles timeline nodes, so a fresh node for an old tweet is caught by URL.
+NEW_TWEET_SELECTOR = SELECTOR_CONFIG["TWEET_SELECTOR"] + ":not([data-xbot-seen])"
+
+# Passes over a card that is still missing its author, text or link before it
+# is tagged anyway (e.g. a media-only tweet), so it can't stall the scroll.
+MAX_EXTRACT_TRIES = 3
+
+# Extracts every article matched by TWEET_SELECTOR in a single round trip.
+# Mirrors `_extract_tweet`: raw count strings are returned untouched so the
+# Python side can keep using `parse_twitter_count`.
+EXTRACT_TWEETS_JS = """
+(articles, [sel, maxTries]) => articles.map((article) => {
+    const text = (el) => (el ? el.innerText.trim() : null);
+    const rect = article.getBoundingClientRect();
+    const box = rect.width && rect.height
+        ? {x: rect.x, y: rect.y, width: rect.width, height: rect.height}
+        : null;
+
+    const author = article.querySelector(sel.AUTHOR_SELECTOR);
+    const textNodes = article.querySelectorAll(sel.TEXT_SELECTOR);
+    const link = article.querySelector(sel.URL_SELECTOR);
+    if (!author || !textNodes.length || !link) {
+        // Not rendered yet: look again on the next pass.
+        const tries = Number(article.dataset.xbotTries || 0) + 1;
+        article.dataset.xbotTries = String(tries);
+        if (tries >= maxTries) {
+            article.dataset.xbotSeen = "1";
+        }
+        return {box};
+    }
+
+    article.dataset.xbotSeen = "1";
+    return {
+        box,
+        author: text(author),
+        text: Array.from(textNodes, text).join(" ").trim(),
+        url: link.getAttribute("href"),
+        likes: text(article.querySelector(sel.LIKE_SELECTOR)),
+        retweets: text(article.querySelector(sel.RETWEET_SELECTOR)),
+        replies: text(article.querySelector(sel.REPLY_SELECTOR)),
+        views: text(article.querySelector(sel.VIEW_SELECTOR)),
+        posted_at: article.querySelector(sel.TIME_SELECTOR)?.getAttribute("datetime"),
+    };
+})
+"""
+
+# Clears the tag of articles whose tweet was extracted but never handed over
+# (the scrape stopped or failed first), so the next pass extracts them again.
+UNTAG_ARTICLES_JS = """
+(articles, [urlSelector, urls]) => {
+    const wanted = new Set(urls);
+    for (const article of articles) {
+        const link = article.querySelector(urlSelector);
+        if (link && wanted.has(link.getAttribute("href"))) {
+            delete article.dataset.xbotSeen;
+            delete article.dataset.xbotTries;
+        }
+    }
+}
+"""
+
+# Per-article counterpart of the tagging in EXTRACT_TWEETS_JS.
+TAG_ARTICLE_JS = """
+(article, [extracted, maxTries]) => {
+    const tries = Number(article.dataset.xbotTries || 0) + 1;
+    article.dataset.xbotTries = String(tries);
+    if (extracted || tries >= maxTries) {
+        article.dataset.xbotSeen = "1";
+    }
+}
+"""
+
+
+@dataclass
+class ScrapeCheckpoint:
+    """
+    Progress of a timeline scrape, kept across `async_retry` attempts.
+
+    Attributes
+    ----------
+    scraped : int
+        Tweets already handed over; the seen set skips them on resume.
+    resumes : int
+        Attempts that picked up after a failure.
+    """
+
+    scraped: int = 0
+    resumes: int = 0
+
+
+@dataclass
+class AppliedActions:
+    """
+    What `TwitterPortal.apply_bot_actions` did to a tweet.
+
+    Attributes
+    ----------
+    liked : bool
+    reply : str | None
+        The reply that was posted, if any.
+    retweeted : bool
+    """
+
+    liked: bool = False
+    reply: str | None = None
+    retweeted: bool = False
+
 
 class BaseService:
     def __init__(
@@ -35,25 +161,88 @@ class BaseService:
         logger: Logger,
         headless: bool = True,
         session: dict | None = None,
+        request_profile: RequestProfile = FULL_PROFILE,
     ):
         self.logger = logger
         self.headless = headless
+        self.request_profile = request_profile
+        self.request_stats: RequestStats | None = None
 
         self.playwright = None
         self.browser = None
         self.context = None
         self.page = None
         self.use_external_context = False
+        self.use_external_page = False
         self.session = session
 
-    def set_context(self, context):
-        """Dynamically set the browser instance."""
+    def set_context(self, context, page=None):
+        """Dynamically set the browser instance (and optionally a warm page)."""
         self.context = context
         self.use_external_context = True
+        if page is not None:
+            self.page = page
+            self.use_external_page = True
 
     async def get_session(self) -> dict:
         return await self.context.storage_state()
 
+    async def goto(self, url: str, **kwargs) -> None:
+        """
+        Navigate the page and record the load time in `self.request_stats`.
+
+        Parameters
+        ----------
+        url : str
+        **kwargs
+            Passed through to `Page.goto`.
+        """
+        start = time.perf_counter()
+        with span("portal.goto"):
+            await self.page.goto(url, **kwargs)
+        if self.request_stats is not None:
+            self.request_stats.record_page_load(time.perf_counter() - start)
+
+    @staticmethod
+    async def launch_browser(playwright: Playwright, headless: bool = True) -> Browser:
+        """
+        Launch Chromium with the flags every service uses.
+
+        Parameters
+        ----------
+        playwright : Playwright
+        headless : bool
+        Returns
+        -------
+        Browser
+        """
+        return await playwright.chromium.launch(
+            headless=headless,
+            args=["--disable-pdf-viewer", "--disable-print-preview"],
+        )
+
+    @staticmethod
+    async def new_context(
+        browser: Browser, session: dict | None = None
+    ) -> BrowserContext:
+        """
+        Open an isolated browser context restored from a storage state.
+
+        Parameters
+        ----------
+        browser : Browser
+        session : dict | None
+            Playwright storage state (cookies + localStorage).
+        Returns
+        -------
+        BrowserContext
+        """
+        return await browser.new_context(
+            ignore_https_errors=True,
+            accept_downloads=True,
+            storage_state=session,
+        )
+
     async def __aenter__(self):
         """
         Asynchronous context manager entry. Starts Playwright and opens a browser.
@@ -61,17 +250,14 @@ class BaseService:
         """
         if not getattr(self, "use_external_context", False):
             self.playwright = await async_playwright().start()
-            self.browser = await self.playwright.chromium.launch(
-                headless=self.headless,
-                args=["--disable-pdf-viewer", "--disable-print-preview"],
-            )
-            self.context = await self.browser.new_context(
-                ignore_https_errors=True,
-                accept_downloads=True,
-                storage_state=self.session,
+            self.browser = await self.launch_browser(self.playwright, self.headless)
+            self.context = await self.new_context(self.browser, self.session)
+            self.request_stats = await install_request_profile(
+                self.context, self.request_profile
             )
 
-        self.page = await self.context.new_page()
+        if not self.use_external_page:
+            self.page = await self.context.new_page()
 
         return self
 
@@ -83,7 +269,7 @@ class BaseService:
         :param exc_val: Exception value.
         :param exc_tb: Traceback of the exception.
         """
-        if hasattr(self, "page"):
+        if self.page is not None and not self.use_external_page:
             await self.page.close()
         if not getattr(self, "use_external_context", False):
             await self.browser.close()
@@ -92,10 +278,34 @@ class BaseService:
 
 class TwitterPortal(BaseService):
     def __init__(
-        self, logger: Logger, headless: bool = True, session: dict | None = None
+        self,
+        logger: Logger,
+        headless: bool = True,
+        session: dict | None = None,
+        batch_extract: bool = True,
+        seen: SeenTweets | None = None,
+        capture_network: bool = False,
+        request_profile: RequestProfile = FULL_PROFILE,
+        pacing: PacingProfile = HUMAN_PACING,
     ):
-        super().__init__(logger, headless, session)
+        super().__init__(logger, headless, session, request_profile)
+        self.pacer = Pacer(pacing)
+        self.batch_extract = batch_extract
+        self.seen = seen if seen is not None else SeenTweets()
+        self.capture = TimelineCapture(logger) if capture_network else None
 
+    async def __aenter__(self):
+        await super().__aenter__()
+        if self.capture is not None:
+            self.capture.attach(self.page)
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if self.capture is not None:
+            self.capture.detach()
+        await super().__aexit__(exc_type, exc_val, exc_tb)
+
+    @paced
     async def login(self, username: str, password: str) -> None:
         """
         Login to Twitter.
@@ -105,23 +315,35 @@ class TwitterPortal(BaseService):
         username : str
         password : str
         """
-        await self.page.wait_for_selector('input[name="text"]', timeout=10_000)
-        await human_type(self.page, 'input[name="text"]', username)
-        await self.page.wait_for_timeout(2_000)
+        await self.pacer.ready(
+            "login", self.page.wait_for_selector('input[name="text"]', timeout=10_000)
+        )
+        typing = self.pacer.profile.typing
+        await human_type(self.page, 'input[name="text"]', username, typing)
+        await self.pacer.delay("login.typed")
         await self.page.eval_on_selector('input[name="text"]', "el => el.blur()")
         await self.page.click("h1#modal-header")
         await self.page.click('span:has-text("Next")')
 
-        await self.page.wait_for_selector('input[name="password"]', timeout=10_000)
-        await human_type(self.page, 'input[name="password"]', password)
-        await self.page.wait_for_timeout(2_000)
+        await self.pacer.ready(
+            "login",
+            self.page.wait_for_selector('input[name="password"]', timeout=10_000),
+        )
+        await human_type(self.page, 'input[name="password"]', password, typing)
+        await self.pacer.delay("login.typed")
         await self.page.click('span:has-text("Log in")')
-        await self.page.wait_for_selector(
-            'div[aria-label="Home timeline"]', timeout=50_000
+        await self.pacer.ready(
+            "login",
+            self.page.wait_for_selector(
+                'div[aria-label="Home timeline"]', timeout=50_000
+            ),
         )
 
-    @async_retry(retries=3)
-    async def get_following_tweets_page(self, username: str, password: str) -> None:
+    @paced
+    @async_retry(retries=3, breaker="x.get_following_tweets_page")
+    async def get_following_tweets_page(
+        self, username: str, password: str, logged_in: bool | None = None
+    ) -> None:
         """
         Get the following tweets page.
 
@@ -129,21 +351,38 @@ class TwitterPortal(BaseService):
         ----------
         username : str
         password : str
+        logged_in : bool | None
+            Session state already known from `SessionHealth`. ``False`` goes
+            straight to the login form, ``True`` skips the 7 s probe.
+            ``None`` probes the page.
         """
         self.logger.info("Getting following tweets page")
-        await self.page.goto("https://x.com/home", timeout=50_000)
-        try:  # ≤7 s: already logged in?
-            await self.page.wait_for_selector(
-                'div[aria-label="Home timeline"]', timeout=7_000
+        await self.goto("https://x.com/home", timeout=50_000)
+        if logged_in is None:
+            # ≤7 s: already logged in?
+            logged_in = await self.pacer.ready(
+                "get_following_tweets_page",
+                self.page.wait_for_selector(
+                    'div[aria-label="Home timeline"]', timeout=7_000
+                ),
+                optional=True,
             )
+        if logged_in:
             self.logger.info("Already logged in")
-        except TimeoutError:
+        else:
             self.logger.info("Not logged in")
             await self.login(username, password)
 
         await self.page.get_by_role("tab", name="Following").click()
         self.logger.info("Waiting for following tweets page")
-        await self.page.wait_for_timeout(2_000)
+        await self.pacer.ready(
+            "get_following_tweets_page",
+            self.page.get_by_role("tab", name="Following", selected=True).wait_for(
+                timeout=10_000
+            ),
+            optional=True,
+        )
+        await self.pacer.delay("get_following_tweets_page.tab")
 
     async def _extract_tweet(self, article: ElementHandle) -> Tweet | None:
         """
@@ -202,6 +441,8 @@ class TwitterPortal(BaseService):
             if await article.query_selector(SELECTOR_CONFIG["VIEW_SELECTOR"])
             else 0
         )
+        time_el = await article.query_selector(SELECTOR_CONFIG["TIME_SELECTOR"])
+        posted_at = await time_el.get_attribute("datetime") if time_el else None
 
         return Tweet(
             author=author,
@@ -211,71 +452,317 @@ class TwitterPortal(BaseService):
             replies=repl,
             views=views,
             url=url,
+            posted_at=posted_at,
         )
 
-    @async_retry(retries=3)
-    async def scrape_home_timeline(self, max_tweets: int = 20) -> list[Tweet]:
+    def _tweet_from_raw(self, raw: dict) -> Tweet | None:
         """
-        Scrape the home timeline.
+        Build a tweet from one record produced by `EXTRACT_TWEETS_JS`.
+
+        Records without a URL, or whose URL was already seen, yield ``None``.
 
         Parameters
         ----------
-        max_tweets : int
+        raw : dict
         Returns
         -------
+        Tweet | None
         """
-        await self.page.wait_for_selector(
-            'div[aria-label="Home timeline"]', timeout=15_000
+        if raw.get("url") is None or self.seen.has_url(raw["url"]):
+            return None
+
+        return Tweet(
+            author=raw["author"],
+            text=raw["text"],
+            likes=parse_twitter_count(raw["likes"] or ""),
+            retweets=parse_twitter_count(raw["retweets"] or ""),
+            replies=parse_twitter_count(raw["replies"] or ""),
+            views=parse_twitter_count(raw["views"] or ""),
+            url=raw["url"],
+            posted_at=raw.get("posted_at"),
         )
-        self.logger.info("Timeline loaded")
 
-        tweets: list[Tweet] = []
-        seen: set[str] = set()
+    async def _extract_tweets_batch(
+        self, only_new: bool = False
+    ) -> list[tuple[Tweet | None, dict | None]]:
+        """
+        Extract every timeline article in a single `eval_on_selector_all` call.
 
-        while len(tweets) < max_tweets:
-            cards = await self.page.query_selector_all(
-                SELECTOR_CONFIG["TWEET_SELECTOR"]
-            )
-            for art in cards:
-                if len(tweets) >= max_tweets:
-                    break
+        Parameters
+        ----------
+        only_new : bool
+            Skip articles already returned by a previous call.
+        Returns
+        -------
+        list[tuple[Tweet | None, dict | None]]
+            One ``(tweet, bounding_box)`` pair per article, in DOM order.
+        """
+        selector = NEW_TWEET_SELECTOR if only_new else SELECTOR_CONFIG["TWEET_SELECTOR"]
+        raws = await self.page.eval_on_selector_all(
+            selector, EXTRACT_TWEETS_JS, [SELECTOR_CONFIG, MAX_EXTRACT_TRIES]
+        )
+        return [(self._tweet_from_raw(raw), raw["box"]) for raw in raws]
 
-                box = await art.bounding_box()
-                if box:
-                    # pick a random point inside the tweet
-                    target_x = box["x"] + random.uniform(0, box["width"])
-                    target_y = box["y"] + random.uniform(0, box["height"])
-                    # move in a few small steps
-                    await self.page.mouse.move(
-                        target_x, target_y, steps=random.randint(5, 15)
-                    )
+    async def _extract_tweets_per_article(
+        self, only_new: bool = False
+    ) -> list[tuple[Tweet | None, dict | None]]:
+        """
+        Extract every timeline article with one `_extract_tweet` call per card.
 
-                self.logger.info(f"Scraping tweet... {len(tweets)}/{max_tweets}")
-                t = await self._extract_tweet(art)
-                if not t:
-                    continue
+        Cards whose status URL was already seen are skipped before extraction.
+        As in `EXTRACT_TWEETS_JS`, a card is tagged only once it has been
+        extracted (or has failed *MAX_EXTRACT_TRIES* passes).
 
-                self.logger.info(f"Tweet: {t.author}: {t.text[:30]}… {t.url}")
-                if t.text not in seen:
-                    self.logger.info(f"Adding tweet: {t.url}")
-                    tweets.append(t)
-                    seen.add(t.url)
+        Parameters
+        ----------
+        only_new : bool
+            Skip articles already returned by a previous call.
+        Returns
+        -------
+        list[tuple[Tweet | None, dict | None]]
+        """
+        selector = NEW_TWEET_SELECTOR if only_new else SELECTOR_CONFIG["TWEET_SELECTOR"]
+        results = []
+        for art in await self.page.query_selector_all(selector):
+            link = await art.query_selector(SELECTOR_CONFIG["URL_SELECTOR"])
+            if link and self.seen.has_url(await link.get_attribute("href")):
+                results.append((None, None))
+                extracted = True
+            else:
+                tweet = await self._extract_tweet(art)
+                results.append((tweet, await art.bounding_box()))
+                extracted = tweet is not None
+            if only_new:
+                await art.evaluate(TAG_ARTICLE_JS, [extracted, MAX_EXTRACT_TRIES])
+        return results
+
+    async def iter_home_timeline(
+        self, max_tweets: int | None = None, max_idle_scrolls: int = 5
+    ) -> AsyncIterator[Tweet]:
+        """
+        Stream tweets from the home timeline as they are scrolled into view.
+
+        Only articles that appeared since the previous pass are extracted, and
+        tweets are deduplicated through `self.seen`, so every card is handled
+        once and the cost grows linearly with the number of tweets. Stop
+        iterating to stop scrolling. With ``capture_network`` enabled, tweets
+        come from the intercepted timeline responses instead of the DOM.
+
+        Parameters
+        ----------
+        max_tweets : int | None
+            Stop after this many tweets; ``None`` scrolls until the timeline
+            runs dry.
+        max_idle_scrolls : int
+            Give up after this many scrolls in a row that surface nothing new.
+        Returns
+        -------
+        AsyncIterator[Tweet]
+        """
+        await self.pacer.ready(
+            "iter_home_timeline",
+            self.page.wait_for_selector(
+                'div[aria-label="Home timeline"]', timeout=15_000
+            ),
+        )
+        self.logger.info("Timeline loaded")
+
+        if self.capture is not None:
+            async for t in self._iter_captured(max_tweets, max_idle_scrolls):
+                yield t
+            return
+
+        extract = (
+            self._extract_tweets_batch
+            if self.batch_extract
+            else self._extract_tweets_per_article
+        )
+        count = 0
+        idle_scrolls = 0
+
+        while max_tweets is None or count < max_tweets:
+            new_tweets = 0
+            with span("portal.extract"):
+                batch = await extract(only_new=True)
+            # Index of the first entry not handed over yet.
+            pending = 0
+            try:
+                for pending, (t, box) in enumerate(batch):
+                    if max_tweets is not None and count >= max_tweets:
+                        break
+                    if not t or t in self.seen:
+                        continue
+
+                    if box:
+                        # pick a random point inside the tweet
+                        target_x = box["x"] + random.uniform(0, box["width"])
+                        target_y = box["y"] + random.uniform(0, box["height"])
+                        # move in a few small steps
+                        await self.page.mouse.move(
+                            target_x, target_y, steps=random.randint(5, 15)
+                        )
+
+                    # Only now, so a failed hover doesn't lose the tweet on resume.
+                    self.seen.add(t)
+                    self.logger.debug(
+                        "Scraped tweet %d/%s: %s",
+                        count + 1,
+                        max_tweets,
+                        t.url,
+                        extra={"author": t.author},
+                    )
+                    count += 1
+                    new_tweets += 1
+                    yield t
+
+                    await self.pacer.delay("iter_home_timeline.card")
                 else:
-                    self.logger.info(f"Tweet already seen: {t.url}")
+                    pending = len(batch)
+            finally:
+                await self._untag(
+                    t for t, _ in batch[pending:] if t and t not in self.seen
+                )
 
-                await self.page.wait_for_timeout(random.uniform(300, 1200))
+            if max_tweets is not None and count >= max_tweets:
+                break
 
-            if len(tweets) >= max_tweets:
+            idle_scrolls = 0 if new_tweets else idle_scrolls + 1
+            if idle_scrolls > max_idle_scrolls:
+                self.logger.info("No new tweets after scrolling, stopping")
                 break
 
             scroll_dist = random.uniform(1500, 2500)
             await self.page.mouse.wheel(0, scroll_dist)
 
-            await self.page.wait_for_timeout(random.uniform(1500, 3000))
+            # Returns as soon as a card we haven't extracted shows up.
+            await self.pacer.ready(
+                "iter_home_timeline",
+                self.page.wait_for_selector(NEW_TWEET_SELECTOR, timeout=3_000),
+                optional=True,
+            )
+            await self.pacer.delay("iter_home_timeline.scroll")
+
+    async def _untag(self, tweets: Iterable[Tweet]) -> None:
+        """
+        Let the next pass extract *tweets* again; see `UNTAG_ARTICLES_JS`.
+
+        Parameters
+        ----------
+        tweets : Iterable[Tweet]
+        """
+        urls = [t.url for t in tweets]
+        if not urls:
+            return
+        try:
+            await self.page.eval_on_selector_all(
+                SELECTOR_CONFIG["TWEET_SELECTOR"] + "[data-xbot-seen]",
+                UNTAG_ARTICLES_JS,
+                [SELECTOR_CONFIG["URL_SELECTOR"], urls],
+            )
+        except PlaywrightError as e:
+            # The page is gone; a retry starts from a fresh one anyway.
+            self.logger.debug("Could not untag %d articles: %s", len(urls), e)
+
+    async def _iter_captured(
+        self, max_tweets: int | None, max_idle_scrolls: int
+    ) -> AsyncIterator[Tweet]:
+        """
+        Stream tweets parsed from captured timeline responses, scrolling only
+        when the buffer runs dry to make the client request the next page.
+
+        Parameters
+        ----------
+        max_tweets : int | None
+        max_idle_scrolls : int
+        Returns
+        -------
+        AsyncIterator[Tweet]
+        """
+        count = 0
+        idle_scrolls = 0
+        while max_tweets is None or count < max_tweets:
+            t = await self.capture.next_tweet(timeout=random.uniform(1.5, 3.0))
+            if t is None:
+                idle_scrolls += 1
+                if idle_scrolls > max_idle_scrolls:
+                    self.logger.info("No new tweets after scrolling, stopping")
+                    break
+                await self.page.mouse.wheel(0, random.uniform(1500, 2500))
+                continue
+
+            idle_scrolls = 0
+            if not self.seen.add(t):
+                continue
+            self.logger.debug(
+                "Captured tweet %d/%s: %s",
+                count + 1,
+                max_tweets,
+                t.url,
+                extra={"author": t.author},
+            )
+            count += 1
+            yield t
+
+    @paced
+    @async_retry(retries=3, breaker="x.feed_home_timeline")
+    async def feed_home_timeline(
+        self,
+        put: Callable[[Tweet], Awaitable[None]],
+        max_tweets: int | None,
+        checkpoint: ScrapeCheckpoint,
+    ) -> None:
+        """
+        Hand timeline tweets to *put* as they are scraped.
+
+        Scrolling pauses while *put* is pending, e.g. on a full
+        ``asyncio.Queue``. A retry resumes from *checkpoint* rather than
+        starting over: tweets already handed over stay in `self.seen`, so
+        only the remaining ones are scraped.
+
+        Parameters
+        ----------
+        put : Callable[[Tweet], Awaitable[None]]
+        max_tweets : int | None
+            Total over all attempts; ``None`` scrolls until the timeline
+            runs dry.
+        checkpoint : ScrapeCheckpoint
+        """
+        if checkpoint.scraped:
+            checkpoint.resumes += 1
+            self.logger.info("Resuming timeline after %s tweets", checkpoint.scraped)
+        remaining = None if max_tweets is None else max_tweets - checkpoint.scraped
+        # aclosing: the generator's cleanup must run before a retry starts.
+        async with aclosing(self.iter_home_timeline(remaining)) as tweets:
+            async for t in tweets:
+                try:
+                    await put(t)
+                except BaseException:
+                    # Not handed over, so the next attempt scrapes it again.
+                    self.seen.discard(t)
+                    raise
+                checkpoint.scraped += 1
+
+    async def scrape_home_timeline(self, max_tweets: int = 20) -> list[Tweet]:
+        """
+        Scrape the home timeline.
+
+        Parameters
+        ----------
+        max_tweets : int
+        Returns
+        -------
+        list[Tweet]
+        """
+        tweets: list[Tweet] = []
+
+        async def collect(tweet: Tweet) -> None:
+            tweets.append(tweet)
 
-        return tweets[:max_tweets]
+        await self.feed_home_timeline(collect, max_tweets, ScrapeCheckpoint())
+        return tweets
 
-    @async_retry(retries=3)
+    @paced
+    @async_retry(retries=3, breaker="x.click_like")
     async def click_like(self) -> bool:
         """
         Likes *tweet* if it is not already liked.
@@ -285,22 +772,29 @@ class TwitterPortal(BaseService):
             SELECTOR_CONFIG["DETAIL_TWEET_SELECTOR"]
         ).first.get_by_role("group")
 
-        await self.page.wait_for_timeout(random.uniform(1500, 3000))
-
+        like_btn = article.locator(SELECTOR_CONFIG["DETAIL_TWEET_LIKE_SELECTOR"])
         unlike_btn = article.locator(SELECTOR_CONFIG["DETAIL_TWEET_UNLIKE_SELECTOR"])
+        await self.pacer.ready(
+            "click_like", like_btn.or_(unlike_btn).first.wait_for(timeout=10_000)
+        )
+        await self.pacer.delay("click_like.read")
+
         count_unlike = await unlike_btn.count()
-        self.logger.info(f"Count of unlike buttons: {count_unlike}")
+        self.logger.debug("Count of unlike buttons: %d", count_unlike)
         if count_unlike > 0:
             self.logger.info("Tweet already liked (button shows 'unlike')")
             return False
 
-        like_btn = article.locator(SELECTOR_CONFIG["DETAIL_TWEET_LIKE_SELECTOR"])
         await like_btn.click()
-        await self.page.wait_for_timeout(random.uniform(400, 900))
+        await self.pacer.ready(
+            "click_like", unlike_btn.first.wait_for(timeout=5_000), optional=True
+        )
+        await self.pacer.delay("click_like.after")
         self.logger.info("Tweet liked ✔")
         return True
 
-    @async_retry(retries=3)
+    @paced
+    @async_retry(retries=3, breaker="x.reply_to_tweet")
     async def reply_to_tweet(self, text: str) -> None:
         """
         Opens the reply composer for *tweet*, types *text* (human-ish),
@@ -316,21 +810,32 @@ class TwitterPortal(BaseService):
 
         # Composer is a modal dialog – wait for it and find the textbox
         dialog = self.page.get_by_role("group").get_by_role("dialog")
-        await dialog.wait_for(state="visible", timeout=10_000)
+        await self.pacer.ready(
+            "reply_to_tweet", dialog.wait_for(state="visible", timeout=10_000)
+        )
 
         await human_type(
-            self.page, SELECTOR_CONFIG["DETAIL_TWEET_REPLY_TEXTBOX_SELECTOR"], text
+            self.page,
+            SELECTOR_CONFIG["DETAIL_TWEET_REPLY_TEXTBOX_SELECTOR"],
+            text,
+            self.pacer.profile.typing,
         )
-        await self.page.wait_for_timeout(random.uniform(300, 700))
+        await self.pacer.delay("reply_to_tweet.typed")
 
         # The ‘Tweet’ / ‘Reply’ button inside the dialog
         await dialog.locator(
             SELECTOR_CONFIG["DETAIL_TWEET_REPLY_BUTTON_SELECTOR"]
         ).click()
         self.logger.info("Reply posted ✔")
-        await self.page.wait_for_timeout(random.uniform(800, 1500))
+        await self.pacer.ready(
+            "reply_to_tweet",
+            dialog.wait_for(state="hidden", timeout=10_000),
+            optional=True,
+        )
+        await self.pacer.delay("reply_to_tweet.after")
 
-    @async_retry(retries=3)
+    @paced
+    @async_retry(retries=3, breaker="x.click_retweet")
     async def click_retweet(self) -> bool:
         """
         Retweets *tweet* if it is not already retweeted.
@@ -338,29 +843,58 @@ class TwitterPortal(BaseService):
         """
         btn = self.page.locator(SELECTOR_CONFIG["DETAIL_TWEET_RETWEET_SELECTOR"]).first
         await btn.click()
-        await self.page.wait_for_timeout(random.uniform(400, 900))  # tiny human pause
 
         confirm_btn = self.page.get_by_text("Repost")
+        await self.pacer.ready("click_retweet", confirm_btn.wait_for(timeout=10_000))
+        await self.pacer.delay("click_retweet.menu")
         await confirm_btn.click()
-        await self.page.wait_for_timeout(random.uniform(400, 900))  # tiny human pause
+        await self.pacer.delay("click_retweet.after")
 
         self.logger.info("Tweet retweeted ✔")
         return True
 
-    async def apply_bot_actions(self, tweet: Tweet, reply_text: str) -> None:
+    async def apply_bot_actions(
+        self,
+        tweet: Tweet,
+        reply_text: str | Awaitable[str | None] | None,
+        retweet: bool = True,
+        applied: AppliedActions | None = None,
+    ) -> AppliedActions:
         """
-        Apply bot actions to a tweet.
+        Like a tweet, then reply to and retweet it.
+
+        Nothing else happens when the tweet was already liked.
 
         Parameters
         ----------
         tweet : Tweet
-        reply_text : str
+        reply_text : str | Awaitable[str | None] | None
+            The reply, or a pending task producing it. A task is only awaited
+            right before replying, so reply generation overlaps navigation
+            and the like. ``None``, given or produced, skips the reply.
+        retweet : bool
+            ``False`` skips the retweet.
+        applied : AppliedActions | None
+            Filled in as the actions happen, so a caller still knows what was
+            done when a later step raises.
+        Returns
+        -------
+        AppliedActions
         """
-        await self.page.goto(f"https://x.com{tweet.url}", timeout=50_000)
-        if await self.click_like():
-            await self.reply_to_tweet(reply_text)
-            await self.click_retweet()
-        else:
+        applied = applied if applied is not None else AppliedActions()
+        await self.goto(f"https://x.com{tweet.url}", timeout=50_000)
+        applied.liked = await self.click_like()
+        if not applied.liked:
             self.logger.info("Tweet already liked (button shows 'unlike')")
+            return applied
+
+        if reply_text is not None and not isinstance(reply_text, str):
+            reply_text = await reply_text
+        if reply_text is not None:
+            await self.reply_to_tweet(reply_text)
+            applied.reply = reply_text
+        if retweet:
+            applied.retweeted = await self.click_retweet()
 
         self.logger.info("Bot actions applied")
+        return applied
@@ -0,0 +1,114 @@
+import json
+import logging
+import queue
+import sys
+from contextlib import contextmanager
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener
+from typing import Iterator
+
+_bot: ContextVar[str] = ContextVar("log_bot", default="-")
+
+TEXT_FORMAT = "%(asctime)s %(levelname)s %(name)s [%(bot)s] %(message)s"
+
+# LogRecord attributes that are not user-supplied ``extra`` fields.
+_RECORD_FIELDS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "bot"}
+
+
+@contextmanager
+def bot_context(bot: str) -> Iterator[None]:
+    """
+    Tag every record logged in this task (and the tasks it starts) with *bot*.
+
+    Parameters
+    ----------
+    bot : str
+    """
+    token = _bot.set(bot)
+    try:
+        yield
+    finally:
+        _bot.reset(token)
+
+
+class BotContextFilter(logging.Filter):
+    """Copy the current `bot_context` onto the record as ``record.bot``."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.bot = _bot.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, including ``extra`` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "bot": getattr(record, "bot", "-"),
+            "message": record.getMessage(),
+        }
+        entry.update(
+            (key, value)
+            for key, value in vars(record).items()
+            if key not in _RECORD_FIELDS
+        )
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    `QueueHandler` that leaves message formatting to the listener thread.
+
+    The stock handler renders ``msg % args`` before enqueueing, i.e. on the
+    event loop. Here only tracebacks are rendered up front, so the record
+    doesn't keep frames alive while queued.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def configure_logging(level: str = "INFO", fmt: str = "text") -> QueueListener:
+    """
+    Route the root logger through a queue to a stderr handler on a thread.
+
+    Call once from an entry point, and stop the returned listener on exit
+    to flush what is still queued.
+
+    Parameters
+    ----------
+    level : str
+    fmt : str
+        ``text`` or ``json``.
+    Returns
+    -------
+    QueueListener
+    """
+    stream = logging.StreamHandler(sys.stderr)
+    stream.setFormatter(
+        JsonFormatter()
+        if fmt == "json"
+        else logging.Formatter(TEXT_FORMAT, defaults={"bot": "-"})
+    )
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    handler = DeferredQueueHandler(log_queue)
+    handler.addFilter(BotContextFilter())
+
+    root = logging.getLogger()
+    root.handlers[:] = [handler]
+    root.setLevel(level.upper())
+
+    listener = QueueListener(log_queue, stream, respect_handler_level=True)
+    listener.start()
+    return listener
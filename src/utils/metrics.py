@@ -0,0 +1,278 @@
+import json
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from functools import wraps
+from itertools import count
+from pathlib import Path
+from typing import Awaitable, Callable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+# Seconds; covers a DB round trip up to a slow page load or LLM call.
+DEFAULT_BUCKETS = (
+    0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60,
+)  # fmt: skip
+
+
+@dataclass
+class Histogram:
+    """Cumulative-bucket histogram, as exported to Prometheus."""
+
+    buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    counts: list[int] = field(default_factory=list)
+    sum: float = 0.0
+    count: int = 0
+
+    def __post_init__(self):
+        # One extra slot for +Inf.
+        self.counts = self.counts or [0] * (len(self.buckets) + 1)
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+@dataclass
+class Span:
+    """One timed step of a bot run, written out as a JSON line."""
+
+    name: str
+    bot: str | None
+    id: int
+    parent: int | None
+    start: float
+    duration: float
+    error: str | None = None
+
+
+@dataclass
+class RunTrace:
+    """
+    Spans recorded during one `run_bot` call.
+
+    Per-name totals cover every span, but at most *max_spans* span records
+    are held in memory. Once that many are buffered they are appended to
+    *path* and dropped from memory; without a *path*, further records are
+    only counted in `dropped`.
+    """
+
+    bot: str
+    path: str | Path | None = None
+    max_spans: int = 10_000
+    started_at: float = field(default_factory=time.time)
+    spans: list[Span] = field(default_factory=list)
+    dropped: int = 0
+    _totals: dict[str, tuple[int, float]] = field(
+        default_factory=dict, init=False, repr=False
+    )
+
+    def add(self, span: Span) -> None:
+        calls, seconds = self._totals.get(span.name, (0, 0.0))
+        self._totals[span.name] = (calls + 1, seconds + span.duration)
+        if len(self.spans) >= self.max_spans:
+            if self.path is None:
+                self.dropped += 1
+                return
+            self.flush()
+        self.spans.append(span)
+
+    def totals(self) -> dict[str, tuple[int, float]]:
+        """``{span name: (calls, seconds)}``; nested spans count separately."""
+        return dict(self._totals)
+
+    def summary(self) -> str:
+        return "; ".join(
+            f"{name}: {calls}x {seconds:.2f} s"
+            for name, (calls, seconds) in sorted(
+                self.totals().items(), key=lambda item: -item[1][1]
+            )
+        )
+
+    def flush(self) -> None:
+        """Append the buffered spans to *path* and forget them."""
+        if self.path is not None and self.spans:
+            self.write_jsonl(self.path)
+        self.spans.clear()
+
+    def write_jsonl(self, path: str | Path) -> None:
+        """Append the buffered spans to *path*, one JSON object per line."""
+        with open(path, "a", encoding="utf-8") as f:
+            for s in self.spans:
+                f.write(json.dumps(asdict(s), separators=(",", ":")) + "\n")
+
+
+class Metrics:
+    """
+    Process-wide span durations and counters.
+
+    Every span feeds a ``xbot_span_seconds`` histogram labelled with its
+    name, and failed spans count towards ``xbot_span_errors_total``.
+    Registered collectors add their own lines to the export. While a
+    `RunTrace` is active (see `trace_run`), spans are also kept on it with
+    their bot and parent span, for a per-run breakdown.
+    """
+
+    def __init__(self, prefix: str = "xbot"):
+        self.prefix = prefix
+        self.histograms: defaultdict[str, Histogram] = defaultdict(Histogram)
+        self.errors: defaultdict[str, int] = defaultdict(int)
+        self.collectors: list[Callable[[str], list[str]]] = []
+
+    def register(self, collector: Callable[[str], list[str]]) -> None:
+        """
+        Add metrics kept elsewhere (e.g. `db.pool_metrics`) to the export.
+
+        Parameters
+        ----------
+        collector : Callable[[str], list[str]]
+            Called with the metric prefix; returns exposition lines.
+        """
+        self.collectors.append(collector)
+
+    def observe(self, span: str, seconds: float, error: str | None = None) -> None:
+        self.histograms[span].observe(seconds)
+        if error is not None:
+            self.errors[span] += 1
+
+    def to_prometheus(self) -> str:
+        """
+        All metrics in the Prometheus text exposition format.
+
+        Returns
+        -------
+        str
+        """
+        p = self.prefix
+        lines = [
+            f"# HELP {p}_span_seconds Duration of instrumented steps.",
+            f"# TYPE {p}_span_seconds histogram",
+        ]
+        for span, h in sorted(self.histograms.items()):
+            cumulative = 0
+            for bound, n in zip((*h.buckets, "+Inf"), h.counts):
+                cumulative += n
+                lines.append(
+                    f'{p}_span_seconds_bucket{{span="{span}",le="{bound}"}} '
+                    f"{cumulative}"
+                )
+            lines.append(f'{p}_span_seconds_sum{{span="{span}"}} {h.sum:.6f}')
+            lines.append(f'{p}_span_seconds_count{{span="{span}"}} {h.count}')
+
+        lines += [
+            f"# HELP {p}_span_errors_total Instrumented steps that raised.",
+            f"# TYPE {p}_span_errors_total counter",
+        ]
+        for span, n in sorted(self.errors.items()):
+            lines.append(f'{p}_span_errors_total{{span="{span}"}} {n}')
+        for collector in self.collectors:
+            lines += collector(p)
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str | Path) -> None:
+        """
+        Write `to_prometheus` atomically, for node_exporter's textfile
+        collector.
+
+        Parameters
+        ----------
+        path : str | Path
+        """
+        path = Path(path)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text(self.to_prometheus(), encoding="utf-8")
+        tmp.replace(path)
+
+
+metrics = Metrics()
+
+_trace: ContextVar[RunTrace | None] = ContextVar("run_trace", default=None)
+_parent: ContextVar[int | None] = ContextVar("parent_span", default=None)
+_span_ids = count(1)
+
+
+@contextmanager
+def trace_run(bot: str, path: str | Path | None = None) -> Iterator[RunTrace]:
+    """
+    Collect the spans of one bot run (in this task and the tasks it starts).
+
+    Parameters
+    ----------
+    bot : str
+    path : str | Path | None
+        JSON-lines file that full batches of spans are flushed to; see
+        `RunTrace`.
+    Returns
+    -------
+    Iterator[RunTrace]
+    """
+    trace = RunTrace(bot, path)
+    token = _trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _trace.reset(token)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """
+    Time the enclosed block as span *name*.
+
+    Parameters
+    ----------
+    name : str
+        ``<area>.<step>``, e.g. ``portal.click_like`` or ``db.get_bot_by_name``.
+    """
+    span_id = next(_span_ids)
+    parent_token = _parent.set(span_id)
+    start = time.perf_counter()
+    error = None
+    try:
+        yield
+    except BaseException as e:
+        error = type(e).__name__
+        raise
+    finally:
+        duration = time.perf_counter() - start
+        _parent.reset(parent_token)
+        metrics.observe(name, duration, error)
+        trace = _trace.get()
+        if trace is not None:
+            trace.add(
+                Span(
+                    name=name,
+                    bot=trace.bot,
+                    id=span_id,
+                    parent=_parent.get(),
+                    start=time.time() - duration,
+                    duration=duration,
+                    error=error,
+                )
+            )
+
+
+def timed(
+    name: str,
+) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+    """
+    Decorator form of `span` for coroutine functions.
+
+    Parameters
+    ----------
+    name : str
+    """
+
+    def decorator(fn: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        @wraps(fn)
+        async def wrapper(*args, **kwargs) -> T:
+            with span(name):
+                return await fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -3,30 +3,303 @@ from __future__ import annotations
 import asyncio
 import logging
 import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
 from functools import wraps
-from typing import Awaitable, Callable, Type
+from typing import Awaitable, Callable, Iterator, NamedTuple, Type
 
 from playwright.async_api import Error as PlaywrightError
-from playwright.async_api import Page, TimeoutError
+from playwright.async_api import Locator, Page, TimeoutError
 
 
 logger = logging.getLogger(__name__)
 
 
+# Typing usually stalls right after these.
+PUNCTUATION = frozenset(".,!?;:…\n")
+
+
+@dataclass(frozen=True)
+class TypingProfile:
+    """
+    Keystroke timing used by `human_type`. Delays are in milliseconds.
+
+    Attributes
+    ----------
+    min_delay, max_delay : float
+        Range of the per-keystroke delay; drawn once per burst.
+    burst : tuple[int, int] | None
+        Range of the number of characters typed in one go. ``None`` types the
+        whole text as a single burst.
+    burst_pause : tuple[float, float] | None
+        Range of the pause between two bursts.
+    punctuation_pause : tuple[float, float] | None
+        Range of the pause after `PUNCTUATION`; bursts end there.
+    """
+
+    min_delay: float
+    max_delay: float
+    burst: tuple[int, int] | None = None
+    burst_pause: tuple[float, float] | None = None
+    punctuation_pause: tuple[float, float] | None = None
+
+
+HUMAN_TYPING = TypingProfile(
+    min_delay=40,
+    max_delay=120,
+    burst=(3, 9),
+    burst_pause=(80, 300),
+    punctuation_pause=(250, 700),
+)
+# For trusted contexts (local fixtures, warm sessions): one quick burst.
+# `FAST_PACING` types with it.
+FAST_TYPING = TypingProfile(min_delay=0, max_delay=10)
+
+
+class Burst(NamedTuple):
+    text: str
+    delay: float
+    pause_after: float
+
+
+def plan_keystrokes(
+    text: str, profile: TypingProfile = HUMAN_TYPING, rng: random.Random | None = None
+) -> list[Burst]:
+    """
+    Split *text* into bursts with their keystroke delay and trailing pause.
+
+    Parameters
+    ----------
+    text : str
+    profile : TypingProfile
+    rng : random.Random | None
+        Source of randomness; pass a seeded one for reproducible timing.
+    Returns
+    -------
+    list[Burst]
+    """
+    rng = rng or random
+    bursts = []
+    i = 0
+    while i < len(text):
+        size = rng.randint(*profile.burst) if profile.burst else len(text)
+        chunk = text[i : i + size]
+        if profile.punctuation_pause:
+            cut = next((j for j, ch in enumerate(chunk) if ch in PUNCTUATION), None)
+            if cut is not None:
+                chunk = chunk[: cut + 1]
+        i += len(chunk)
+
+        pause = 0.0
+        if i < len(text):
+            if profile.punctuation_pause and chunk[-1] in PUNCTUATION:
+                pause = rng.uniform(*profile.punctuation_pause)
+            elif profile.burst_pause:
+                pause = rng.uniform(*profile.burst_pause)
+        delay = rng.uniform(profile.min_delay, profile.max_delay)
+        bursts.append(Burst(chunk, delay, pause))
+    return bursts
+
+
+def planned_duration(bursts: list[Burst]) -> float:
+    """Configured typing time of *bursts*, in seconds."""
+    return sum(len(b.text) * b.delay + b.pause_after for b in bursts) / 1000
+
+
 async def human_type(
-    page: Page, selector: str, text: str, min_delay: int = 50, max_delay: int = 150
+    page: Page,
+    target: str | Locator,
+    text: str,
+    profile: TypingProfile = HUMAN_TYPING,
+    rng: random.Random | None = None,
 ) -> None:
     """
     Simulate human typing on a page.
 
+    The target is resolved and focused once; the text is then sent through
+    ``page.keyboard`` in bursts planned by `plan_keystrokes`, so there is
+    one round trip per burst instead of a selector lookup per character.
+
     Parameters
     ----------
     page : Page
         The page to type on.
-    selector : str
+    target : str | Locator
+        Selector (first match is used) or locator of the input.
+    text : str
+    profile : TypingProfile
+        `HUMAN_TYPING` by default; the portal passes its pacing profile's.
+    rng : random.Random | None
+        See `plan_keystrokes`.
+    """
+    locator = page.locator(target).first if isinstance(target, str) else target
+    await locator.focus()
+    for burst in plan_keystrokes(text, profile, rng):
+        await page.keyboard.type(burst.text, delay=burst.delay)
+        if burst.pause_after:
+            await asyncio.sleep(burst.pause_after / 1000)
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling an operation whose circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Fails fast after repeated failures of one operation, across all callers.
+
+    After *failure_threshold* consecutive failures the breaker opens and
+    calls raise `CircuitOpenError` without running. Once *reset_timeout*
+    seconds have passed, a single trial call is let through: success closes
+    the breaker, failure opens it again.
+
+    Parameters
+    ----------
+    name : str
+    failure_threshold : int
+    reset_timeout : float
+    """
+
+    def __init__(
+        self, name: str, failure_threshold: int = 5, reset_timeout: float = 60.0
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._trial_running = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half-open" and not self._trial_running:
+            self._trial_running = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._trial_running = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self._trial_running or self.failures >= self.failure_threshold:
+            if self.opened_at is None:
+                logger.warning(
+                    "Circuit %s open after %s failures", self.name, self.failures
+                )
+            self.opened_at = time.monotonic()
+        self._trial_running = False
+
+    def release(self) -> None:
+        """
+        End a call without a verdict (cancelled, or failed with an error the
+        breaker doesn't count), so a half-open breaker lets the next trial in.
+        """
+        self._trial_running = False
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+
+
+def get_breaker(name: str, **kwargs) -> CircuitBreaker:
+    """
+    Process-wide `CircuitBreaker` for *name*, created on first use.
+
+    Parameters
+    ----------
+    name : str
+    **kwargs
+        `CircuitBreaker` settings, used only when it is created.
+    Returns
+    -------
+    CircuitBreaker
     """
-    for ch in text:
-        await page.type(selector, ch, delay=random.randint(min_delay, max_delay))
+    if name not in _breakers:
+        _breakers[name] = CircuitBreaker(name, **kwargs)
+    return _breakers[name]
+
+
+class RetryEvent(NamedTuple):
+    """
+    One failed attempt, as passed to an ``on_retry`` hook.
+
+    ``delay`` is the back-off before the next attempt, or ``None`` when the
+    call gives up (retries, deadline or breaker exhausted).
+    """
+
+    name: str
+    attempt: int
+    error: BaseException
+    attempt_time: float
+    delay: float | None
+
+
+@dataclass
+class RetryStats:
+    retries: int = 0
+    exhausted: int = 0
+    time_lost: float = 0.0
+
+
+retry_stats: dict[str, RetryStats] = {}
+
+
+def record_retry(event: RetryEvent) -> None:
+    """
+    Default ``on_retry`` hook: accumulate `retry_stats` per function.
+
+    Time lost is the failed attempt's duration plus the back-off after it.
+    """
+    stats = retry_stats.setdefault(event.name, RetryStats())
+    if event.delay is None:
+        stats.exhausted += 1
+    else:
+        stats.retries += 1
+    stats.time_lost += event.attempt_time + (event.delay or 0.0)
+
+
+_run_deadline: ContextVar[float | None] = ContextVar("retry_run_deadline", default=None)
+
+
+@contextmanager
+def retry_deadline(seconds: float | None) -> Iterator[None]:
+    """
+    Stop retrying anything inside the block *seconds* from now.
+
+    The deadline is a context variable, so it follows the current task (and
+    tasks it creates) -- one bot's deadline doesn't affect another's. An
+    enclosing, earlier deadline still wins.
+
+    Parameters
+    ----------
+    seconds : float | None
+        ``None`` leaves the current deadline unchanged.
+    """
+    current = _run_deadline.get()
+    deadline = current
+    if seconds is not None:
+        deadline = time.monotonic() + seconds
+        if current is not None:
+            deadline = min(deadline, current)
+    token = _run_deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _run_deadline.reset(token)
 
 
 def async_retry(
@@ -34,6 +307,11 @@ def async_retry(
     retries: int = 3,
     backoff: float = 1.5,
     exc: tuple[Type[BaseException], ...] = (TimeoutError, PlaywrightError),
+    jitter: bool = True,
+    max_delay: float = 30.0,
+    deadline: float | None = None,
+    breaker: str | None = None,
+    on_retry: Callable[[RetryEvent], None] | None = record_retry,
 ) -> Callable[[Callable[..., Awaitable]], Callable[..., Awaitable]]:
     """
     Decorator that retries an *async* function when it raises *exc*.
@@ -46,34 +324,85 @@ def async_retry(
         Multiplier for exponential back-off (first delay == backoff seconds).
     exc : tuple[type[BaseException], …]
         Exception classes that trigger a retry.
+    jitter : bool
+        "Full jitter": sleep a random time between 0 and the back-off, so
+        callers that failed together don't retry in lockstep.
+    max_delay : float
+        Cap on a single back-off, in seconds.
+    deadline : float | None
+        Seconds one call (all attempts) may take before it stops retrying.
+        A `retry_deadline` around the call applies as well.
+    breaker : str | None
+        Name of the shared `CircuitBreaker` guarding this operation.
+    on_retry : Callable[[RetryEvent], None] | None
+        Called after every failed attempt; `record_retry` by default.
     """
 
     def decorator(fn: Callable[..., Awaitable]):
+        circuit = get_breaker(breaker) if breaker else None
+
         @wraps(fn)
         async def wrapper(*args, **kwargs):
+            log = getattr(args[0], "logger", logger) if args else logger
+            stop_at = _run_deadline.get()
+            if deadline is not None:
+                call_deadline = time.monotonic() + deadline
+                stop_at = min(stop_at or call_deadline, call_deadline)
+
             delay = backoff
             for attempt in range(retries + 1):  # initial try + N retries
+                if circuit is not None and not circuit.allow():
+                    raise CircuitOpenError(f"Circuit {circuit.name} is open")
+                started = time.monotonic()
                 try:
-                    return await fn(*args, **kwargs)
+                    result = await fn(*args, **kwargs)
                 except exc as e:
-                    if attempt == retries:
+                    if circuit is not None:
+                        circuit.record_failure()
+                    now = time.monotonic()
+                    sleep = min(delay, max_delay)
+                    if jitter:
+                        sleep = random.uniform(0, sleep)
+                    give_up = (
+                        attempt == retries
+                        or (stop_at is not None and now + sleep >= stop_at)
+                        or (circuit is not None and circuit.state != "closed")
+                    )
+                    if on_retry is not None:
+                        on_retry(
+                            RetryEvent(
+                                fn.__qualname__,
+                                attempt + 1,
+                                e,
+                                now - started,
+                                None if give_up else sleep,
+                            )
+                        )
+                    if give_up:
                         logger.exception(
                             "Retries exhausted for %s after %s attempts",
                             fn.__qualname__,
                             attempt + 1,
                         )
                         raise
-                    log = getattr(args[0], "logger", logger)  # fall back to module log
                     log.warning(
                         "%s failed (%s). Retrying %s/%s in %.1fs…",
                         fn.__qualname__,
                         e.__class__.__name__,
                         attempt + 1,
                         retries,
-                        delay,
+                        sleep,
                     )
-                    await asyncio.sleep(delay)
+                    await asyncio.sleep(sleep)
                     delay *= backoff
+                except BaseException:
+                    if circuit is not None:
+                        circuit.release()
+                    raise
+                else:
+                    if circuit is not None:
+                        circuit.record_success()
+                    return result
 
         return wrapper
 